@@ -0,0 +1,80 @@
+"""
+Initial data for the calendar page.
+
+``month_payload`` returns what the page's script would otherwise fetch after
+load: the user's calendars and the month's events, availability and holidays,
+in the same shapes as the API, plus their ids per day of the month in the
+user's time zone (``days``, as in the async calendar data view). The views
+embed it with ``json_script``.
+
+Payloads are cached per user and month under the data versions of the user's
+calendars (see ``core.cache.get_calendar_versions``), so any change to one of
+those calendars produces a new key instead of needing an invalidation.
+"""
+import hashlib
+from calendar import monthrange
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from core import cache as object_cache
+from core.models import Calendar, Event, Availability, Holiday
+from core.serializers import CalendarSerializer, EventSerializer, AvailabilitySerializer, HolidaySerializer
+from core.timezones import day_index, local_days
+
+PAYLOAD_KEY = 'calendar-page:{}:{}-{:02d}:{}:{}:{}'
+# Matches ``userCountry`` in calendar.js
+HOLIDAY_COUNTRY = 'US'
+
+
+def _cache_key(user, year, month, versions):
+    digest = hashlib.md5(repr(sorted(versions.items())).encode(), usedforsecurity=False).hexdigest()
+    return PAYLOAD_KEY.format(user.pk, year, month, HOLIDAY_COUNTRY, user.timezone, digest)
+
+
+def _build(user, calendars, year, month):
+    days = local_days(user.timezone)
+    first = date(year, month, 1)
+    last = date(year, month, monthrange(year, month)[1])
+    start, end = days.bounds(first, last)
+    calendar_ids = [calendar.pk for calendar in calendars]
+
+    events = list(Event.objects.filter(
+        calendar_id__in=calendar_ids, start_time__lt=end, end_time__gte=start
+    ).select_related('calendar').order_by('start_time'))
+    availabilities = list(Availability.objects.filter(
+        calendar_id__in=calendar_ids, start_time__lt=end, end_time__gte=start
+    ).select_related('user', 'calendar').order_by('start_time'))
+    holidays = list(Holiday.objects.filter(
+        country=HOLIDAY_COUNTRY, date__gte=first, date__lte=last
+    ).order_by('date'))
+
+    event_data = EventSerializer(events, many=True).data
+    for event in event_data:
+        event['calendar_id'] = event['calendar']
+    return {
+        'year': year,
+        'month': month,
+        'calendars': CalendarSerializer(calendars, many=True).data,
+        'events': event_data,
+        'availabilities': AvailabilitySerializer(availabilities, many=True).data,
+        'holidays': HolidaySerializer(holidays, many=True).data,
+        'timezone': days.zone_name,
+        'days': day_index(days, first, last, events, availabilities, holidays),
+    }
+
+
+def month_payload(user, year, month):
+    """Calendars, events, availability and holidays of ``user`` for one month."""
+    calendars = list(
+        Calendar.objects.filter(Q(owner=user) | Q(shares__user=user))
+        .select_related('owner').distinct().order_by('pk')
+    )
+    key = _cache_key(user, year, month, object_cache.get_calendar_versions([c.pk for c in calendars]))
+    payload = cache.get(key)
+    if payload is None:
+        payload = _build(user, calendars, year, month)
+        cache.set(key, payload, settings.CALENDAR_PAGE_CACHE_SECONDS)
+    return payload
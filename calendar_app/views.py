@@ -2,9 +2,14 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login, logout
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
+from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
+from core.timezones import local_days
+
+from .payload import month_payload
+
 
 def login_view(request):
     """Login page"""
@@ -23,14 +28,22 @@ def logout_view(request):
 @login_required
 def calendar_view(request):
     """Main calendar view"""
-    return render(request, 'calendar_app/calendar.html')
+    today = local_days(request.user.timezone).day(timezone.now())
+    return render(request, 'calendar_app/calendar.html', {
+        'initial_data': month_payload(request.user, today.year, today.month),
+    })
 
 
 @login_required
 def calendar_month(request, year=None, month=None):
     """Calendar month view"""
+    # Local month bounds need a day of margin either side of the year range
+    if not 1 <= month <= 12 or not 1 < year < 9999:
+        raise Http404('No such month')
+    initial_data = month_payload(request.user, year, month)
     return render(request, 'calendar_app/calendar.html', {
         'year': year,
         'month': month,
+        'initial_data': {**initial_data, 'fixed_month': True},
     })
 
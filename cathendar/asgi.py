@@ -3,26 +3,39 @@ ASGI config for cathendar project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+HTTP goes straight to Django. The channels websocket stack is built on the
+first websocket connection, so workers that only serve HTTP never import it.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
 
 import os
 
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'cathendar.settings')
 
 django_asgi_app = get_asgi_application()
 
-application = ProtocolTypeRouter({
-    "http": django_asgi_app,
-    "websocket": AuthMiddlewareStack(
-        URLRouter([
-            # WebSocket URL routing will be added here
-        ])
-    ),
-})
+websocket_urlpatterns = [
+    # WebSocket URL routing will be added here
+]
+
+_websocket_app = None
+
+
+def get_websocket_application():
+    global _websocket_app
+    if _websocket_app is None:
+        from channels.auth import AuthMiddlewareStack
+        from channels.routing import URLRouter
+
+        _websocket_app = AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    return _websocket_app
+
 
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        return await get_websocket_application()(scope, receive, send)
+    return await django_asgi_app(scope, receive, send)
@@ -0,0 +1,182 @@
+"""
+Read-replica routing.
+
+``ReplicaRoutingMiddleware`` marks safe-method API requests as replica reads;
+``ReplicaRouter`` then sends their ORM reads to ``READ_REPLICA_ALIAS``. Writes
+always go to the primary. After a user writes, their reads stay on the primary
+for ``READ_REPLICA_PIN_SECONDS`` so they see their own changes despite
+replication lag. If the replica cannot be reached, it is skipped for
+``READ_REPLICA_RETRY_SECONDS`` and reads fall back to the primary.
+"""
+import contextvars
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.urls import Resolver404, resolve
+
+logger = logging.getLogger(__name__)
+
+# Views whose safe-method requests may be served from the replica
+REPLICA_VIEW_MODULES = ('core.views', 'core.admin_views')
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY = 'replica:pin:{}'
+
+_read_alias = contextvars.ContextVar('cathendar_read_alias', default=None)
+_replica_down_until = 0.0
+
+
+def current_read_alias():
+    """The alias reads are routed to in this context (None for the primary)."""
+    return _read_alias.get()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+
+def pin_to_primary(user_id):
+    """Keep ``user_id``'s reads on the primary for the pin window."""
+    cache.set(PIN_KEY.format(user_id), True, settings.READ_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return bool(cache.get(PIN_KEY.format(user_id)))
+
+
+def replica_available(alias):
+    """Connect to the replica unless it failed within the retry window."""
+    global _replica_down_until
+    if time.monotonic() < _replica_down_until:
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        logger.warning('Read replica %r unavailable, using the primary', alias, exc_info=True)
+        _replica_down_until = time.monotonic() + settings.READ_REPLICA_RETRY_SECONDS
+        return False
+    return True
+
+
+def _token_user_id(request):
+    """User id from a bearer token: (True, id) if a token header was sent."""
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken
+    from rest_framework_simplejwt.settings import api_settings
+
+    authenticator = JWTAuthentication()
+    header = authenticator.get_header(request)
+    if header is None:
+        return False, None
+    raw_token = authenticator.get_raw_token(header)
+    if raw_token is None:
+        return True, None
+    try:
+        return True, authenticator.get_validated_token(raw_token).get(api_settings.USER_ID_CLAIM)
+    except InvalidToken:
+        return True, None
+
+
+def _request_user_id(request):
+    """User id from the bearer token or session."""
+    has_token, user_id = _token_user_id(request)
+    if has_token:
+        return user_id
+    session = getattr(request, 'session', None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+async def _arequest_user_id(request):
+    has_token, user_id = _token_user_id(request)
+    if has_token:
+        return user_id
+    session = getattr(request, 'session', None)
+    return await session.aget(SESSION_KEY) if session is not None else None
+
+
+def _is_replica_view(request):
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    view = getattr(match.func, 'cls', match.func)
+    return view.__module__ in REPLICA_VIEW_MODULES
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route safe API requests to the read replica and pin writers to the
+    primary. Removes itself when no ``READ_REPLICA_ALIAS`` is configured.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.alias = getattr(settings, 'READ_REPLICA_ALIAS', None)
+        if not self.alias:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user_id = _request_user_id(request)
+
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if user_id is not None and response.status_code < 400:
+                pin_to_primary(user_id)
+            return response
+
+        use_replica = (
+            _is_replica_view(request)
+            and not (user_id is not None and is_pinned(user_id))
+            and replica_available(self.alias)
+        )
+        if not use_replica:
+            return self.get_response(request)
+
+        token = _read_alias.set(self.alias)
+        try:
+            return self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+
+    async def __acall__(self, request):
+        user_id = await _arequest_user_id(request)
+
+        if request.method not in SAFE_METHODS:
+            response = await self.get_response(request)
+            if user_id is not None and response.status_code < 400:
+                await sync_to_async(pin_to_primary)(user_id)
+            return response
+
+        use_replica = (
+            _is_replica_view(request)
+            and not (user_id is not None and await sync_to_async(is_pinned)(user_id))
+            and await sync_to_async(replica_available)(self.alias)
+        )
+        if not use_replica:
+            return await self.get_response(request)
+
+        token = _read_alias.set(self.alias)
+        try:
+            return await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
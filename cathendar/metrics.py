@@ -0,0 +1,143 @@
+"""
+In-process metrics registry with a Prometheus text exporter.
+
+Counters and histograms live in memory per worker process; each process is
+expected to be scraped on its own (or aggregated by the scraper).
+"""
+import threading
+from collections import defaultdict
+
+from django.http import HttpResponse
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+# Upper bounds (seconds) of the request latency histogram
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Registry:
+    """Thread-safe store of labelled counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._help = {}
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] += value
+
+    def observe(self, name, value, labels=None, buckets=LATENCY_BUCKETS):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    'buckets': buckets,
+                    'counts': [0] * len(buckets),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram['counts'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, dict(value, counts=list(value['counts'])))
+                for key, value in self._histograms.items()
+            )
+
+        lines = []
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.extend(self._header(name, 'counter'))
+            lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+
+        for (name, labels), histogram in histograms:
+            if name not in seen:
+                seen.add(name)
+                lines.extend(self._header(name, 'histogram'))
+            for bound, count in zip(histogram['buckets'], histogram['counts']):
+                bucket_labels = labels + (('le', _format_value(bound)),)
+                lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {count}')
+            inf_labels = labels + (('le', '+Inf'),)
+            lines.append(f'{name}_bucket{_format_labels(inf_labels)} {histogram["count"]}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(histogram["sum"])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {histogram["count"]}')
+
+        return '\n'.join(lines) + '\n'
+
+    def _header(self, name, metric_type):
+        if name in self._help:
+            yield f'# HELP {name} {self._help[name]}'
+        yield f'# TYPE {name} {metric_type}'
+
+
+def _label_key(labels):
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"'))
+        for k, v in labels
+    )
+    return '{' + pairs + '}'
+
+
+def _format_value(value):
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+registry = Registry()
+
+registry.describe('cathendar_request_duration_seconds', 'Wall time spent handling a request.')
+registry.describe('cathendar_db_queries_total', 'Database queries executed while handling requests.')
+registry.describe('cathendar_db_duration_seconds_total', 'Time spent in database queries.')
+registry.describe('cathendar_serializer_duration_seconds_total', 'Time spent in DRF serializers.')
+registry.describe('cathendar_response_bytes_total', 'Response body bytes sent.')
+registry.describe('cathendar_throttled_requests_total', 'API requests rejected by rate limiting.')
+
+
+def _cache_lines():
+    from core import cache as object_cache
+
+    name = 'cathendar_object_cache_requests_total'
+    lines = [f'# HELP {name} Object cache lookups by result.', f'# TYPE {name} counter']
+    for namespace, counts in sorted(object_cache.get_stats().items()):
+        for result in ('hits', 'misses'):
+            labels = (('namespace', namespace), ('result', result))
+            lines.append(f'{name}{_format_labels(labels)} {counts[result]}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint (staff only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(registry.render() + _cache_lines(), content_type=CONTENT_TYPE)
@@ -0,0 +1,203 @@
+"""
+Project-wide middleware.
+"""
+import contextvars
+import re
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+from .metrics import registry
+
+_current_timings = contextvars.ContextVar('cathendar_request_timings', default=None)
+
+
+class RequestTimings:
+    """Per-request accumulator filled by the DB wrapper and serializer hook."""
+
+    __slots__ = ('queries', 'db_time', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def _install_serializer_timer():
+    """Time top-level ``serializer.data`` evaluation for instrumented requests.
+
+    DRF has no hook for this, so ``BaseSerializer.data`` is wrapped once, and
+    only when instrumentation is enabled.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, '_cathendar_timed', False):
+        return
+
+    def timed_data(self):
+        timings = _current_timings.get()
+        if timings is None:
+            return original.fget(self)
+        timings.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            timings.serializer_depth -= 1
+            if timings.serializer_depth == 0:
+                timings.serializer_time += time.perf_counter() - start
+
+    timed_data._cathendar_timed = True
+    BaseSerializer.data = property(timed_data)
+
+
+class InstrumentationMiddleware:
+    """
+    Record per-view wall time, DB query count/time, serializer time and
+    response size, and emit them as a ``Server-Timing`` header.
+
+    Disabled unless ``PERF_INSTRUMENTATION`` is set, in which case Django
+    drops the middleware at startup and it costs nothing per request.
+    Supports both sync and async chains, so async views stay on the loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'PERF_SERVER_TIMING', True)
+        _install_serializer_timer()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self._wrap_connections(stack, timings)
+                response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self._record(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                self._wrap_connections(stack, timings)
+                response = await self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        return self._record(request, response, timings, time.perf_counter() - start)
+
+    @staticmethod
+    def _wrap_connections(stack, timings):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+
+    def _record(self, request, response, timings, duration):
+        match = getattr(request, 'resolver_match', None)
+        labels = {'view': match.view_name if match else 'unresolved'}
+        size = 0 if response.streaming else len(response.content)
+
+        registry.observe('cathendar_request_duration_seconds', duration, labels)
+        registry.inc('cathendar_db_queries_total', labels, timings.queries)
+        registry.inc('cathendar_db_duration_seconds_total', labels, timings.db_time)
+        registry.inc('cathendar_serializer_duration_seconds_total', labels, timings.serializer_time)
+        registry.inc('cathendar_response_bytes_total', labels, size)
+
+        if self.server_timing:
+            response['Server-Timing'] = ', '.join([
+                f'total;dur={duration * 1000:.2f}',
+                f'db;dur={timings.db_time * 1000:.2f};desc="{timings.queries} queries"',
+                f'serialize;dur={timings.serializer_time * 1000:.2f}',
+            ])
+        return response
+
+
+_accepts_br = re.compile(r'\bbr\b')
+
+BROTLI_CONTENT_TYPES = (
+    'application/json',
+    'application/vnd.cathendar.columnar+json',
+    'application/msgpack',
+)
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress response bodies of at least ``RESPONSE_COMPRESSION_MIN_BYTES``:
+    brotli when the client accepts it and the optional ``brotli`` package is
+    installed, gzip otherwise. Streaming responses (files from
+    ``cathendar.static_serving``, which has its own precompressed variants)
+    and responses that already carry a Content-Encoding are left alone.
+
+    Brotli is only used for API payloads (``BROTLI_CONTENT_TYPES``). HTML and
+    anything else that may echo a secret such as the CSRF token next to
+    attacker-controlled input goes through ``GZipMiddleware``, whose random
+    padding (``max_random_bytes``) is Django's BREACH mitigation.
+
+    Removed at startup when ``RESPONSE_COMPRESSION`` is off, e.g. when a
+    reverse proxy compresses instead.
+    """
+
+    # Fast enough to run per request while still well ahead of gzip
+    brotli_quality = 5
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'RESPONSE_COMPRESSION', False):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.min_bytes = settings.RESPONSE_COMPRESSION_MIN_BYTES
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if len(response.content) < self.min_bytes:
+            return response
+        if brotli is None or not _accepts_br.search(request.headers.get('Accept-Encoding', '')):
+            return super().process_response(request, response)
+        if response.get('Content-Type', '').split(';')[0].strip() not in BROTLI_CONTENT_TYPES:
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 import os
+import sys
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -31,6 +32,9 @@ DEBUG = os.getenv('DEBUG', 'True') == 'True'
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 
+# True while running `manage.py test`
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
 CORS_ORIGIN_ALLOW_ALL = True
 
 
@@ -58,16 +62,29 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'cathendar.middleware.InstrumentationMiddleware',
+    'cathendar.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'cathendar.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request instrumentation (per-view timings, query counts, Server-Timing
+# headers and /metrics/). The middleware removes itself when disabled.
+PERF_INSTRUMENTATION = os.getenv('PERF_INSTRUMENTATION', 'False') == 'True'
+PERF_SERVER_TIMING = os.getenv('PERF_SERVER_TIMING', 'True') == 'True'
+
+# gzip/brotli compression of response bodies of at least
+# RESPONSE_COMPRESSION_MIN_BYTES. Turn off when a proxy compresses instead.
+RESPONSE_COMPRESSION = os.getenv('RESPONSE_COMPRESSION', 'True') == 'True'
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', 1024))
+
 ROOT_URLCONF = 'cathendar.urls'
 
 TEMPLATES = [
@@ -110,6 +127,103 @@ DATABASES = {
     }
 }
 
+# Optional read replica for safe API requests (see cathendar.db_router).
+# Two local SQLite files work too: copy db.sqlite3 to replica.sqlite3 and set
+# REPLICA_DB_NAME='file:replica.sqlite3?mode=ro'.
+# https://docs.djangoproject.com/en/5.0/topics/db/multi-db/
+
+REPLICA_DB_NAME = os.getenv('REPLICA_DB_NAME')
+READ_REPLICA_ALIAS = 'replica' if REPLICA_DB_NAME else None
+
+if READ_REPLICA_ALIAS:
+    DATABASES[READ_REPLICA_ALIAS] = {
+        'ENGINE': os.getenv('REPLICA_DB_ENGINE', DATABASES['default']['ENGINE']),
+        'NAME': REPLICA_DB_NAME,
+        'USER': os.getenv('REPLICA_DB_USER', ''),
+        'PASSWORD': os.getenv('REPLICA_DB_PASSWORD', ''),
+        'HOST': os.getenv('REPLICA_DB_HOST', ''),
+        'PORT': os.getenv('REPLICA_DB_PORT', ''),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['cathendar.db_router.ReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write (replication lag)
+READ_REPLICA_PIN_SECONDS = int(os.getenv('READ_REPLICA_PIN_SECONDS', '5'))
+# Seconds to skip an unreachable replica before trying it again
+READ_REPLICA_RETRY_SECONDS = int(os.getenv('READ_REPLICA_RETRY_SECONDS', '30'))
+
+# Monthly partitioning of core_event / core_availability on PostgreSQL. Applied
+# by migration 0006 (or `manage_partitions --convert`); see core.partitioning.
+PARTITION_CALENDAR_DATA = os.getenv('PARTITION_CALENDAR_DATA', 'False') == 'True'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Redis when REDIS_URL is set (or CACHE_BACKEND=redis), local memory otherwise
+# and always under tests.
+
+REDIS_URL = os.getenv('REDIS_URL')
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'redis' if REDIS_URL else 'locmem')
+
+if CACHE_BACKEND == 'redis' and not TESTING:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL or 'redis://127.0.0.1:6379/1',
+            'KEY_PREFIX': 'cathendar',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'cathendar',
+        },
+    }
+
+# Seconds that users, calendars and share lists stay in the object cache
+OBJECT_CACHE_TIMEOUT = int(os.getenv('OBJECT_CACHE_TIMEOUT', 300))
+
+# Seconds a calendar page's embedded month data is cached (keyed on the data
+# versions of the user's calendars, so edits show up immediately)
+CALENDAR_PAGE_CACHE_SECONDS = int(os.getenv('CALENDAR_PAGE_CACHE_SECONDS', 300))
+
+# Seconds identical event/availability list responses are shared (keyed on
+# the calendar's data version; see core.singleflight)
+SINGLE_FLIGHT_CACHE_SECONDS = int(os.getenv('SINGLE_FLIGHT_CACHE_SECONDS', 5))
+
+# Availability markers older than this many days are compacted into
+# AvailabilityArchive by `manage.py compact_availability`
+AVAILABILITY_ARCHIVE_HORIZON_DAYS = int(os.getenv('AVAILABILITY_ARCHIVE_HORIZON_DAYS', 90))
+
+
+# Fast authentication path: stateless JWT users built from token claims and
+# sessions that do not touch the database. See core.authentication.
+AUTH_FAST_PATH = os.getenv('AUTH_FAST_PATH', 'False') == 'True'
+
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.signed_cookies' if AUTH_FAST_PATH
+    else 'django.contrib.sessions.backends.db',
+)
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# PASSWORD_HASH_ITERATIONS sets the PBKDF2 work factor (Django's default when
+# unset). Existing hashes are upgraded on the next successful login.
+
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 0)) or None
+
+PASSWORD_HASHERS = [
+    'core.hashers.ConfigurablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#password-validators
@@ -149,6 +263,23 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Content-hashed, precompressed static files (run collectstatic before starting)
+# https://docs.djangoproject.com/en/5.0/ref/contrib/staticfiles/#manifeststaticfilesstorage
+STATIC_MANIFEST = os.getenv('STATIC_MANIFEST', str(not DEBUG)) == 'True'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': (
+            'cathendar.storage.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+# Serve STATIC_ROOT from Django (when no web server is in front of the app)
+SERVE_STATIC = os.getenv('SERVE_STATIC', 'False') == 'True'
+STATIC_MAX_AGE = 365 * 24 * 60 * 60  # hashed files never change
+STATIC_SHORT_MAX_AGE = 60
+
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -174,19 +305,35 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.ClaimsJWTAuthentication' if AUTH_FAST_PATH
+        else 'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.UserTokenBucketThrottle',
+        'core.throttling.ScopedTokenBucketThrottle',
+    ],
+    # Token buckets: N requests of burst, refilled at N per period
+    'DEFAULT_THROTTLE_RATES': {
+        'user': os.getenv('THROTTLE_USER_RATE', '600/min'),
+        'login': os.getenv('THROTTLE_LOGIN_RATE', '10/min'),
+        'register': os.getenv('THROTTLE_REGISTER_RATE', '5/min'),
+        'availability-aggregated': os.getenv('THROTTLE_AGGREGATED_RATE', '60/min'),
+    },
 }
 
+# Rate limiting (see core.throttling). Off under tests; turn it off for load tests too.
+API_THROTTLING = os.getenv('API_THROTTLING', 'True') == 'True' and not TESTING
+
 from datetime import timedelta
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': True,
+    'TOKEN_REFRESH_SERIALIZER': 'core.authentication.ClaimsTokenRefreshSerializer',
 }
 
 
@@ -0,0 +1,57 @@
+"""
+Static file storage with precompressed variants.
+
+``collectstatic`` writes content-hashed copies of every asset (via
+``ManifestStaticFilesStorage``) and, for text assets, ``.gz`` and ``.br``
+files next to them so the server never compresses at request time. Brotli
+output needs the optional ``brotli`` package; without it only gzip is written.
+"""
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.html')
+# Small files gain nothing once headers are counted
+MIN_COMPRESS_SIZE = 256
+
+
+def compressed_variants(content):
+    """Yield ``(suffix, data)`` for each encoding that actually shrinks ``content``."""
+    encoders = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    for suffix, encode in encoders:
+        data = encode(content)
+        if len(data) < len(content) * 0.95:
+            yield suffix, data
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        # Files can be yielded once per pass; the last hashed name wins
+        hashed = {}
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed[name] = hashed_name
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+
+        for name, hashed_name in hashed.items():
+            if not hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            with self.open(hashed_name) as source:
+                content = source.read()
+            if len(content) < MIN_COMPRESS_SIZE:
+                continue
+            for suffix, data in compressed_variants(content):
+                if self.exists(hashed_name + suffix):
+                    self.delete(hashed_name + suffix)
+                self._save(hashed_name + suffix, ContentFile(data))
+                yield name, hashed_name + suffix, True
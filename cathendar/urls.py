@@ -15,15 +15,18 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from calendar_app import views as calendar_views
+from . import static_serving
+from .metrics import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('admin-panel/', include('admin_panel.urls')),
     path('api/', include('core.urls')),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     path('accounts/login/', calendar_views.login_view, name='accounts_login'),  # Django default redirect
     path('', include('calendar_app.urls')),
 ]
@@ -31,4 +34,8 @@ urlpatterns = [
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+elif settings.SERVE_STATIC:
+    urlpatterns += [
+        re_path(rf'^{settings.STATIC_URL.strip("/")}/(?P<path>.+)$', static_serving.serve, name='static'),
+    ]
 
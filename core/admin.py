@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import User, Calendar, Event, Availability, Friend, CalendarShare, Holiday
+from django.db.models.expressions import RawSQL
+from .models import User, Calendar, Event, Availability, AvailabilityArchive, Friend, CalendarShare, Holiday
+from .purge import soft_delete_calendar, soft_delete_user
+from .search import matching_event_ids
 
 
 @admin.register(User)
@@ -8,6 +11,14 @@ class UserAdmin(admin.ModelAdmin):
     search_fields = ['email', 'username', 'first_name', 'last_name']
     list_filter = ['date_joined', 'is_staff', 'is_superuser']
 
+    # Deletes are soft; purge_deleted removes the data in batches (core.purge)
+    def delete_model(self, request, obj):
+        soft_delete_user(obj)
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            soft_delete_user(user)
+
 
 @admin.register(Calendar)
 class CalendarAdmin(admin.ModelAdmin):
@@ -15,6 +26,13 @@ class CalendarAdmin(admin.ModelAdmin):
     search_fields = ['name', 'description']
     list_filter = ['created_at']
 
+    def delete_model(self, request, obj):
+        soft_delete_calendar(obj)
+
+    def delete_queryset(self, request, queryset):
+        for calendar in queryset:
+            soft_delete_calendar(calendar)
+
 
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
@@ -22,6 +40,13 @@ class EventAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description']
     list_filter = ['start_time', 'calendar']
 
+    def get_search_results(self, request, queryset, search_term):
+        # Answered by the full-text index where there is one (core.search)
+        matches = matching_event_ids(search_term)
+        if matches is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=RawSQL(*matches)), False
+
 
 @admin.register(Availability)
 class AvailabilityAdmin(admin.ModelAdmin):
@@ -30,6 +55,13 @@ class AvailabilityAdmin(admin.ModelAdmin):
     search_fields = ['title', 'description', 'user__email', 'user__username']
 
 
+@admin.register(AvailabilityArchive)
+class AvailabilityArchiveAdmin(admin.ModelAdmin):
+    list_display = ['user', 'calendar', 'start_date', 'end_date', 'is_busy', 'title']
+    list_filter = ['is_busy', 'calendar']
+    search_fields = ['title', 'user__email', 'user__username']
+
+
 @admin.register(Friend)
 class FriendAdmin(admin.ModelAdmin):
     list_display = ['user', 'friend', 'created_at']
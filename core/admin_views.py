@@ -2,11 +2,15 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action, permission_classes
 from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 
+from . import cache as object_cache
 from .models import User, Calendar, Event, Availability, Friend, CalendarShare
+from .purge import soft_delete_calendar, soft_delete_user
+from .search import search_events, search_users
 from .serializers import (
     UserSerializer, CalendarSerializer, EventSerializer,
     AvailabilitySerializer, FriendSerializer, CalendarShareSerializer
@@ -15,13 +19,18 @@ from .serializers import (
 
 class AdminUserViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deleted_at__isnull=True)
     serializer_class = UserSerializer
 
+    def perform_destroy(self, instance):
+        # Deactivated and hidden at once; their data is purged in the background
+        soft_delete_user(instance)
+
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        total_users = User.objects.count()
-        active_users = User.objects.filter(
+        users = self.get_queryset()
+        total_users = users.count()
+        active_users = users.filter(
             last_login__gte=timezone.now() - timedelta(days=30)
         ).count()
         return Response({
@@ -29,16 +38,29 @@ class AdminUserViewSet(viewsets.ModelViewSet):
             'active_users': active_users,
         })
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        users = search_users(request.query_params.get('q', ''), limit=limit)
+        serializer = self.get_serializer(users, many=True)
+        return Response(serializer.data)
+
 
 class AdminCalendarViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
-    queryset = Calendar.objects.all()
+    queryset = Calendar.objects.select_related('owner')
     serializer_class = CalendarSerializer
 
+    def perform_destroy(self, instance):
+        soft_delete_calendar(instance)
+
     @action(detail=False, methods=['get'])
     def stats(self, request):
         total_calendars = Calendar.objects.count()
-        shared_calendars = Calendar.objects.filter(shares__isnull=False).distinct().count()
+        shared_calendars = Calendar.objects.filter(share_count__gt=0).count()
         return Response({
             'total_calendars': total_calendars,
             'shared_calendars': shared_calendars,
@@ -47,37 +69,55 @@ class AdminCalendarViewSet(viewsets.ModelViewSet):
 
 class AdminEventViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
-    queryset = Event.objects.all()
+    queryset = Event.objects.select_related('calendar').filter(calendar__deleted_at__isnull=True)
     serializer_class = EventSerializer
 
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        total_events = Event.objects.count()
-        upcoming_events = Event.objects.filter(start_time__gte=timezone.now()).count()
+        events = self.get_queryset()
+        total_events = events.count()
+        upcoming_events = events.filter(start_time__gte=timezone.now()).count()
         return Response({
             'total_events': total_events,
             'upcoming_events': upcoming_events,
         })
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 50))
+            events, next_cursor = search_events(
+                request.query_params.get('q', ''), cursor=request.query_params.get('cursor'), limit=limit,
+            )
+        except ValueError:
+            return Response({'error': 'limit must be an integer and cursor a value from next'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'next': next_cursor and replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor),
+            'results': self.get_serializer(events, many=True).data,
+        })
+
 
 class AdminAnalyticsViewSet(viewsets.ViewSet):
     permission_classes = [IsAdminUser]
 
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
-        # User stats
-        total_users = User.objects.count()
-        active_users = User.objects.filter(
+        # User stats (soft-deleted users and calendars are left out, as in the lists)
+        users = User.objects.filter(deleted_at__isnull=True)
+        total_users = users.count()
+        active_users = users.filter(
             last_login__gte=timezone.now() - timedelta(days=30)
         ).count()
         
         # Calendar stats
         total_calendars = Calendar.objects.count()
-        shared_calendars = Calendar.objects.filter(shares__isnull=False).distinct().count()
+        shared_calendars = Calendar.objects.filter(share_count__gt=0).count()
         
         # Event stats
-        total_events = Event.objects.count()
-        upcoming_events = Event.objects.filter(start_time__gte=timezone.now()).count()
+        events = Event.objects.filter(calendar__deleted_at__isnull=True)
+        total_events = events.count()
+        upcoming_events = events.filter(start_time__gte=timezone.now()).count()
         
         # Availability stats
         total_availabilities = Availability.objects.count()
@@ -108,3 +148,7 @@ class AdminAnalyticsViewSet(viewsets.ViewSet):
             },
         })
 
+    @action(detail=False, methods=['get'])
+    def cache(self, request):
+        """Hit/miss counters of the per-object cache in this process"""
+        return Response(object_cache.get_stats())
@@ -0,0 +1,187 @@
+"""
+Archival of past availability markers.
+
+``compact_availability`` moves whole-day markers that ended before a cutoff
+into ``AvailabilityArchive``, merging consecutive days with the same status
+and note into one range per run. ``archived_availability`` expands archived
+ranges back into daily ``Availability`` instances (unsaved, ``id`` None) for
+callers that ask for history. Days are the marker owner's local days
+(``User.timezone``), as in ``AvailabilityViewSet.perform_create``.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+
+from .models import Availability, AvailabilityArchive
+from .timezones import local_days
+
+BATCH_SIZE = 5000
+ONE_DAY = timedelta(days=1)
+# A day marker ends at the last second (or millisecond) of its local day
+DAY_END_SLACK = timedelta(seconds=1)
+
+
+def _is_whole_day(marker, days):
+    """
+    Markers the calendar UI creates: local midnight to 23:59:59 (maybe several
+    days), in ``days``, the owner's zone.
+    """
+    start, end = _day_span(marker, days)
+    return (
+        marker.start_time == days.start_of(start)
+        and end >= start
+        and days.start_of(end + ONE_DAY) - marker.end_time <= DAY_END_SLACK
+    )
+
+
+def _day_span(marker, days):
+    return days.day(marker.start_time), days.day(marker.end_time)
+
+
+def _expand(archived, days, first=None, last=None):
+    """Unsaved daily ``Availability`` rows for one archived range, in its owner's zone."""
+    day = max(archived.start_date, first) if first else archived.start_date
+    last = min(archived.end_date, last) if last else archived.end_date
+    rows = []
+    while day <= last:
+        rows.append(Availability(
+            user=archived.user,
+            calendar=archived.calendar,
+            start_time=days.start_of(day),
+            end_time=days.start_of(day + ONE_DAY) - DAY_END_SLACK,
+            is_busy=archived.is_busy,
+            title=archived.title,
+            description=archived.description,
+        ))
+        day += ONE_DAY
+    return rows
+
+
+def _merge_runs(markers, days):
+    """Merge sorted markers of one user/calendar into archive ranges."""
+    runs = []
+    for marker in markers:
+        start, end = _day_span(marker, days)
+        key = (marker.is_busy, marker.title, marker.description)
+        last = runs[-1] if runs else None
+        if last is not None and last['key'] == key and start <= last['end'] + ONE_DAY:
+            last['end'] = max(last['end'], end)
+        else:
+            runs.append({'key': key, 'start': start, 'end': end})
+    return runs
+
+
+def _archive_group(user_id, calendar_id, markers, days):
+    """``(extended, ranges)``: archived ranges widened to take in runs, and the new ranges."""
+    runs = _merge_runs(markers, days)
+    existing = list(AvailabilityArchive.objects.filter(
+        user_id=user_id, calendar_id=calendar_id,
+        start_date__lte=runs[-1]['end'] + ONE_DAY, end_date__gte=runs[0]['start'] - ONE_DAY,
+    ))
+    extended, ranges = {}, []
+    for run in runs:
+        # Only a range the run touches or overlaps may take it in; widening
+        # across a gap would give days no marker covered the run's status
+        previous = next((
+            archived for archived in existing
+            if (archived.is_busy, archived.title, archived.description) == run['key']
+            and archived.start_date <= run['end'] + ONE_DAY and archived.end_date >= run['start'] - ONE_DAY
+        ), None)
+        if previous is None:
+            ranges.append(AvailabilityArchive(
+                user_id=user_id, calendar_id=calendar_id, start_date=run['start'], end_date=run['end'],
+                is_busy=run['key'][0], title=run['key'][1], description=run['key'][2],
+            ))
+            continue
+        previous.start_date = min(previous.start_date, run['start'])
+        previous.end_date = max(previous.end_date, run['end'])
+        extended[previous.pk] = previous
+    return list(extended.values()), ranges
+
+
+def compact_availability(before, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Archive whole-day markers that ended before ``before`` (a datetime).
+
+    Returns ``(markers, ranges)``: live rows archived and archive ranges
+    written. Markers with times inside the day are left in place. Safe to
+    re-run: ranges that continue an archived one extend it.
+    """
+    expired = Availability.objects.filter(end_time__lt=before)
+    # Fetch per user/calendar rather than iterating one cursor while deleting
+    # from the same table (SQLite has no isolation within a connection)
+    groups = list(
+        expired.values_list('user_id', 'calendar_id', 'user__timezone').distinct().order_by('user_id', 'calendar_id')
+    )
+    archived_markers = archived_ranges = 0
+    pending_ids, pending_ranges, pending_extended = [], [], []
+
+    def flush():
+        # Every write of the pending groups commits together or not at all
+        with transaction.atomic():
+            AvailabilityArchive.objects.bulk_update(pending_extended, ['start_date', 'end_date'], batch_size=batch_size)
+            AvailabilityArchive.objects.bulk_create(pending_ranges, batch_size=batch_size)
+            for ids in (pending_ids[i:i + batch_size] for i in range(0, len(pending_ids), batch_size)):
+                Availability.objects.filter(pk__in=ids).delete()
+        pending_ids.clear()
+        pending_ranges.clear()
+        pending_extended.clear()
+
+    for user_id, calendar_id, zone in groups:
+        days = local_days(zone)
+        markers = [
+            marker for marker in expired.filter(user_id=user_id, calendar_id=calendar_id).order_by('start_time')
+            if _is_whole_day(marker, days)
+        ]
+        if not markers:
+            continue
+        archived_markers += len(markers)
+        if dry_run:
+            archived_ranges += len(_merge_runs(markers, days))
+            continue
+        extended, ranges = _archive_group(user_id, calendar_id, markers, days)
+        archived_ranges += len(ranges)
+        pending_extended.extend(extended)
+        pending_ids.extend(marker.pk for marker in markers)
+        pending_ranges.extend(ranges)
+        if len(pending_ids) >= batch_size:
+            flush()
+    if pending_ids:
+        flush()
+    return archived_markers, archived_ranges
+
+
+def archived_availability(calendar_id, start=None, end=None):
+    """Daily unsaved ``Availability`` rows expanded from archived ranges, in each owner's zone."""
+    ranges = AvailabilityArchive.objects.filter(calendar_id=calendar_id).select_related('user', 'calendar')
+    if start is not None:
+        ranges = ranges.filter(end_date__gte=start)
+    if end is not None:
+        ranges = ranges.filter(start_date__lte=end)
+
+    zones = {}
+    rows = []
+    for archived in ranges.order_by('start_date', 'user_id'):
+        days = zones.setdefault(archived.user.timezone, local_days(archived.user.timezone))
+        rows += _expand(archived, days, start, end)
+    return rows
+
+
+def with_archived_availability(calendar_id, live):
+    """``live`` markers plus archived days that no live marker covers."""
+    zones = {}
+
+    def days_of(marker):
+        return zones.setdefault(marker.user.timezone, local_days(marker.user.timezone))
+
+    covered = set()
+    for marker in live:
+        start, end = _day_span(marker, days_of(marker))
+        while start <= end:
+            covered.add((marker.user_id, start))
+            start += ONE_DAY
+    archived = [
+        day for day in archived_availability(calendar_id)
+        if (day.user_id, days_of(day).day(day.start_time)) not in covered
+    ]
+    return archived + live
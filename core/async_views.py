@@ -0,0 +1,203 @@
+"""
+Native async read views for the hottest calendar page requests.
+
+Under ASGI these run on the event loop instead of occupying a thread from the
+sync-to-async pool for the whole request. Independent queries are issued
+together with ``asyncio.gather``; responses have the same shape as the
+corresponding DRF endpoints. Only reads live here; writes stay in ``views``.
+
+Bare ``start_date``/``end_date`` values are days in the user's time zone.
+``calendar_data`` (and the range views with ``?group_by=day``) also return
+``days``: the ids of events, availability and holidays on each local day
+(see ``core.timezones.day_index``), so clients need not re-bucket.
+"""
+import asyncio
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .authentication import USER_CLAIMS, ClaimsJWTAuthentication, claims_revoked
+from .models import User, Calendar, Event, Availability, CalendarShare, Holiday
+from .serializers import CalendarSerializer, EventSerializer, AvailabilitySerializer, HolidaySerializer
+from .timezones import day_index, local_days
+
+_jwt = ClaimsJWTAuthentication()
+
+
+def _error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+async def _authenticate(request):
+    """Async equivalent of the API's JWT + session authentication."""
+    header = _jwt.get_header(request)
+    if header is not None:
+        raw_token = _jwt.get_raw_token(header)
+        if raw_token is None:
+            return None
+        try:
+            token = _jwt.get_validated_token(raw_token)
+        except (InvalidToken, TokenError):
+            return None
+        if settings.AUTH_FAST_PATH and all(claim in token for claim in USER_CLAIMS) and not claims_revoked(token):
+            return _jwt.get_user(token)
+        return await User.objects.filter(
+            pk=token[jwt_settings.USER_ID_CLAIM], is_active=True
+        ).afirst()
+
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def _parse_bound(value, days, end=False):
+    """Parse an ISO date or datetime; a bare date is a local day, covered whole as an end bound."""
+    if not value:
+        return None
+    # Dates first: parse_datetime also accepts a bare date, as UTC midnight
+    day = parse_date(value)
+    if day is None:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(value)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=dt_timezone.utc)
+    if end:
+        return days.start_of(day + timedelta(days=1)) - timedelta(microseconds=1)
+    return days.start_of(day)
+
+
+def _date_range(request, days):
+    start = _parse_bound(request.GET.get('start_date'), days)
+    end = _parse_bound(request.GET.get('end_date'), days, end=True)
+    if start is None or end is None:
+        raise ValueError('start_date and end_date are required')
+    return start, end
+
+
+def _by_day(request):
+    return request.GET.get('group_by') == 'day'
+
+
+async def _fetch_calendar(calendar_id, user):
+    """Return (calendar, can_read) with both lookups in flight at once."""
+    calendar, shared = await asyncio.gather(
+        Calendar.objects.select_related('owner').filter(pk=calendar_id).afirst(),
+        CalendarShare.objects.filter(calendar_id=calendar_id, user_id=user.pk).aexists(),
+    )
+    can_read = calendar is not None and (calendar.owner_id == user.pk or shared or user.is_staff)
+    return calendar, can_read
+
+
+async def _events(calendar_id, start, end):
+    queryset = Event.objects.filter(
+        calendar_id=calendar_id, start_time__lte=end, end_time__gte=start
+    ).select_related('calendar').order_by('start_time')
+    return [event async for event in queryset.aiterator()]
+
+
+async def _availabilities(calendar_id, start, end):
+    queryset = Availability.objects.filter(
+        calendar_id=calendar_id, start_time__lte=end, end_time__gte=start
+    ).select_related('user', 'calendar').order_by('start_time')
+    return [availability async for availability in queryset.aiterator()]
+
+
+async def _holidays(country, first, last):
+    queryset = Holiday.objects.filter(
+        country=country, date__gte=first, date__lte=last
+    ).order_by('date')
+    return [holiday async for holiday in queryset.aiterator()]
+
+
+@require_GET
+async def calendar_data(request, calendar_id):
+    """Calendar, events, availability and holidays for one calendar and range"""
+    user = await _authenticate(request)
+    if user is None:
+        return _error('Authentication credentials were not provided.', 401)
+    days = local_days(user.timezone)
+    try:
+        start, end = _date_range(request, days)
+    except ValueError:
+        return _error('start_date and end_date are required (YYYY-MM-DD or ISO datetime)', 400)
+    first, last = days.day(start), days.day(end)
+
+    (calendar, can_read), events, availabilities, holidays = await asyncio.gather(
+        _fetch_calendar(calendar_id, user),
+        _events(calendar_id, start, end),
+        _availabilities(calendar_id, start, end),
+        _holidays(request.GET.get('country', 'US'), first, last),
+    )
+    if calendar is None:
+        return _error('Calendar not found', 404)
+    if not can_read:
+        return _error("You don't have access to this calendar", 403)
+
+    return JsonResponse({
+        'calendar': CalendarSerializer(calendar).data,
+        'events': EventSerializer(events, many=True).data,
+        'availability': AvailabilitySerializer(availabilities, many=True).data,
+        'holidays': HolidaySerializer(holidays, many=True).data,
+        'timezone': days.zone_name,
+        'days': day_index(days, first, last, events, availabilities, holidays),
+    })
+
+
+@require_GET
+async def event_range(request):
+    """Events of ?calendar_id= overlapping ?start_date=&end_date="""
+    user = await _authenticate(request)
+    if user is None:
+        return _error('Authentication credentials were not provided.', 401)
+    calendar_id = request.GET.get('calendar_id')
+    if not calendar_id or not calendar_id.isdigit():
+        return _error('calendar_id required', 400)
+    days = local_days(user.timezone)
+    try:
+        start, end = _date_range(request, days)
+    except ValueError:
+        return _error('start_date and end_date are required (YYYY-MM-DD or ISO datetime)', 400)
+
+    (calendar, can_read), events = await asyncio.gather(
+        _fetch_calendar(calendar_id, user),
+        _events(calendar_id, start, end),
+    )
+    if calendar is None:
+        return _error('Calendar not found', 404)
+    if not can_read:
+        return _error("You don't have access to this calendar", 403)
+    data = EventSerializer(events, many=True).data
+    if _by_day(request):
+        return JsonResponse({
+            'events': data,
+            'timezone': days.zone_name,
+            'days': day_index(days, days.day(start), days.day(end), events=events),
+        })
+    return JsonResponse(data, safe=False)
+
+
+@require_GET
+async def holiday_range(request):
+    """Async equivalent of ``holidays/for_date_range/``"""
+    user = await _authenticate(request)
+    if user is None:
+        return _error('Authentication credentials were not provided.', 401)
+    days = local_days(user.timezone)
+    try:
+        start, end = _date_range(request, days)
+    except ValueError:
+        return _error('start_date and end_date are required', 400)
+    first, last = days.day(start), days.day(end)
+    holidays = await _holidays(request.GET.get('country', 'US'), first, last)
+    data = HolidaySerializer(holidays, many=True).data
+    if _by_day(request):
+        return JsonResponse({
+            'holidays': data,
+            'timezone': days.zone_name,
+            'days': day_index(days, first, last, holidays=holidays),
+        })
+    return JsonResponse(data, safe=False)
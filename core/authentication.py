@@ -0,0 +1,99 @@
+"""
+Stateless JWT authentication.
+
+Tokens minted by :class:`ClaimsRefreshToken` carry the user's id, username,
+staff flag and time zone. :class:`ClaimsJWTAuthentication` builds ``request.user`` from those
+claims instead of loading the row, so authenticated reads cost no user query.
+Claims are re-read from the database whenever the refresh token is used.
+
+Saving a change to a claim (or to ``is_active``/``deleted_at``) or deleting the
+user records a revocation marker in the cache (``core.signals``). Tokens
+issued before the marker are checked against the database instead, so
+deactivated and deleted users lose access, and a new time zone applies, at
+once rather than at the next refresh.
+"""
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import cache as object_cache
+from .models import User
+
+USER_CLAIMS = ('username', 'is_staff', 'timezone')
+# Fields whose change revokes the claims in outstanding access tokens
+REVOKING_FIELDS = USER_CLAIMS + ('is_active', 'deleted_at')
+
+
+def add_user_claims(token, user):
+    token['username'] = user.username
+    token['is_staff'] = user.is_staff
+    token['timezone'] = user.timezone
+
+
+def claims_revoked(token):
+    """True when the user changed after ``token`` was issued, so its claims can't be trusted."""
+    revoked_at = object_cache.get_claims_revoked_at(token[api_settings.USER_ID_CLAIM])
+    return revoked_at is not None and token.get('iat', 0) <= revoked_at
+
+
+def request_user(request):
+    """
+    The full ``User`` row of ``request.user``. The claims-only user has a
+    blank email and names, so load it before serializing it.
+    """
+    user = request.user
+    if getattr(user, 'from_claims', False):
+        return object_cache.get_user(user.pk) or user
+    return user
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token whose access tokens carry the user claims."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        add_user_claims(token, user)
+        return token
+
+    @property
+    def access_token(self):
+        if self.token is not None:
+            # Decoded from a client-supplied token: pick up role/name changes
+            user = object_cache.get_user(self.payload.get(api_settings.USER_ID_CLAIM))
+            if user is not None:
+                add_user_claims(self, user)
+        return super().access_token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the token's user claims.
+
+    ``request.user`` is an unsaved-looking ``User`` with only ``id``,
+    ``username``, ``is_staff`` and ``timezone`` populated; use
+    ``core.cache.get_user`` when the full row is needed. Tokens without the
+    claims (e.g. minted before a claim was added) and tokens issued before the
+    user's last revocation fall back to a lookup, which also rejects inactive
+    and deleted users.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in USER_CLAIMS) or claims_revoked(validated_token):
+            return super().get_user(validated_token)
+
+        user = User(
+            id=validated_token[api_settings.USER_ID_CLAIM],
+            username=validated_token['username'],
+            is_staff=validated_token['is_staff'],
+            timezone=validated_token['timezone'],
+            is_active=True,
+        )
+        user._state.adding = False
+        user.from_claims = True
+        return user
@@ -0,0 +1,193 @@
+"""
+Busy/free day bitmaps.
+
+A year of one user's availability in one calendar is two Python ints used as
+366-bit sets: ``busy`` and ``free`` (explicitly marked available). Bit N is
+day-of-year N of the user's local days (``User.timezone`` via
+``core.timezones.LocalDays``), the same days the calendar UI marks and
+``AvailabilityViewSet`` dedupes by. Group questions become a handful of
+AND/OR operations on those ints: "who is free on all of these days" is one
+mask test per user, and "which days is everybody free" is one AND across users.
+
+Bitmaps are derived from ``Availability`` (and archived ranges) and are
+refreshed by ``sync_user`` whenever the API changes a user's markers. Run
+``manage.py rebuild_availability_bitmaps`` after bulk loads. Changing
+``User.timezone`` rebuilds that user's bitmaps (``rebuild(user_ids=...)``).
+"""
+from calendar import monthrange
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from .models import User, Availability, AvailabilityArchive, AvailabilityBitmap
+from .timezones import local_days
+
+YEAR_BYTES = 46  # 366 bits
+
+
+def day_index(day):
+    return day.timetuple().tm_yday - 1
+
+
+def to_bytes(bits):
+    return bits.to_bytes(YEAR_BYTES, 'little')
+
+
+def from_bytes(data):
+    return int.from_bytes(bytes(data), 'little')
+
+
+def range_mask(start, end):
+    """Bits for the days from ``start`` to ``end`` (inclusive), same year."""
+    return ((1 << (day_index(end) - day_index(start) + 1)) - 1) << day_index(start)
+
+
+def month_mask(year, month):
+    return range_mask(date(year, month, 1), date(year, month, monthrange(year, month)[1]))
+
+
+def days_in(bits, year):
+    """The dates whose bits are set."""
+    days = []
+    first = date(year, 1, 1)
+    while bits:
+        low = bits & -bits
+        days.append(first + timedelta(days=low.bit_length() - 1))
+        bits ^= low
+    return days
+
+
+def split_by_year(start, end):
+    """Yield ``(year, mask)`` for each year touched by the date range."""
+    for year in range(start.year, end.year + 1):
+        yield year, range_mask(max(start, date(year, 1, 1)), min(end, date(year, 12, 31)))
+
+
+def free_on_all(busy_by_user, mask):
+    """Users with no busy day inside ``mask``."""
+    return [user_id for user_id, busy in busy_by_user.items() if not busy & mask]
+
+
+def everyone_free(busy_by_user, mask):
+    """Days of ``mask`` (as bits) on which no user is busy."""
+    busy_any = 0
+    for busy in busy_by_user.values():
+        busy_any |= busy
+    return mask & ~busy_any
+
+
+def user_days(user_id):
+    """``LocalDays`` in the time zone of a user."""
+    return local_days(User.objects.filter(pk=user_id).values_list('timezone', flat=True).first())
+
+
+def _local_spans(days, markers):
+    """``(start, end, is_busy)`` markers as spans of local dates."""
+    return [(days.day(start), days.day(end), is_busy) for start, end, is_busy in markers]
+
+
+def _apply_spans(spans):
+    """Fold ``(start_date, end_date, is_busy)`` spans into ``{year: [busy, free]}``; later spans win."""
+    years = defaultdict(lambda: [0, 0])
+    for start, end, is_busy in spans:
+        for year, mask in split_by_year(start, end):
+            bits = years[year]
+            if is_busy:
+                bits[0], bits[1] = bits[0] | mask, bits[1] & ~mask
+            else:
+                bits[0], bits[1] = bits[0] & ~mask, bits[1] | mask
+    return years
+
+
+def compute_user_years(user_id, calendar_id, years, days=None):
+    """Return ``{year: [busy, free]}`` for one user and calendar; ``days`` is the user's ``LocalDays``."""
+    days = user_days(user_id) if days is None else days
+    first, last = date(min(years), 1, 1), date(max(years), 12, 31)
+    archived = AvailabilityArchive.objects.filter(
+        user_id=user_id, calendar_id=calendar_id, start_date__lte=last, end_date__gte=first,
+    ).values_list('start_date', 'end_date', 'is_busy')
+    live = Availability.objects.filter(
+        user_id=user_id, calendar_id=calendar_id,
+        start_time__lt=days.start_of(last + timedelta(days=1)),
+        end_time__gte=days.start_of(first),
+    ).order_by('start_time').values_list('start_time', 'end_time', 'is_busy')
+
+    # Live markers come last, so they override archived days
+    spans = list(archived) + _local_spans(days, live)
+    return _apply_spans(spans)
+
+
+def sync_user(user_id, calendar_id, years, days=None):
+    """Recompute and store the bitmaps of one user for the given years."""
+    years = set(years)
+    if not years:
+        return
+    computed = compute_user_years(user_id, calendar_id, years, days)
+    rows = [
+        AvailabilityBitmap(
+            user_id=user_id, calendar_id=calendar_id, year=year,
+            busy_days=to_bytes(computed[year][0]), free_days=to_bytes(computed[year][1]),
+        )
+        for year in sorted(years) if any(computed.get(year, (0, 0)))
+    ]
+    if rows:
+        AvailabilityBitmap.objects.bulk_create(
+            rows, update_conflicts=True,
+            unique_fields=['calendar', 'year', 'user'], update_fields=['busy_days', 'free_days'],
+        )
+    empty = years - {row.year for row in rows}
+    if empty:
+        AvailabilityBitmap.objects.filter(user_id=user_id, calendar_id=calendar_id, year__in=empty).delete()
+
+
+def years_between(start_time, end_time, days):
+    return range(days.day(start_time).year, days.day(end_time).year + 1)
+
+
+def load(calendar_id, years, user_ids=None):
+    """Return ``{year: {user_id: (busy, free)}}`` in one query."""
+    rows = AvailabilityBitmap.objects.filter(calendar_id=calendar_id, year__in=list(years))
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    result = defaultdict(dict)
+    for user_id, year, busy, free in rows.values_list('user_id', 'year', 'busy_days', 'free_days'):
+        result[year][user_id] = (from_bytes(busy), from_bytes(free))
+    return result
+
+
+def rebuild(calendar_ids=None, batch_size=1000, user_ids=None):
+    """Rebuild all bitmaps (optionally only some calendars or users); returns rows written."""
+    spans = defaultdict(list)
+    markers = Availability.objects.values_list('user_id', 'calendar_id', 'start_time', 'end_time', 'is_busy')
+    archived = AvailabilityArchive.objects.values_list('user_id', 'calendar_id', 'start_date', 'end_date', 'is_busy')
+    scope = {}
+    if calendar_ids is not None:
+        scope['calendar_id__in'] = calendar_ids
+    if user_ids is not None:
+        scope['user_id__in'] = user_ids
+    markers, archived = markers.filter(**scope), archived.filter(**scope)
+    zones = User.objects.values_list('pk', 'timezone')
+    if user_ids is not None:
+        zones = zones.filter(pk__in=user_ids)
+    days_by_user = {user_id: local_days(zone) for user_id, zone in zones.iterator()}
+
+    for user_id, cal_id, start, end, is_busy in archived.iterator():
+        spans[user_id, cal_id].append((start, end, is_busy))
+    for user_id, cal_id, start, end, is_busy in markers.order_by('start_time').iterator():
+        days = days_by_user[user_id]
+        spans[user_id, cal_id].append((days.day(start), days.day(end), is_busy))
+
+    bitmaps = [
+        AvailabilityBitmap(
+            user_id=user_id, calendar_id=cal_id, year=year,
+            busy_days=to_bytes(busy), free_days=to_bytes(free),
+        )
+        for (user_id, cal_id), user_spans in spans.items()
+        for year, (busy, free) in _apply_spans(user_spans).items()
+    ]
+
+    with transaction.atomic():
+        AvailabilityBitmap.objects.filter(**scope).delete()
+        AvailabilityBitmap.objects.bulk_create(bitmaps, batch_size=batch_size)
+    return len(bitmaps)
@@ -0,0 +1,171 @@
+"""
+Per-object cache layer for hot lookups.
+
+Wraps the configured Django cache with small typed helpers for the objects
+that are read on almost every API request (users, calendars and their share
+lists). Entries are invalidated from ``core.signals`` whenever the underlying
+rows change, so callers never have to think about staleness. Misses are loaded
+from the primary database so a lagging read replica never fills the cache.
+
+Password hashes are never cached: users are cached with ``password``
+deferred, and share lists as their serialized form.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .models import User, Calendar, CalendarShare
+
+USER_KEY = 'core:user:{}'
+CALENDAR_KEY = 'core:calendar:{}'
+CALENDAR_SHARES_KEY = 'core:calendar-shares:{}'
+CALENDAR_VERSION_KEY = 'core:calendar-version:{}'
+CLAIMS_REVOKED_KEY = 'core:claims-revoked:{}'
+
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+
+def _timeout():
+    return getattr(settings, 'OBJECT_CACHE_TIMEOUT', 300)
+
+
+def _record(namespace, hit):
+    with _stats_lock:
+        _stats[namespace]['hits' if hit else 'misses'] += 1
+
+
+def _get_or_load(namespace, key, loader):
+    value = cache.get(key)
+    if value is not None:
+        _record(namespace, True)
+        return value
+    _record(namespace, False)
+    value = loader()
+    if value is not None:
+        cache.set(key, value, _timeout())
+    return value
+
+
+def get_stats():
+    """Return a snapshot of hit/miss counters for this process."""
+    with _stats_lock:
+        return {namespace: dict(counts) for namespace, counts in _stats.items()}
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def get_user(user_id):
+    """
+    Return the User with the given id, or None if it does not exist.
+
+    ``password`` is deferred; saving the instance only writes the other fields.
+    """
+    return _get_or_load(
+        'user',
+        USER_KEY.format(user_id),
+        lambda: User.objects.using(DEFAULT_DB_ALIAS).defer('password').filter(id=user_id).first(),
+    )
+
+
+def get_calendar(calendar_id):
+    """Return the Calendar with the given id, or None if it does not exist."""
+    return _get_or_load(
+        'calendar',
+        CALENDAR_KEY.format(calendar_id),
+        lambda: Calendar.objects.using(DEFAULT_DB_ALIAS).filter(id=calendar_id).first(),
+    )
+
+
+def get_calendar_shares(calendar_id):
+    """Return the shares of a calendar, serialized by ``CalendarShareSerializer``."""
+    # Imported here: the serializers import core.authentication, which imports this module
+    from .serializers import CalendarShareSerializer
+
+    return _get_or_load(
+        'calendar_shares',
+        CALENDAR_SHARES_KEY.format(calendar_id),
+        lambda: list(CalendarShareSerializer(
+            CalendarShare.objects.using(DEFAULT_DB_ALIAS)
+            .filter(calendar_id=calendar_id)
+            .select_related('user', 'calendar'),
+            many=True,
+        ).data),
+    )
+
+
+def get_share_permission(calendar_id, user_id):
+    """Return the share permission ``user_id`` has on a calendar, or None."""
+    for share in get_calendar_shares(calendar_id):
+        if share['user']['id'] == user_id:
+            return share['permission']
+    return None
+
+
+def get_calendar_versions(calendar_ids):
+    """
+    Return ``{calendar_id: version}``. A calendar's version changes whenever
+    its details, shares, events or availability change, so it can key caches
+    of anything derived from them.
+    """
+    keys = {CALENDAR_VERSION_KEY.format(calendar_id): calendar_id for calendar_id in calendar_ids}
+    found = cache.get_many(list(keys))
+    versions = {keys[key]: version for key, version in found.items()}
+    for key, calendar_id in keys.items():
+        if key not in found:
+            # Start from a fresh value, so entries cached under an evicted
+            # version can never match again
+            cache.add(key, time.time_ns(), None)
+            versions[calendar_id] = cache.get(key)
+    return versions
+
+
+def bump_calendar_version(calendar_id):
+    key = CALENDAR_VERSION_KEY.format(calendar_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def invalidate_user(user_id):
+    cache.delete(USER_KEY.format(user_id))
+
+
+def revoke_user_claims(user_id):
+    """Distrust the claims of access tokens issued to ``user_id`` until now."""
+    # Older tokens have expired by the time the marker does
+    lifetime = jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    cache.set(CLAIMS_REVOKED_KEY.format(user_id), time.time(), int(lifetime) + 1)
+
+
+def get_claims_revoked_at(user_id):
+    """Epoch seconds of the last ``revoke_user_claims`` for ``user_id``, or None."""
+    return cache.get(CLAIMS_REVOKED_KEY.format(user_id))
+
+
+def invalidate_calendar(calendar_id):
+    cache.delete_many([
+        CALENDAR_KEY.format(calendar_id),
+        CALENDAR_SHARES_KEY.format(calendar_id),
+    ])
+
+
+def invalidate_calendar_shares(calendar_id):
+    cache.delete(CALENDAR_SHARES_KEY.format(calendar_id))
+
+
+def invalidate_user_shares(user_id):
+    """Drop the cached share lists that embed ``user_id``."""
+    calendar_ids = CalendarShare.objects.using(DEFAULT_DB_ALIAS).filter(user_id=user_id).values_list(
+        'calendar_id', flat=True,
+    )
+    cache.delete_many([CALENDAR_SHARES_KEY.format(calendar_id) for calendar_id in calendar_ids])
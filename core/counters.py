@@ -0,0 +1,114 @@
+"""
+Denormalized per-calendar counters.
+
+``Calendar.share_count``, ``event_count`` and ``last_event_at`` are kept up to
+date by the receivers in ``core.signals`` with single ``UPDATE`` statements
+using ``F()`` expressions, so concurrent writers never overwrite each other.
+Bulk paths that bypass signals (``bulk_create``, raw inserts) call
+``recount`` for the calendars they touched, and ``manage.py
+reconcile_calendar_counters`` repairs any drift.
+
+Inside ``deferred()`` (e.g. a queryset delete that fires one signal per row)
+adjustments are summed and written once per calendar when the block exits.
+"""
+import contextvars
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Calendar, CalendarShare, Event
+
+_pending = contextvars.ContextVar('cathendar_pending_counters', default=None)
+
+
+def _latest_event_start():
+    return Subquery(
+        Event.objects.filter(calendar=OuterRef('pk')).order_by('-start_time').values('start_time')[:1]
+    )
+
+
+def _count(model):
+    return Coalesce(Subquery(
+        model.objects.filter(calendar=OuterRef('pk')).order_by().values('calendar')
+        .annotate(total=Count('pk')).values('total')
+    ), Value(0))
+
+
+def _update(calendar_id, shares=0, events=0, last_event=None, refresh_last_event=False):
+    changes = {}
+    if shares:
+        changes['share_count'] = F('share_count') + shares
+    if events:
+        changes['event_count'] = F('event_count') + events
+    if refresh_last_event:
+        changes['last_event_at'] = _latest_event_start()
+    elif last_event is not None:
+        changes['last_event_at'] = Greatest(Coalesce(F('last_event_at'), Value(last_event)), Value(last_event))
+    if changes:
+        Calendar.objects.filter(pk=calendar_id).update(**changes)
+
+
+def adjust(calendar_id, shares=0, events=0, last_event=None, refresh_last_event=False):
+    """
+    Add ``shares``/``events`` to a calendar's counters. ``last_event`` is a
+    new event start that may move ``last_event_at`` later;
+    ``refresh_last_event`` recomputes it (after deletes or moves).
+    """
+    pending = _pending.get()
+    if pending is None:
+        _update(calendar_id, shares, events, last_event, refresh_last_event)
+        return
+    entry = pending[calendar_id]
+    entry['shares'] += shares
+    entry['events'] += events
+    entry['refresh_last_event'] |= refresh_last_event or last_event is not None
+
+
+@contextmanager
+def deferred():
+    """Sum counter adjustments made in the block and write them on exit."""
+    if _pending.get() is not None:
+        yield
+        return
+    pending = defaultdict(lambda: {'shares': 0, 'events': 0, 'refresh_last_event': False})
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+    for calendar_id, entry in pending.items():
+        _update(calendar_id, **entry)
+
+
+def recount(calendar_ids=None):
+    """Recompute the counters from the share and event tables; returns rows updated."""
+    calendars = Calendar.objects.all()
+    if calendar_ids is not None:
+        calendars = calendars.filter(pk__in=calendar_ids)
+    return calendars.update(
+        share_count=_count(CalendarShare),
+        event_count=_count(Event),
+        last_event_at=_latest_event_start(),
+    )
+
+
+def drifted(calendar_ids=None):
+    """Calendars whose stored counters differ from the tables."""
+    calendars = Calendar.objects.order_by('pk')
+    if calendar_ids is not None:
+        calendars = calendars.filter(pk__in=calendar_ids)
+    calendars = calendars.annotate(
+        actual_shares=_count(CalendarShare),
+        actual_events=_count(Event),
+        actual_last_event=Subquery(
+            Event.objects.filter(calendar=OuterRef('pk')).order_by().values('calendar')
+            .annotate(latest=Max('start_time')).values('latest')
+        ),
+    )
+    return [
+        calendar for calendar in calendars
+        if (calendar.share_count, calendar.event_count, calendar.last_event_at)
+        != (calendar.actual_shares, calendar.actual_events, calendar.actual_last_event)
+    ]
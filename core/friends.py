@@ -0,0 +1,71 @@
+"""
+Friend graph queries.
+
+Friendships are directed ``Friend(user, friend)`` rows. Each query here is a
+single set-based statement over the (user, friend) and (friend, user)
+indexes, so cost follows the size of the neighbourhood rather than the number
+of users. Soft-deleted users (``User.deleted_at``) are left out until
+``purge_deleted`` removes them.
+"""
+from django.db.models import Count, Q
+
+from .models import User, Calendar, Friend, CalendarShare
+
+MAX_RESULTS = 100
+
+
+def friend_ids(user):
+    """Subquery of the ids of ``user``'s friends."""
+    return Friend.objects.filter(user=user, friend__deleted_at__isnull=True).values('friend_id')
+
+
+def mutual_friends(user, other):
+    """Users that both ``user`` and ``other`` have as friends."""
+    return User.objects.filter(
+        pk__in=friend_ids(user), deleted_at__isnull=True,
+    ).filter(
+        pk__in=friend_ids(other)
+    ).order_by('username')
+
+
+def friend_suggestions(user, limit=20):
+    """
+    Friends of friends that are not yet friends, ranked by mutual count.
+
+    Returns a list of users, each with a ``mutual_count`` attribute.
+    """
+    limit = max(1, min(limit, MAX_RESULTS))
+    ranked = list(
+        Friend.objects.filter(user_id__in=friend_ids(user), friend__deleted_at__isnull=True)
+        .exclude(friend_id=user.pk)
+        .exclude(friend_id__in=friend_ids(user))
+        .values('friend_id')
+        .annotate(mutual_count=Count('user_id'))
+        .order_by('-mutual_count', 'friend_id')[:limit]
+    )
+    users = User.objects.filter(deleted_at__isnull=True).in_bulk([row['friend_id'] for row in ranked])
+    suggestions = []
+    for row in ranked:
+        # Deleted between the two queries
+        suggestion = users.get(row['friend_id'])
+        if suggestion is None:
+            continue
+        suggestion.mutual_count = row['mutual_count']
+        suggestions.append(suggestion)
+    return suggestions
+
+
+def friends_sharing_calendars(user):
+    """
+    Friends that have a calendar in common with ``user``.
+
+    A calendar is in common when either of them owns it and the other has a
+    share, or both have a share on it.
+    """
+    calendar_ids = Calendar.objects.filter(
+        Q(owner=user) | Q(pk__in=CalendarShare.objects.filter(user=user).values('calendar_id'))
+    ).values('pk')
+    return User.objects.filter(pk__in=friend_ids(user), deleted_at__isnull=True).filter(
+        Q(pk__in=Calendar.objects.filter(pk__in=calendar_ids).values('owner_id'))
+        | Q(pk__in=CalendarShare.objects.filter(calendar_id__in=calendar_ids).values('user_id'))
+    ).order_by('username')
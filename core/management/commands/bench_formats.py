@@ -0,0 +1,79 @@
+"""
+Management command comparing response formats for event and availability lists.
+Usage: python manage.py bench_formats [--calendar-id 42] [--repeat 20]
+
+Serializes one calendar's events and availability once, then renders them with
+DRF's JSONRenderer and the compact renderers in core.renderers, reporting body
+size (raw, gzip and, when available, brotli) and median encode time.
+Defaults to the calendar with the most availability; seed_load first for
+realistic sizes.
+"""
+import gzip
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Calendar, Event, Availability
+from core.renderers import HAS_MSGPACK, ColumnarJSONRenderer, MessagePackRenderer
+from core.serializers import EventSerializer, AvailabilitySerializer
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+
+def _median_ms(render, data, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(data)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+class Command(BaseCommand):
+    help = 'Compare bytes and encode time of the JSON, columnar and MessagePack list formats'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calendar-id', type=int, default=None, help='Calendar to benchmark')
+        parser.add_argument('--repeat', type=int, default=20, help='Renders per format (median is reported)')
+
+    def handle(self, *args, **options):
+        if options['calendar_id']:
+            calendar = Calendar.objects.filter(pk=options['calendar_id']).first()
+        else:
+            calendar = Calendar.objects.annotate(markers=Count('availabilities')).order_by('-markers').first()
+        if calendar is None:
+            raise CommandError('No calendar to benchmark')
+
+        datasets = {
+            'events': EventSerializer(
+                Event.objects.filter(calendar=calendar).select_related('calendar'), many=True
+            ).data,
+            'availability': AvailabilitySerializer(
+                Availability.objects.filter(calendar=calendar).select_related('user', 'calendar'), many=True
+            ).data,
+        }
+        renderers = [JSONRenderer(), ColumnarJSONRenderer()]
+        if HAS_MSGPACK:
+            renderers.append(MessagePackRenderer())
+
+        self.stdout.write(f'Calendar {calendar.pk} ({calendar.name})')
+        header = f'{"list":<14}{"format":<10}{"rows":>7}{"bytes":>10}{"gzip":>9}{"brotli":>9}{"encode ms":>11}'
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for name, data in datasets.items():
+            for renderer in renderers:
+                body = renderer.render(data)
+                packed_gzip = len(gzip.compress(body, compresslevel=6))
+                packed_br = len(brotli.compress(body, quality=5)) if brotli is not None else '-'
+                encode_ms = _median_ms(renderer.render, data, options['repeat'])
+                self.stdout.write(
+                    f'{name:<14}{renderer.format:<10}{len(data):>7}{len(body):>10}'
+                    f'{packed_gzip:>9}{packed_br:>9}{encode_ms:>11.2f}'
+                )
+        self.stdout.write(self.style.SUCCESS('Benchmark complete'))
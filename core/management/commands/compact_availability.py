@@ -0,0 +1,41 @@
+"""
+Management command to archive past availability markers.
+Usage: python manage.py compact_availability --horizon-days 90
+
+Whole-day markers that ended more than --horizon-days ago are merged into
+ranges in AvailabilityArchive and removed from the live table. Run it
+periodically (e.g. nightly); re-running extends existing ranges.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.archive import BATCH_SIZE, compact_availability
+
+
+class Command(BaseCommand):
+    help = 'Merge past availability markers into archived ranges and remove them from the live table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-days', type=int, default=settings.AVAILABILITY_ARCHIVE_HORIZON_DAYS,
+            help='Archive markers that ended more than this many days ago',
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Markers deleted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+
+    def handle(self, *args, **options):
+        if options['horizon_days'] < 1:
+            raise CommandError('--horizon-days must be at least 1')
+        cutoff = timezone.now() - timedelta(days=options['horizon_days'])
+        day_start = cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        markers, ranges = compact_availability(
+            day_start, batch_size=options['batch_size'], dry_run=options['dry_run']
+        )
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(
+            self.style.SUCCESS(f'{verb} {markers} markers ending before {day_start:%Y-%m-%d} into {ranges} ranges')
+        )
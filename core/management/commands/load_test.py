@@ -0,0 +1,262 @@
+"""
+Management command that replays the calendar page's request pattern over HTTP.
+Usage: python manage.py load_test --base-url http://127.0.0.1:8000 --concurrency 20 --duration 30
+
+Each virtual user logs in through /api/auth/login/, then loops over the flow
+calendar.html performs: list calendars, fetch events and aggregated
+availability for every calendar, fetch the month's holidays, and mark
+availability for a day. Works against runserver or any ASGI/WSGI server.
+``--scenario login`` only repeats the login call, to benchmark login
+throughput (e.g. with different PASSWORD_HASH_ITERATIONS or SESSION_ENGINE).
+``--async-reads`` fetches each calendar's month through the native async
+``async/calendars/<id>/data/`` view instead of the separate DRF reads; run it
+against an ASGI server and the default against a WSGI server to compare.
+Start the server with API_THROTTLING=False so rate limiting does not skew results.
+"""
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from http.client import HTTPConnection, HTTPSConnection
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.seeding import DEFAULT_PASSWORD
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of ``samples`` (``fraction`` in 0..1)."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Stats:
+    """
+    Thread-safe per-step latency and error collector.
+
+    Throughput only counts what completes after ``steady_from`` (when the
+    last virtual user has started), so ramp-up does not dilute it.
+    """
+
+    def __init__(self, steady_from=0.0):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.flows = 0
+        self.steady_from = steady_from
+        self.steady_requests = defaultdict(int)
+        self.steady_flows = 0
+
+    def record(self, step, seconds, ok):
+        steady = time.perf_counter() >= self.steady_from
+        with self._lock:
+            self.latencies[step].append(seconds)
+            if not ok:
+                self.errors[step] += 1
+            if steady:
+                self.steady_requests[step] += 1
+
+    def flow_done(self):
+        steady = time.perf_counter() >= self.steady_from
+        with self._lock:
+            self.flows += 1
+            if steady:
+                self.steady_flows += 1
+
+
+class VirtualUser:
+    """One simulated browser session with a keep-alive connection."""
+
+    def __init__(self, base_url, username, password, country, stats, rng, async_reads=False):
+        parts = urlsplit(base_url)
+        connection_class = HTTPSConnection if parts.scheme == 'https' else HTTPConnection
+        self.connection = connection_class(parts.netloc, timeout=30)
+        self.prefix = parts.path.rstrip('/') + '/api/'
+        self.username = username
+        self.password = password
+        self.country = country
+        self.stats = stats
+        self.rng = rng
+        self.async_reads = async_reads
+        self.token = None
+
+    def request(self, step, method, path, body=None):
+        headers = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        payload = json.dumps(body) if body is not None else None
+        start = time.perf_counter()
+        try:
+            self.connection.request(method, self.prefix + path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+            ok = response.status < 400
+        except (OSError, ValueError):
+            self.connection.close()
+            content, ok = b'', False
+        self.stats.record(step, time.perf_counter() - start, ok)
+        if not ok or not content:
+            return None
+        return json.loads(content)
+
+    def login(self):
+        self.token = None
+        data = self.request('login', 'POST', 'auth/login/', {
+            'username': self.username, 'password': self.password,
+        })
+        self.token = data.get('access') if data else None
+        return self.token is not None
+
+    def run_flow(self, month_start):
+        data = self.request('calendars', 'GET', 'calendars/')
+        if data is None:
+            return
+        calendars = data.get('results', data) if isinstance(data, dict) else data
+        next_month = (month_start + timedelta(days=32)).replace(day=1)
+        month_end = next_month - timedelta(days=1)
+        month_range = f'start_date={month_start.isoformat()}&end_date={month_end.isoformat()}'
+
+        if self.async_reads:
+            for calendar in calendars:
+                self.request(
+                    'calendar_data', 'GET',
+                    f'async/calendars/{calendar["id"]}/data/?{month_range}&country={self.country}',
+                )
+        else:
+            for calendar in calendars:
+                self.request('events', 'GET', f'events/?calendar_id={calendar["id"]}')
+            for calendar in calendars:
+                self.request('availability', 'GET', f'availability/aggregated/?calendar_id={calendar["id"]}')
+            self.request('holidays', 'GET', f'holidays/for_date_range/?country={self.country}&{month_range}')
+
+        if calendars:
+            day = month_start + timedelta(days=self.rng.randrange((month_end - month_start).days + 1))
+            self.request('mark_availability', 'POST', 'availability/', {
+                'calendar': self.rng.choice(calendars)['id'],
+                'start_time': f'{day.isoformat()}T00:00:00Z',
+                'end_time': f'{day.isoformat()}T23:59:59Z',
+                'is_busy': self.rng.random() < 0.5,
+                'title': '',
+                'description': '',
+            })
+        self.stats.flow_done()
+
+
+class Command(BaseCommand):
+    help = "Replay calendar.html's API request pattern against a running server and report latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', type=str, default='http://127.0.0.1:8000',
+            help='Server to load (runserver, uvicorn/daphne for cathendar.asgi, gunicorn, ...)',
+        )
+        parser.add_argument(
+            '--scenario', choices=['page', 'login'], default='page',
+            help='page: replay the calendar page flow; login: repeat logins only',
+        )
+        parser.add_argument(
+            '--async-reads', action='store_true',
+            help='Use the async merged calendar data view for the page reads',
+        )
+        parser.add_argument('--concurrency', type=int, default=10, help='Number of virtual users')
+        parser.add_argument('--duration', type=float, default=30, help='Seconds to run after ramp-up')
+        parser.add_argument('--ramp-up', type=float, default=2, help='Seconds over which users start')
+        parser.add_argument(
+            '--iterations', type=int, default=0,
+            help='Stop each virtual user after this many flows (or logins); 0 runs for --duration',
+        )
+        parser.add_argument(
+            '--prefix', type=str, default='load',
+            help='Username prefix of seeded users (see seed_load)',
+        )
+        parser.add_argument('--user-count', type=int, default=100, help='Seeded users to pick from')
+        parser.add_argument('--password', type=str, default=DEFAULT_PASSWORD)
+        parser.add_argument('--country', type=str, default='US')
+        parser.add_argument('--month', type=str, default=None, help='Month to view as YYYY-MM (default: current)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        if concurrency < 1:
+            raise CommandError('--concurrency must be at least 1')
+        if options['month']:
+            try:
+                year, month = (int(part) for part in options['month'].split('-'))
+                month_start = date(year, month, 1)
+            except ValueError:
+                raise CommandError('--month must look like YYYY-MM')
+        else:
+            month_start = date.today().replace(day=1)
+
+        started = time.perf_counter()
+        # The last virtual user starts here; throughput is measured from then on
+        stats = Stats(steady_from=started + options['ramp_up'] * (concurrency - 1) / concurrency)
+        stop_at = started + options['ramp_up'] + options['duration']
+        iterations = options['iterations']
+
+        def running(done):
+            return time.perf_counter() < stop_at and (not iterations or done < iterations)
+
+        def worker(index):
+            rng = random.Random(options['seed'] * 100003 + index)
+            username = f"{options['prefix']}{rng.randrange(options['user_count'])}"
+            time.sleep(options['ramp_up'] * index / concurrency)
+            user = VirtualUser(
+                options['base_url'], username, options['password'], options['country'], stats, rng,
+                async_reads=options['async_reads'],
+            )
+            done = 0
+            if options['scenario'] == 'login':
+                while running(done):
+                    user.login()
+                    done += 1
+                return
+            if not user.login():
+                return
+            while running(done):
+                user.run_flow(month_start)
+                done += 1
+
+        self.stdout.write(
+            f"Running {concurrency} virtual users against {options['base_url']} "
+            f"for {options['duration']:.0f}s (+{options['ramp_up']:.0f}s ramp-up)..."
+        )
+        threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report(stats, time.perf_counter() - stats.steady_from)
+
+    def report(self, stats, elapsed):
+        """``elapsed``: seconds of steady state, over which throughput is reported."""
+        total = sum(len(samples) for samples in stats.latencies.values())
+        if not total:
+            raise CommandError('No requests completed. Is the server running and seeded?')
+
+        self.stdout.write(
+            f'\n{"step":<20} {"requests":>9} {"errors":>7} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"max ms":>8}'
+        )
+        for step, samples in stats.latencies.items():
+            self.stdout.write(
+                f'{step:<20} {len(samples):>9} {stats.errors[step]:>7} '
+                f'{percentile(samples, 0.5) * 1000:>8.1f} {percentile(samples, 0.95) * 1000:>8.1f} '
+                f'{percentile(samples, 0.99) * 1000:>8.1f} {max(samples) * 1000:>8.1f}'
+            )
+        errors = sum(stats.errors.values())
+        steady = sum(stats.steady_requests.values())
+        # A run shorter than its ramp-up has no steady state to measure
+        elapsed = max(elapsed, 1e-9)
+        logins = stats.steady_requests.get('login', 0)
+        if logins:
+            self.stdout.write(f'\nLogin throughput: {logins / elapsed:.1f} logins/s')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\nThroughput: {steady / elapsed:.1f} req/s, {stats.steady_flows / elapsed:.2f} page loads/s '
+                f'({steady} requests in {elapsed:.1f}s after ramp-up; {total} requests, {errors} errors in total)'
+            )
+        )
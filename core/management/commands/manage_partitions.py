@@ -0,0 +1,94 @@
+"""
+Management command to maintain the monthly partitions of events and availability.
+Usage: python manage.py manage_partitions --months-ahead 3 --detach-before 2024-01
+       python manage.py manage_partitions --check
+
+Requires PostgreSQL. Run it from cron (e.g. daily) so next months' partitions
+exist before rows arrive; rows without a partition go to the default partition
+and are moved out the next time their month is created. ``--check`` only
+verifies that the partitioned tables still have the constraints and indexes
+Django's migrations expect, and fails otherwise.
+"""
+from datetime import date
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from core import partitioning
+
+
+def _parse_month(value):
+    try:
+        year, month = (int(part) for part in value.split('-'))
+        return date(year, month, 1)
+    except ValueError:
+        raise CommandError(f'Invalid month {value!r}, expected YYYY-MM')
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions and detach or drop old ones (PostgreSQL)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=3,
+            help='Create partitions up to this many months after the current one',
+        )
+        parser.add_argument(
+            '--detach-before', type=str, default=None,
+            help='Detach partitions for months before YYYY-MM (kept as plain tables)',
+        )
+        parser.add_argument('--drop', action='store_true', help='Drop detached partitions instead of keeping them')
+        parser.add_argument(
+            '--convert', action='store_true',
+            help='Convert the tables to partitioned tables first, if they are not already',
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Only check the partitioned tables against the migration state',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('Table partitioning requires PostgreSQL')
+        if options['check']:
+            return self.check_tables()
+        if options['drop'] and not options['detach_before']:
+            raise CommandError('--drop requires --detach-before')
+        detach_before = _parse_month(options['detach_before']) if options['detach_before'] else None
+        until = partitioning.add_months(date.today(), options['months_ahead'])
+
+        for table in partitioning.PARTITIONED_TABLES:
+            with transaction.atomic():
+                if not partitioning.is_partitioned(connection, table):
+                    if not options['convert']:
+                        raise CommandError(
+                            f'{table} is not partitioned; set PARTITION_CALENDAR_DATA=True before '
+                            'migrating or pass --convert'
+                        )
+                    self.stdout.write(f'Converting {table} to a partitioned table...')
+                    partitioning.partition_table(connection, table, options['months_ahead'])
+
+                created = partitioning.ensure_partitions(connection, table, until)
+                self.stdout.write(f'{table}: created {len(created)} partitions')
+
+                if detach_before:
+                    detached = partitioning.detach_partitions_before(
+                        connection, table, detach_before, drop=options['drop']
+                    )
+                    action = 'dropped' if options['drop'] else 'detached'
+                    self.stdout.write(f'{table}: {action} {len(detached)} partitions {", ".join(detached)}')
+
+        self.stdout.write(self.style.SUCCESS('Partitions are up to date'))
+
+    def check_tables(self):
+        models = {model._meta.db_table: model for model in apps.get_app_config('core').get_models()}
+        problems = []
+        for table in partitioning.PARTITIONED_TABLES:
+            if partitioning.is_partitioned(connection, table):
+                problems += partitioning.check_table(connection, table, models[table])
+            else:
+                self.stdout.write(f'{table} is not partitioned')
+        if problems:
+            raise CommandError('\n'.join(problems))
+        self.stdout.write(self.style.SUCCESS('Partitioned tables match the migration state'))
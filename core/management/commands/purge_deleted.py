@@ -0,0 +1,27 @@
+"""
+Management command to remove soft-deleted calendars and users.
+Usage: python manage.py purge_deleted --batch-size 5000 --pause 0.05
+
+Deleting a calendar or user through the API or admin only hides it (see
+core.purge). This deletes their events, availability and other rows in
+batches, one short transaction each, then the calendar or user itself. Run it
+periodically (e.g. every few minutes); --pause sleeps between batches to
+leave room for other writers and for replicas to catch up.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.purge import BATCH_SIZE, purge_deleted
+
+
+class Command(BaseCommand):
+    help = 'Delete soft-deleted calendars and users, with their data, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows deleted per transaction')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        calendars, users, rows = purge_deleted(batch_size=options['batch_size'], pause=options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Purged {calendars} calendars and {users} users ({rows} rows)'))
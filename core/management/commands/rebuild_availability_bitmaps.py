@@ -0,0 +1,25 @@
+"""
+Management command to rebuild the busy/free day bitmaps from availability.
+Usage: python manage.py rebuild_availability_bitmaps [--calendar-id 42]
+
+The API keeps bitmaps in sync as markers change; run this after loading or
+deleting availability in bulk (seeding, imports, raw SQL).
+"""
+from django.core.management.base import BaseCommand
+
+from core import bitmaps
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the packed busy/free day bitmaps from availability markers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calendar-id', type=int, default=None, help='Only rebuild this calendar')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Bitmap rows inserted per query')
+
+    def handle(self, *args, **options):
+        written = bitmaps.rebuild(
+            calendar_ids=[options['calendar_id']] if options['calendar_id'] else None,
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} availability bitmaps'))
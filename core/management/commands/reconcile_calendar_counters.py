@@ -0,0 +1,34 @@
+"""
+Management command to check and repair the denormalized calendar counters.
+Usage: python manage.py reconcile_calendar_counters [--calendar-id 42] [--dry-run]
+
+share_count, event_count and last_event_at are maintained by signals. Run this
+after bulk loads or raw SQL that bypass them, or periodically to fix drift.
+"""
+from django.core.management.base import BaseCommand
+
+from core import counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute Calendar.share_count, event_count and last_event_at from the underlying tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calendar-id', type=int, default=None, help='Only reconcile this calendar')
+        parser.add_argument('--dry-run', action='store_true', help='Only report calendars whose counters drifted')
+
+    def handle(self, *args, **options):
+        calendar_ids = [options['calendar_id']] if options['calendar_id'] else None
+        drifted = counters.drifted(calendar_ids)
+        for calendar in drifted:
+            self.stdout.write(
+                f'Calendar {calendar.pk}: shares {calendar.share_count} -> {calendar.actual_shares}, '
+                f'events {calendar.event_count} -> {calendar.actual_events}, '
+                f'last event {calendar.last_event_at} -> {calendar.actual_last_event}'
+            )
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'{len(drifted)} calendars have drifted counters'))
+            return
+        if drifted:
+            counters.recount([calendar.pk for calendar in drifted])
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {len(drifted)} calendars'))
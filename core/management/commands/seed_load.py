@@ -0,0 +1,95 @@
+"""
+Management command to generate a synthetic production-scale dataset.
+Usage: python manage.py seed_load --users 1000 --calendars-per-user 10 --events-per-calendar 100
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import User
+from core.seeding import DEFAULT_PASSWORD, BATCH_SIZE, build_dataset
+
+
+class Command(BaseCommand):
+    help = 'Generate users, calendars, events, availability, friends and shares for load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users to create')
+        parser.add_argument(
+            '--calendars-per-user', type=int, default=2,
+            help='Calendars owned by each user',
+        )
+        parser.add_argument(
+            '--events-per-calendar', type=int, default=50,
+            help='Events created in each calendar',
+        )
+        parser.add_argument(
+            '--share-density', type=float, default=0.01,
+            help='Probability that a calendar is shared with any given other user (0-1)',
+        )
+        parser.add_argument(
+            '--availability-days', type=int, default=30,
+            help='Days each calendar member may mark busy/available',
+        )
+        parser.add_argument(
+            '--friends-per-user', type=int, default=10,
+            help='Friend relations created for each user',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Random seed; the same seed and options give the same dataset',
+        )
+        parser.add_argument(
+            '--prefix', type=str, default='load',
+            help='Username prefix for generated users (e.g. load0, load1, ...)',
+        )
+        parser.add_argument(
+            '--password', type=str, default=DEFAULT_PASSWORD,
+            help='Password set on every generated user',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Rows per INSERT batch',
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options['share_density'] <= 1:
+            raise CommandError('--share-density must be between 0 and 1')
+
+        prefix = options['prefix']
+        if User.objects.filter(username=f'{prefix}0').exists():
+            raise CommandError(
+                f'Users with prefix "{prefix}" already exist. '
+                f'Use a different --prefix or a fresh database.'
+            )
+
+        started = time.perf_counter()
+
+        def progress(message):
+            self.stdout.write(f'  {message} ({time.perf_counter() - started:.1f}s)')
+
+        dataset = build_dataset(
+            users=options['users'],
+            calendars_per_user=options['calendars_per_user'],
+            events_per_calendar=options['events_per_calendar'],
+            share_density=options['share_density'],
+            availability_days=options['availability_days'],
+            friends_per_user=options['friends_per_user'],
+            prefix=prefix,
+            password=options['password'],
+            batch_size=options['batch_size'],
+            seed=options['seed'],
+            progress=progress,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Successfully generated load data in {time.perf_counter() - started:.1f}s:\n'
+                f'  Users: {len(dataset.users)} (password: {dataset.password})\n'
+                f'  Calendars: {len(dataset.calendars)}\n'
+                f'  Events: {dataset.events}\n'
+                f'  Availability markers: {dataset.availabilities}\n'
+                f'  Friendships: {dataset.friends}\n'
+                f'  Calendar shares: {dataset.shares}'
+            )
+        )
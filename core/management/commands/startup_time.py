@@ -0,0 +1,60 @@
+"""
+Management command reporting what booting a worker costs in imports.
+Usage: python manage.py startup_time [--top 5] [--budget-ms 2000]
+
+Imports settings, the apps, the ASGI handler and the URLconf in a fresh
+``python -X importtime`` process and prints the slowest top-level imports and
+their total. With ``--budget-ms`` it fails when the total is over budget, for
+use as an opt-in CI step (timings depend on the machine, so the test suite
+only checks which modules are imported).
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+STARTUP_SCRIPT = 'import sys, cathendar.asgi, cathendar.urls; print("\\n".join(sys.modules))'
+
+
+def top_level_imports(importtime_output):
+    """``[(cumulative_us, name)]`` of the top-level imports in ``-X importtime`` output."""
+    # "import time: self [us] | cumulative | name"; nested imports are indented
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or '[us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('  '):
+            rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report the slowest imports when a worker boots'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=5, help='Number of top-level imports to list')
+        parser.add_argument('--budget-ms', type=float, default=None, help='Fail when the total is over this')
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', STARTUP_SCRIPT],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'cathendar.settings')),
+        )
+        if result.returncode != 0:
+            raise CommandError(f'Startup failed:\n{result.stderr[-2000:]}')
+
+        imports = top_level_imports(result.stderr)
+        total_ms = sum(cumulative for cumulative, _ in imports) / 1000
+        self.stdout.write(f'{"slowest top-level imports":<30} {"ms":>8}')
+        for cumulative, name in sorted(imports, reverse=True)[:options['top']]:
+            self.stdout.write(f'{name:<30} {cumulative / 1000:>8.1f}')
+        self.stdout.write(f'{"total":<30} {total_ms:>8.1f}')
+
+        budget = options['budget_ms']
+        if budget is not None and total_ms > budget:
+            raise CommandError(f'Startup imports took {total_ms:.1f} ms (budget {budget:.0f} ms)')
+        self.stdout.write(self.style.SUCCESS('Startup imports measured'))
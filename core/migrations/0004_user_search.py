@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+TRIGRAM_COLUMNS = ['username', 'first_name', 'last_name', 'email']
+
+
+SEARCH_FIELDS = ('username', 'first_name', 'last_name', 'email')
+BATCH_SIZE = 5000
+
+
+def user_terms(user):
+    """The terms core.search indexed when this migration was written (frozen copy)."""
+    terms = set()
+    for field in SEARCH_FIELDS:
+        value = ' '.join((getattr(user, field) or '').lower().split())
+        if value:
+            terms.add(value[:254])
+            terms.update(word[:254] for word in value.split())
+    email = ' '.join((user.email or '').lower().split())
+    if '@' in email:
+        terms.add(email.split('@', 1)[0])
+    return terms
+
+
+def index_existing_users(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        return
+    alias = schema_editor.connection.alias
+    User = apps.get_model('core', 'User')
+    UserSearchTerm = apps.get_model('core', 'UserSearchTerm')
+    batch = []
+    for user in User.objects.using(alias).only(*SEARCH_FIELDS).iterator(chunk_size=BATCH_SIZE):
+        batch.extend(UserSearchTerm(user_id=user.pk, term=term) for term in user_terms(user))
+        if len(batch) >= BATCH_SIZE:
+            UserSearchTerm.objects.using(alias).bulk_create(batch)
+            batch = []
+    UserSearchTerm.objects.using(alias).bulk_create(batch)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS core_user_{column}_trgm '
+            f'ON core_user USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in TRIGRAM_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS core_user_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_holiday'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=254)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'user'], name='core_userse_term_116590_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_users, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_user_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='friend',
+            index=models.Index(fields=['friend', 'user'], name='core_friend_friend__09a1d9_idx'),
+        ),
+    ]
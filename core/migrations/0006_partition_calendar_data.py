@@ -0,0 +1,186 @@
+from datetime import date
+
+from django.conf import settings
+from django.db import migrations
+
+# A frozen copy of core.partitioning as of this migration, so later changes
+# there (or to manage_partitions) cannot change what it does
+PARTITIONED_TABLES = ('core_event', 'core_availability')
+PARTITION_KEY = 'start_time'
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND c.relnamespace = 'public'::regnamespace",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def _month_bounds(cursor, table):
+    cursor.execute(f'SELECT MIN({PARTITION_KEY}), MAX({PARTITION_KEY}) FROM {table}')
+    first, last = cursor.fetchone()
+    if first is None:
+        return None, None
+    return month_start(first.date()), month_start(last.date())
+
+
+def _create_partition(cursor, table, month):
+    """Create and attach one month, moving its rows out of the default partition."""
+    name = partition_name(table, month)
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {name} (LIKE {table} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {table}_default '
+        f'WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved',
+        [lower, upper],
+    )
+    cursor.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    return name
+
+
+def _foreign_keys(cursor, table):
+    """``[(name, definition)]`` of ``table``'s foreign keys."""
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _indexes(cursor, table):
+    """``[(name, CREATE INDEX statement)]`` of ``table``'s indexes, except the primary key's."""
+    cursor.execute(
+        "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+        "JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = %s::regclass AND NOT x.indisprimary ORDER BY i.relname",
+        [table],
+    )
+    # Partitioned parents' indexes read "ON ONLY"; recreated, they should cascade
+    return [(name, statement.replace(' ON ONLY ', ' ON ', 1)) for name, statement in cursor.fetchall()]
+
+
+def _swap_table(cursor, table, old, create, primary_key):
+    """
+    Rename ``table`` to ``old``, create the new ``table`` with ``create`` and
+    move the primary key, foreign keys and indexes over under their names.
+    """
+    foreign_keys = _foreign_keys(cursor, table)
+    # CREATE INDEX statements name the table, which is ``table`` again by the time they run
+    indexes = _indexes(cursor, table)
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+    # Index-backed constraint names share the namespace of index names
+    cursor.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    cursor.execute(create)
+    cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})')
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    return indexes
+
+
+def partition_table(connection, table, months_ahead=3):
+    """Convert a regular table into one partitioned by month, keeping its rows."""
+    legacy = f'{table}_unpartitioned'
+    with connection.cursor() as cursor:
+        indexes = _swap_table(
+            cursor, table, legacy,
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({PARTITION_KEY})',
+            f'id, {PARTITION_KEY}',
+        )
+        # Identity columns are not allowed on partitioned tables before PG 17
+        cursor.execute(f'CREATE SEQUENCE {table}_id_part_seq OWNED BY {table}.id')
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_part_seq')")
+        # Created on the parent, they cascade to every partition
+        for _, statement in indexes:
+            cursor.execute(statement)
+        cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        first, last = _month_bounds(cursor, legacy)
+        month = first or month_start(date.today())
+        until = add_months(max(filter(None, [last, month_start(date.today())])), months_ahead)
+        while month <= until:
+            _create_partition(cursor, table, month)
+            month = add_months(month, 1)
+
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+        cursor.execute(
+            f"SELECT setval('{table}_id_part_seq', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+        cursor.execute(f'DROP TABLE {legacy}')
+
+
+def unpartition_table(connection, table):
+    """Convert a partitioned table back into a regular table."""
+    partitioned = f'{table}_partitioned'
+    with connection.cursor() as cursor:
+        indexes = _swap_table(
+            cursor, table, partitioned, f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)', 'id',
+        )
+        cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+        for _, statement in indexes:
+            cursor.execute(statement)
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+        cursor.execute(f'DROP TABLE {partitioned} CASCADE')
+
+
+def partition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql' or not getattr(settings, 'PARTITION_CALENDAR_DATA', False):
+        return
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(connection, table):
+            partition_table(connection, table)
+
+
+def unpartition(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+    for table in PARTITIONED_TABLES:
+        if is_partitioned(connection, table):
+            unpartition_table(connection, table)
+
+
+class Migration(migrations.Migration):
+    """
+    Partition core_event and core_availability by month when running on
+    PostgreSQL with PARTITION_CALENDAR_DATA=True. A no-op everywhere else.
+
+    Constraint and index names are kept, so the migration state still
+    matches, except that the primary key becomes (id, start_time); see
+    ``manage_partitions --check``.
+    """
+
+    dependencies = [
+        ('core', '0005_friend_reverse_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
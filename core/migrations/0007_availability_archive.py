@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_partition_calendar_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilityArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(help_text='Last day of the range (inclusive)')),
+                ('is_busy', models.BooleanField(default=True)),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField(blank=True)),
+                ('calendar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_availabilities', to='core.calendar')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_availabilities', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['calendar', 'start_date'], name='core_availa_calenda_3404ff_idx')],
+            },
+        ),
+    ]
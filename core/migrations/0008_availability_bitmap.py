@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+YEAR_BYTES = 46
+
+
+def apply_spans(spans):
+    """Fold (start_date, end_date, is_busy) spans into {year: [busy, free]}; later spans win.
+
+    A copy of core.bitmaps at the time, so later changes there cannot change this migration.
+    """
+    from collections import defaultdict
+    from datetime import date
+
+    years = defaultdict(lambda: [0, 0])
+    for start, end, is_busy in spans:
+        for year in range(start.year, end.year + 1):
+            first, last = max(start, date(year, 1, 1)), min(end, date(year, 12, 31))
+            offset = first.timetuple().tm_yday - 1
+            mask = ((1 << (last.timetuple().tm_yday - offset)) - 1) << offset
+            bits = years[year]
+            if is_busy:
+                bits[0], bits[1] = bits[0] | mask, bits[1] & ~mask
+            else:
+                bits[0], bits[1] = bits[0] & ~mask, bits[1] | mask
+    return years
+
+
+def build_bitmaps(apps, schema_editor):
+    from collections import defaultdict
+    from datetime import timezone as dt_timezone
+
+    db = schema_editor.connection.alias
+    Availability = apps.get_model('core', 'Availability')
+    AvailabilityArchive = apps.get_model('core', 'AvailabilityArchive')
+    AvailabilityBitmap = apps.get_model('core', 'AvailabilityBitmap')
+
+    spans = defaultdict(list)
+    for user_id, calendar_id, start, end, is_busy in AvailabilityArchive.objects.using(db).values_list(
+        'user_id', 'calendar_id', 'start_date', 'end_date', 'is_busy'
+    ).iterator():
+        spans[user_id, calendar_id].append((start, end, is_busy))
+    # Users have no time zone yet at this point (0010 adds it, defaulting to
+    # UTC); 0013 re-buckets the bitmaps of users in other zones
+    for user_id, calendar_id, start, end, is_busy in Availability.objects.using(db).order_by('start_time').values_list(
+        'user_id', 'calendar_id', 'start_time', 'end_time', 'is_busy'
+    ).iterator():
+        spans[user_id, calendar_id].append(
+            (start.astimezone(dt_timezone.utc).date(), end.astimezone(dt_timezone.utc).date(), is_busy)
+        )
+    AvailabilityBitmap.objects.using(db).bulk_create(
+        [
+            AvailabilityBitmap(
+                user_id=user_id, calendar_id=calendar_id, year=year,
+                busy_days=busy.to_bytes(YEAR_BYTES, 'little'), free_days=free.to_bytes(YEAR_BYTES, 'little'),
+            )
+            for (user_id, calendar_id), user_spans in spans.items()
+            for year, (busy, free) in apply_spans(user_spans).items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_availability_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AvailabilityBitmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('busy_days', models.BinaryField()),
+                ('free_days', models.BinaryField()),
+                ('calendar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_bitmaps', to='core.calendar')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='availability_bitmaps', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('calendar', 'year', 'user')},
+            },
+        ),
+        migrations.RunPython(build_bitmaps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:39
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_existing(apps, schema_editor):
+    db = schema_editor.connection.alias
+    Calendar = apps.get_model('core', 'Calendar')
+    CalendarShare = apps.get_model('core', 'CalendarShare')
+    Event = apps.get_model('core', 'Event')
+
+    def count(model):
+        return Coalesce(Subquery(
+            model.objects.using(db).filter(calendar=OuterRef('pk')).order_by().values('calendar')
+            .annotate(total=Count('pk')).values('total')
+        ), Value(0))
+
+    Calendar.objects.using(db).update(
+        share_count=count(CalendarShare),
+        event_count=count(Event),
+        last_event_at=Subquery(
+            Event.objects.using(db).filter(calendar=OuterRef('pk')).order_by('-start_time').values('start_time')[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_availability_bitmap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calendar',
+            name='event_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='calendar',
+            name='last_event_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='calendar',
+            name='share_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='calendar',
+            index=models.Index(fields=['share_count'], name='core_calend_share_c_9be670_idx'),
+        ),
+        migrations.RunPython(count_existing, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:58
+
+import core.timezones
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_calendar_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='timezone',
+            field=models.CharField(default='UTC', max_length=64, validators=[core.timezones.validate_timezone]),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+# Frozen copies of the statements in core.search when this migration was
+# written, so later changes there cannot change what it does
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_event_fts USING fts5("
+    "title, description, content='core_event', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS core_event_fts_insert AFTER INSERT ON core_event BEGIN "
+    "INSERT INTO core_event_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS core_event_fts_delete AFTER DELETE ON core_event BEGIN "
+    "INSERT INTO core_event_fts(core_event_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS core_event_fts_update AFTER UPDATE OF title, description ON core_event BEGIN "
+    "INSERT INTO core_event_fts(core_event_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO core_event_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "INSERT INTO core_event_fts(core_event_fts) VALUES ('rebuild')",
+]
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS core_event_fts_insert',
+    'DROP TRIGGER IF EXISTS core_event_fts_delete',
+    'DROP TRIGGER IF EXISTS core_event_fts_update',
+    'DROP TABLE IF EXISTS core_event_fts',
+]
+POSTGRES_CREATE = [
+    "CREATE INDEX IF NOT EXISTS core_event_search_gin ON core_event USING gin (("
+    "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', description), 'B')))",
+]
+POSTGRES_DROP = ['DROP INDEX IF EXISTS core_event_search_gin']
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement, params=None)
+
+
+def create_event_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_CREATE, 'postgresql': POSTGRES_CREATE})
+
+
+def remove_event_index(apps, schema_editor):
+    _run(schema_editor, {'sqlite': SQLITE_DROP, 'postgresql': POSTGRES_DROP})
+
+
+class Migration(migrations.Migration):
+    """
+    Full-text index for event search: an FTS5 table with triggers on SQLite,
+    a GIN index on the events' tsvector on PostgreSQL. A no-op elsewhere.
+    """
+
+    dependencies = [
+        ('core', '0010_user_timezone'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_event_index, remove_event_index),
+    ]
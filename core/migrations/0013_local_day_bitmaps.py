@@ -0,0 +1,78 @@
+from django.db import migrations
+
+YEAR_BYTES = 46
+BATCH_SIZE = 1000
+
+
+def apply_spans(spans):
+    """Fold (start_date, end_date, is_busy) spans into {year: [busy, free]}; later spans win."""
+    from collections import defaultdict
+    from datetime import date
+
+    years = defaultdict(lambda: [0, 0])
+    for start, end, is_busy in spans:
+        for year in range(start.year, end.year + 1):
+            first, last = max(start, date(year, 1, 1)), min(end, date(year, 12, 31))
+            offset = first.timetuple().tm_yday - 1
+            mask = ((1 << (last.timetuple().tm_yday - offset)) - 1) << offset
+            bits = years[year]
+            if is_busy:
+                bits[0], bits[1] = bits[0] | mask, bits[1] & ~mask
+            else:
+                bits[0], bits[1] = bits[0] & ~mask, bits[1] | mask
+    return years
+
+
+def rebucket_local_days(apps, schema_editor):
+    """Rebuild the bitmaps of users outside UTC with days in their own zone."""
+    from collections import defaultdict
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+    db = schema_editor.connection.alias
+    User = apps.get_model('core', 'User')
+    Availability = apps.get_model('core', 'Availability')
+    AvailabilityArchive = apps.get_model('core', 'AvailabilityArchive')
+    AvailabilityBitmap = apps.get_model('core', 'AvailabilityBitmap')
+
+    for user_id, zone_name in User.objects.using(db).exclude(timezone='UTC').values_list('pk', 'timezone').iterator():
+        try:
+            zone = ZoneInfo(zone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            continue
+        spans = defaultdict(list)
+        for calendar_id, start, end, is_busy in AvailabilityArchive.objects.using(db).filter(
+            user_id=user_id,
+        ).values_list('calendar_id', 'start_date', 'end_date', 'is_busy').iterator():
+            spans[calendar_id].append((start, end, is_busy))
+        for calendar_id, start, end, is_busy in Availability.objects.using(db).filter(
+            user_id=user_id,
+        ).order_by('start_time').values_list('calendar_id', 'start_time', 'end_time', 'is_busy').iterator():
+            spans[calendar_id].append((start.astimezone(zone).date(), end.astimezone(zone).date(), is_busy))
+
+        AvailabilityBitmap.objects.using(db).filter(user_id=user_id).delete()
+        AvailabilityBitmap.objects.using(db).bulk_create(
+            [
+                AvailabilityBitmap(
+                    user_id=user_id, calendar_id=calendar_id, year=year,
+                    busy_days=busy.to_bytes(YEAR_BYTES, 'little'), free_days=free.to_bytes(YEAR_BYTES, 'little'),
+                )
+                for calendar_id, calendar_spans in spans.items()
+                for year, (busy, free) in apply_spans(calendar_spans).items()
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    Busy/free bitmaps are bucketed by the user's local days. Earlier ones
+    used UTC days, which split a local-midnight marker across two days.
+    """
+
+    dependencies = [
+        ('core', '0012_soft_delete'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebucket_local_days, migrations.RunPython.noop),
+    ]
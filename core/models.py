@@ -2,21 +2,62 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 
+from .timezones import DEFAULT_TIMEZONE, validate_timezone
+
 class User(AbstractUser):
     email = models.EmailField(unique=True)
+    # IANA zone name; days (availability, month views) are bucketed in it
+    timezone = models.CharField(max_length=64, default=DEFAULT_TIMEZONE, validators=[validate_timezone])
+    # Set by core.purge.soft_delete_user; the row is removed by purge_deleted
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email']
 
+class LiveCalendarManager(models.Manager):
+    """Calendars that have not been deleted (see core.purge)"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Calendar(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='calendars')
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by core.counters; never written from a loaded instance
+    share_count = models.PositiveIntegerField(default=0, editable=False)
+    event_count = models.PositiveIntegerField(default=0, editable=False)
+    last_event_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Set by core.purge.soft_delete_calendar; the rows are removed by purge_deleted
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = LiveCalendarManager()
+    all_objects = models.Manager()
+
+    COUNTER_FIELDS = ('share_count', 'event_count', 'last_event_at')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['share_count']),
+            models.Index(
+                fields=['deleted_at'], name='core_calendar_deleted_idx', condition=models.Q(deleted_at__isnull=False),
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        # A full save would write back counters read before concurrent changes
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
 class Event(models.Model):
     calendar = models.ForeignKey(Calendar, on_delete=models.CASCADE, related_name='events')
     title = models.CharField(max_length=200)
@@ -28,6 +69,13 @@ class Event(models.Model):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets the counter signals see where a saved event used to be
+        instance._loaded_position = (instance.__dict__.get('calendar_id'), instance.__dict__.get('start_time'))
+        return instance
+
 class Availability(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='availabilities')
     calendar = models.ForeignKey(Calendar, on_delete=models.CASCADE, related_name='availabilities')
@@ -47,6 +95,8 @@ class Friend(models.Model):
 
     class Meta:
         unique_together = ('user', 'friend')
+        # Reverse lookups ("who has me as a friend") and cascades from the friend side
+        indexes = [models.Index(fields=['friend', 'user'])]
 
 class CalendarShare(models.Model):
     class Permission(models.TextChoices):
@@ -80,3 +130,45 @@ class Holiday(models.Model):
 
     def __str__(self):
         return f"{self.name} ({self.date})"
+
+
+class UserSearchTerm(models.Model):
+    """Lower-cased name/email fragments of a user, for index-backed prefix search"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=254)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['term', 'user']),
+        ]
+
+
+class AvailabilityArchive(models.Model):
+    """Compacted past availability: a run of consecutive whole days with the same status"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='archived_availabilities')
+    calendar = models.ForeignKey(Calendar, on_delete=models.CASCADE, related_name='archived_availabilities')
+    start_date = models.DateField()
+    end_date = models.DateField(help_text="Last day of the range (inclusive)")
+    is_busy = models.BooleanField(default=True)
+    title = models.CharField(max_length=200, blank=True)
+    description = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['calendar', 'start_date'])]
+
+
+class AvailabilityBitmap(models.Model):
+    """
+    Packed per-year availability of one user in one calendar: bit N of
+    ``busy_days``/``free_days`` is day-of-year N of the user's local days
+    (``User.timezone``, see ``core.timezones.LocalDays``). Derived from
+    ``Availability`` and ``AvailabilityArchive``; see ``core.bitmaps``.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='availability_bitmaps')
+    calendar = models.ForeignKey(Calendar, on_delete=models.CASCADE, related_name='availability_bitmaps')
+    year = models.PositiveSmallIntegerField()
+    busy_days = models.BinaryField()
+    free_days = models.BinaryField()
+
+    class Meta:
+        unique_together = ('calendar', 'year', 'user')
@@ -0,0 +1,245 @@
+"""
+Monthly range partitioning of the event and availability tables (PostgreSQL).
+
+``partition_table`` swaps a regular table for one partitioned by month on
+``start_time``, keeping the table name, columns, id sequence, and the foreign
+keys and indexes under the names Django's migrations gave them, so the ORM
+and later migrations keep working unchanged. The one divergence from the
+migration state is the primary key: PostgreSQL requires the partition key in
+it, so ``<table>_pkey`` covers ``(id, start_time)``. ``check_table`` (run by
+``manage_partitions --check``) verifies the layout. Rows outside every monthly
+partition land in a ``<table>_default`` partition. ``ensure_partitions``
+creates upcoming months and ``detach_partitions_before`` retires old ones.
+
+Converting copies every row once; run it in a maintenance window.
+"""
+from datetime import date
+
+PARTITIONED_TABLES = ('core_event', 'core_availability')
+PARTITION_KEY = 'start_time'
+
+# Names of constraints created by an earlier version of partition_table
+LEGACY_NAME_SUFFIXES = ('_part_fk', '_part_idx')
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y_%m}'
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND c.relnamespace = 'public'::regnamespace",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(connection, table):
+    """Return the names of ``table``'s partitions, oldest month first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s ORDER BY child.relname",
+            [table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _month_bounds(cursor, table):
+    cursor.execute(f'SELECT MIN({PARTITION_KEY}), MAX({PARTITION_KEY}) FROM {table}')
+    first, last = cursor.fetchone()
+    if first is None:
+        return None, None
+    return month_start(first.date()), month_start(last.date())
+
+
+def _create_partition(cursor, table, month):
+    """Create and attach one month, moving its rows out of the default partition."""
+    name = partition_name(table, month)
+    lower, upper = month.isoformat(), add_months(month, 1).isoformat()
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS {name} (LIKE {table} INCLUDING DEFAULTS)')
+    cursor.execute(
+        f'WITH moved AS (DELETE FROM {table}_default '
+        f'WHERE {PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved',
+        [lower, upper],
+    )
+    cursor.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    return name
+
+
+def ensure_partitions(connection, table, until):
+    """Create monthly partitions up to and including the month of ``until``."""
+    created = []
+    existing = set(list_partitions(connection, table))
+    with connection.cursor() as cursor:
+        first, _ = _month_bounds(cursor, f'{table}_default')
+        month = min(filter(None, [first, month_start(date.today())]))
+        while month <= month_start(until):
+            if partition_name(table, month) not in existing:
+                created.append(_create_partition(cursor, table, month))
+            month = add_months(month, 1)
+    return created
+
+
+def detach_partitions_before(connection, table, before, drop=False):
+    """
+    Detach the monthly partitions that end on or before ``before``.
+
+    Detached partitions remain as plain tables (without foreign keys, so
+    deleting a calendar or user is not blocked by archived rows) unless
+    ``drop`` is set. Their rows are no longer visible through the ORM.
+    """
+    detached = []
+    with connection.cursor() as cursor:
+        for name in list_partitions(connection, table):
+            if name.endswith('_default'):
+                continue
+            year, month = name.rsplit('_p', 1)[1].split('_')
+            if add_months(date(int(year), int(month), 1), 1) > month_start(before):
+                continue
+            cursor.execute(f'ALTER TABLE {table} DETACH PARTITION {name}')
+            if drop:
+                cursor.execute(f'DROP TABLE {name}')
+            else:
+                cursor.execute(
+                    "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+                    [name],
+                )
+                for (constraint,) in cursor.fetchall():
+                    cursor.execute(f'ALTER TABLE {name} DROP CONSTRAINT {constraint}')
+            detached.append(name)
+    return detached
+
+
+def _foreign_keys(cursor, table):
+    """``[(name, definition)]`` of ``table``'s foreign keys."""
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _indexes(cursor, table):
+    """``[(name, CREATE INDEX statement)]`` of ``table``'s indexes, except the primary key's."""
+    cursor.execute(
+        "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+        "JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = %s::regclass AND NOT x.indisprimary ORDER BY i.relname",
+        [table],
+    )
+    # Partitioned parents' indexes read "ON ONLY"; recreated, they should cascade
+    return [(name, statement.replace(' ON ONLY ', ' ON ', 1)) for name, statement in cursor.fetchall()]
+
+
+def _swap_table(cursor, table, old, create, primary_key):
+    """
+    Rename ``table`` to ``old``, create the new ``table`` with ``create`` and
+    move the primary key, foreign keys and indexes over under their names.
+    """
+    foreign_keys = _foreign_keys(cursor, table)
+    # CREATE INDEX statements name the table, which is ``table`` again by the time they run
+    indexes = _indexes(cursor, table)
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+    # Index-backed constraint names share the namespace of index names
+    cursor.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {table}_pkey TO {old}_pkey')
+    cursor.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    cursor.execute(create)
+    cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({primary_key})')
+    for name, definition in foreign_keys:
+        cursor.execute(f'ALTER TABLE {table} ADD CONSTRAINT {name} {definition}')
+    return indexes
+
+
+def partition_table(connection, table, months_ahead=3):
+    """Convert a regular table into one partitioned by month, keeping its rows."""
+    legacy = f'{table}_unpartitioned'
+    with connection.cursor() as cursor:
+        indexes = _swap_table(
+            cursor, table, legacy,
+            f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) PARTITION BY RANGE ({PARTITION_KEY})',
+            f'id, {PARTITION_KEY}',
+        )
+        # Identity columns are not allowed on partitioned tables before PG 17
+        cursor.execute(f'CREATE SEQUENCE {table}_id_part_seq OWNED BY {table}.id')
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{table}_id_part_seq')")
+        # Created on the parent, they cascade to every partition
+        for _, statement in indexes:
+            cursor.execute(statement)
+        cursor.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+        first, last = _month_bounds(cursor, legacy)
+        month = first or month_start(date.today())
+        until = add_months(max(filter(None, [last, month_start(date.today())])), months_ahead)
+        while month <= until:
+            _create_partition(cursor, table, month)
+            month = add_months(month, 1)
+
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {legacy}')
+        cursor.execute(
+            f"SELECT setval('{table}_id_part_seq', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+        cursor.execute(f'DROP TABLE {legacy}')
+
+
+def unpartition_table(connection, table):
+    """Convert a partitioned table back into a regular table."""
+    partitioned = f'{table}_partitioned'
+    with connection.cursor() as cursor:
+        indexes = _swap_table(
+            cursor, table, partitioned, f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS)', 'id',
+        )
+        cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'ALTER TABLE {table} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY')
+        cursor.execute(f'INSERT INTO {table} SELECT * FROM {partitioned}')
+        for _, statement in indexes:
+            cursor.execute(statement)
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+        cursor.execute(f'DROP TABLE {partitioned} CASCADE')
+
+
+def check_table(connection, table, model):
+    """
+    Return the ways a partitioned ``table`` differs from what ``model``'s
+    migrations expect, beyond the documented ``(id, start_time)`` primary key.
+    """
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    problems = []
+    primary_keys = [c['columns'] for c in constraints.values() if c['primary_key']]
+    if primary_keys != [['id', PARTITION_KEY]]:
+        problems.append(f'{table}: primary key is {primary_keys}, expected [id, {PARTITION_KEY}]')
+    for field in model._meta.concrete_fields:
+        if field.remote_field is None or not field.db_constraint:
+            continue
+        if not any(c['foreign_key'] and c['columns'] == [field.column] for c in constraints.values()):
+            problems.append(f'{table}.{field.column}: foreign key is missing')
+        if field.db_index and not any(
+            c['index'] and not c['primary_key'] and c['columns'][:1] == [field.column] for c in constraints.values()
+        ):
+            problems.append(f'{table}.{field.column}: index is missing')
+    for name in constraints:
+        if name.endswith(LEGACY_NAME_SUFFIXES):
+            problems.append(f'{table}: {name} is not the name Django gave it; convert the table again')
+    return problems
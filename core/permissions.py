@@ -1,4 +1,5 @@
 from rest_framework import permissions
+from . import cache as object_cache
 from .models import CalendarShare
 
 
@@ -14,14 +15,10 @@ class IsCalendarOwnerOrShared(permissions.BasePermission):
         else:
             return False
         
-        if calendar.owner == request.user:
+        if calendar.owner_id == request.user.pk:
             return True
         
-        share = CalendarShare.objects.filter(
-            calendar=calendar,
-            user=request.user
-        ).first()
-        return share is not None
+        return object_cache.get_share_permission(calendar.pk, request.user.pk) is not None
 
 
 class CanEditCalendar(permissions.BasePermission):
@@ -36,13 +33,9 @@ class CanEditCalendar(permissions.BasePermission):
         else:
             return False
         
-        if calendar.owner == request.user:
+        if calendar.owner_id == request.user.pk:
             return True
         
-        share = CalendarShare.objects.filter(
-            calendar=calendar,
-            user=request.user,
-            permission__in=[CalendarShare.Permission.EDIT, CalendarShare.Permission.ADMIN]
-        ).first()
-        return share is not None
+        permission = object_cache.get_share_permission(calendar.pk, request.user.pk)
+        return permission in (CalendarShare.Permission.EDIT, CalendarShare.Permission.ADMIN)
 
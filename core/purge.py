@@ -0,0 +1,101 @@
+"""
+Deleting calendars and users.
+
+Deleting a calendar through Django's collector loads the primary key of
+every event and availability row into memory and deletes them while the
+request waits. Instead, ``soft_delete_calendar`` and ``soft_delete_user``
+only set ``deleted_at``: ``Calendar.objects`` and the API stop returning the
+row at once. ``purge_deleted`` (run periodically, see the ``purge_deleted``
+command) then removes the data in batches of ``batch_size`` rows, each in its
+own short transaction, so memory and lock time stay bounded however large the
+calendar is. Only then is the row itself deleted through the collector,
+which by that point has little left to collect.
+"""
+import time
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from . import cache as object_cache
+from .models import User, Calendar, Event, Availability, AvailabilityArchive, AvailabilityBitmap
+
+BATCH_SIZE = 5000
+
+# The large tables, deleted in batches without loading instances or sending
+# signals. Smaller relations (shares, friends, search terms) are left to the
+# collector so that their signals keep counters and caches right.
+CALENDAR_BATCHED = [Event, Availability, AvailabilityArchive, AvailabilityBitmap]
+USER_BATCHED = [Availability, AvailabilityArchive, AvailabilityBitmap]
+
+
+def soft_delete_calendar(calendar):
+    """Hide a calendar now; ``purge_deleted`` removes it later."""
+    calendar.deleted_at = timezone.now()
+    # Through save() so the signals drop the cached calendar and bump its version
+    calendar.save(update_fields=['deleted_at'])
+
+
+def soft_delete_user(user):
+    """Deactivate a user and hide their calendars now; ``purge_deleted`` removes them later."""
+    user.deleted_at = timezone.now()
+    user.is_active = False
+    user.save(update_fields=['deleted_at', 'is_active'])
+    for calendar in Calendar.objects.filter(owner=user):
+        soft_delete_calendar(calendar)
+
+
+def _delete_in_batches(model, filters, batch_size, pause):
+    """Delete ``model`` rows matching ``filters``, ``batch_size`` at a time; return the count."""
+    alias = router.db_for_write(model)
+    quote = connections[alias].ops.quote_name
+    deleted = 0
+    while True:
+        ids = list(model._base_manager.using(alias).filter(**filters).values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        # One plain DELETE per batch: no instances loaded, no signals sent
+        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} '
+                f'IN ({", ".join(["%s"] * len(ids))})',
+                ids,
+            )
+            deleted += cursor.rowcount
+        if pause:
+            time.sleep(pause)
+
+
+def purge_calendar(calendar, batch_size=BATCH_SIZE, pause=0):
+    """Remove a calendar and everything in it; return the number of rows deleted."""
+    deleted = sum(
+        _delete_in_batches(model, {'calendar_id': calendar.pk}, batch_size, pause) for model in CALENDAR_BATCHED
+    )
+    return deleted + calendar.delete()[0]
+
+
+def purge_user(user, batch_size=BATCH_SIZE, pause=0):
+    """Remove a user, their calendars and their rows in other calendars; return the number of rows deleted."""
+    deleted = sum(
+        purge_calendar(calendar, batch_size, pause)
+        for calendar in Calendar.all_objects.filter(owner=user)
+    )
+    touched = set()
+    for model in USER_BATCHED:
+        touched.update(model._base_manager.filter(user_id=user.pk).values_list('calendar_id', flat=True).distinct())
+        deleted += _delete_in_batches(model, {'user_id': user.pk}, batch_size, pause)
+    # Cached payloads of the calendars they had marked availability in
+    for calendar_id in touched:
+        object_cache.bump_calendar_version(calendar_id)
+    return deleted + user.delete()[0]
+
+
+def purge_deleted(batch_size=BATCH_SIZE, pause=0):
+    """Purge every soft-deleted calendar and user; return ``(calendars, users, rows)``."""
+    calendars = users = rows = 0
+    for calendar in Calendar.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at'):
+        rows += purge_calendar(calendar, batch_size, pause)
+        calendars += 1
+    for user in User.objects.filter(deleted_at__isnull=False).order_by('deleted_at'):
+        rows += purge_user(user, batch_size, pause)
+        users += 1
+    return calendars, users, rows
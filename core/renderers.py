@@ -0,0 +1,103 @@
+"""
+Compact response formats for list endpoints.
+
+Event and availability lists repeat every key on every row, and availability
+rows embed the full ``user`` object. Clients can ask for a compact form
+instead, with ``?format=`` or the ``Accept`` header:
+
+- ``columnar`` (``application/vnd.cathendar.columnar+json``): one array per
+  field plus a ``users`` table; the ``user`` column holds user ids.
+- ``msgpack`` (``application/msgpack``): the same columnar structure encoded
+  as MessagePack. Needs the optional ``msgpack`` package, which is imported
+  on first use rather than at startup.
+
+Only lists (bare or paginated) change shape; anything else, such as an error
+or a single object, is rendered as is. ``from_columnar`` turns the columnar
+form back into rows.
+"""
+from importlib.util import find_spec
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+# Optional; checked without importing it
+HAS_MSGPACK = find_spec('msgpack') is not None
+
+
+# Nested objects pulled out into a table of their own
+TABLE_FIELDS = {'user': 'users'}
+
+
+def to_columnar(rows):
+    """Return ``{'count', 'fields', 'columns', <tables>}`` for a list of dicts."""
+    fields = list(rows[0]) if rows else []
+    columns = {field: [] for field in fields}
+    tables = {table: {} for table in TABLE_FIELDS.values()}
+    for row in rows:
+        for field in fields:
+            value = row.get(field)
+            table = TABLE_FIELDS.get(field)
+            if table and isinstance(value, dict):
+                tables[table].setdefault(value['id'], value)
+                value = value['id']
+            columns[field].append(value)
+    result = {'count': len(rows), 'fields': fields, 'columns': [columns[field] for field in fields]}
+    for table, entries in tables.items():
+        if entries:
+            result[table] = list(entries.values())
+    return result
+
+
+def from_columnar(data):
+    """Rebuild the list of row dicts from ``to_columnar`` output."""
+    tables = {
+        field: {entry['id']: entry for entry in data.get(table, [])}
+        for field, table in TABLE_FIELDS.items()
+    }
+    rows = [dict(zip(data['fields'], values)) for values in zip(*data['columns'])]
+    for row in rows:
+        for field, entries in tables.items():
+            if field in row and row[field] in entries:
+                row[field] = entries[row[field]]
+    return rows
+
+
+def compact(data):
+    """Columnar form of a list or paginated page; other data is returned unchanged."""
+    if isinstance(data, list) and all(isinstance(row, dict) for row in data):
+        return to_columnar(data)
+    if isinstance(data, dict) and isinstance(data.get('results'), list):
+        return dict(data, results=compact(data['results']))
+    return data
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = 'application/vnd.cathendar.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(compact(data), accepted_media_type, renderer_context)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        import msgpack
+
+        # JSONEncoder.default covers dates, decimals, UUIDs and lazy strings
+        return msgpack.packb(compact(data), default=JSONEncoder().default, use_bin_type=True)
+
+
+def compact_renderer_classes():
+    """The default renderers followed by the compact ones available here."""
+    renderers = list(api_settings.DEFAULT_RENDERER_CLASSES) + [ColumnarJSONRenderer]
+    if HAS_MSGPACK:
+        renderers.append(MessagePackRenderer)
+    return renderers
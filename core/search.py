@@ -0,0 +1,242 @@
+"""
+Server-side search.
+
+User search matches each word of the query as a prefix of the username, first
+name, last name or email. On PostgreSQL this is answered by trigram GIN
+indexes on the user columns; elsewhere by the ``UserSearchTerm`` table, whose
+(term, user) index turns each prefix into a range scan.
+
+Event search matches each word as a prefix of a word in the title or
+description and ranks title matches higher. On SQLite it uses an FTS5 table
+kept up to date by triggers on ``core_event``; on PostgreSQL a GIN index on
+the events' ``tsvector``. Other databases fall back to ``LIKE`` scans.
+Results are ordered by ``(score, id)``, lower scores first, so a page ends
+with a cursor that the next page continues from.
+"""
+import base64
+import json
+import re
+
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+
+from .models import User, Friend, UserSearchTerm, Event
+
+MAX_RESULTS = 50
+
+# Upper bound for prefix range scans: greater than any character in a term
+_PREFIX_END = '\U0010ffff'
+
+SEARCH_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
+
+EVENT_FTS_TABLE = 'core_event_fts'
+MAX_EVENT_RESULTS = 100
+
+# Rows written by bulk_create or raw SQL are indexed too, since triggers do
+# the work. Django rebuilds a SQLite table (dropping its triggers) for some
+# schema changes, so these are re-run after every migrate (core.signals).
+SQLITE_EVENT_INDEX = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {EVENT_FTS_TABLE} USING fts5("
+    f"title, description, content='core_event', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS core_event_fts_insert AFTER INSERT ON core_event BEGIN "
+    f"INSERT INTO {EVENT_FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS core_event_fts_delete AFTER DELETE ON core_event BEGIN "
+    f"INSERT INTO {EVENT_FTS_TABLE}({EVENT_FTS_TABLE}, rowid, title, description) "
+    f"VALUES ('delete', old.id, old.title, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS core_event_fts_update AFTER UPDATE OF title, description ON core_event BEGIN "
+    f"INSERT INTO {EVENT_FTS_TABLE}({EVENT_FTS_TABLE}, rowid, title, description) "
+    f"VALUES ('delete', old.id, old.title, old.description); "
+    f"INSERT INTO {EVENT_FTS_TABLE}(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+]
+
+# The indexed expression; queries must repeat it exactly to use the index
+EVENT_TSVECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', description), 'B')"
+)
+POSTGRES_EVENT_INDEX = [f'CREATE INDEX IF NOT EXISTS core_event_search_gin ON core_event USING gin (({EVENT_TSVECTOR}))']
+
+# Calendars a user owns or has been shared
+_ACCESSIBLE_CALENDARS = (
+    'SELECT id FROM core_calendar WHERE owner_id = %s '
+    'UNION SELECT calendar_id FROM core_calendarshare WHERE user_id = %s'
+)
+
+
+def uses_term_table():
+    return connection.vendor != 'postgresql'
+
+
+def normalize(value):
+    return ' '.join((value or '').lower().split())
+
+
+def user_terms(user):
+    """Return the set of searchable terms for a user."""
+    terms = set()
+    for field in SEARCH_FIELDS:
+        value = normalize(getattr(user, field))
+        if value:
+            terms.add(value[:254])
+            terms.update(word[:254] for word in value.split())
+    email = normalize(user.email)
+    if '@' in email:
+        terms.add(email.split('@', 1)[0])
+    return terms
+
+
+def index_user(user):
+    """Replace the search terms of one user."""
+    UserSearchTerm.objects.filter(user=user).delete()
+    UserSearchTerm.objects.bulk_create(
+        [UserSearchTerm(user=user, term=term) for term in user_terms(user)]
+    )
+
+
+def rebuild_user_index(batch_size=5000):
+    """Rebuild the whole term table (e.g. after bulk-creating users)."""
+    UserSearchTerm.objects.all().delete()
+    batch = []
+    for user in User.objects.only(*SEARCH_FIELDS).iterator(chunk_size=batch_size):
+        batch.extend(UserSearchTerm(user_id=user.pk, term=term) for term in user_terms(user))
+        if len(batch) >= batch_size:
+            UserSearchTerm.objects.bulk_create(batch)
+            batch = []
+    UserSearchTerm.objects.bulk_create(batch)
+
+
+def search_users(query, user=None, limit=20):
+    """
+    Return users matching every word of ``query`` as a prefix.
+
+    When ``user`` is given, it is excluded from the results, each result is
+    annotated with ``is_friend`` and friends are ranked first.
+    """
+    words = normalize(query).split()
+    if not words:
+        return User.objects.none()
+    limit = max(1, min(limit, MAX_RESULTS))
+
+    queryset = User.objects.filter(deleted_at__isnull=True)
+    for word in words:
+        if uses_term_table():
+            queryset = queryset.filter(pk__in=UserSearchTerm.objects.filter(
+                term__gte=word, term__lt=word + _PREFIX_END,
+            ).values('user_id'))
+        else:
+            match = Q()
+            for field in SEARCH_FIELDS:
+                match |= Q(**{f'{field}__istartswith': word})
+            queryset = queryset.filter(match)
+
+    if user is None:
+        return queryset.order_by('username')[:limit]
+
+    return queryset.exclude(pk=user.pk).annotate(
+        is_friend=Exists(Friend.objects.filter(user=user, friend=OuterRef('pk')))
+    ).order_by('-is_friend', 'username')[:limit]
+
+
+def install_event_index(schema_connection, rebuild=False):
+    """Create the event search index (and triggers) if missing; ``rebuild`` re-reads every event."""
+    statements = {'sqlite': SQLITE_EVENT_INDEX, 'postgresql': POSTGRES_EVENT_INDEX}.get(schema_connection.vendor, [])
+    with schema_connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+        if rebuild and schema_connection.vendor == 'sqlite':
+            cursor.execute(f"INSERT INTO {EVENT_FTS_TABLE}({EVENT_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def encode_cursor(score, pk):
+    return base64.urlsafe_b64encode(json.dumps([score, pk]).encode()).decode()
+
+
+def decode_cursor(value):
+    """``(score, id)`` from ``encode_cursor``; raises ValueError for anything else."""
+    try:
+        score, pk = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return float(score), int(pk)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+def _event_matches(words):
+    """``(sql, params)`` selecting ``id, score`` of events matching every word, or None without an index."""
+    if connection.vendor == 'sqlite':
+        match = ' AND '.join(f'"{word}"*' for word in words)
+        # Title matches weigh ten times as much as description matches
+        return (
+            f'SELECT rowid AS id, bm25({EVENT_FTS_TABLE}, 10.0, 1.0) AS score '
+            f'FROM {EVENT_FTS_TABLE} WHERE {EVENT_FTS_TABLE} MATCH %s', [match],
+        )
+    if connection.vendor == 'postgresql':
+        query = ' & '.join(f'{word}:*' for word in words)
+        return (
+            f"SELECT id, -ts_rank({EVENT_TSVECTOR}, to_tsquery('simple', %s)) AS score "
+            f"FROM core_event WHERE {EVENT_TSVECTOR} @@ to_tsquery('simple', %s)", [query, query],
+        )
+    return None
+
+
+def event_words(query):
+    """The words of ``query`` that event search matches on."""
+    return re.findall(r'\w+', normalize(query))
+
+
+def matching_event_ids(query):
+    """``(sql, params)`` selecting the ids of events matching ``query``, or None without an index."""
+    words = event_words(query)
+    matches = _event_matches(words) if words else None
+    if matches is None:
+        return None
+    sql, params = matches
+    return f'SELECT id FROM ({sql}) matches', params
+
+
+def search_events(query, user=None, cursor=None, limit=20):
+    """
+    Return ``(events, next_cursor)``: up to ``limit`` events matching every
+    word of ``query`` as a prefix, best first, continuing after ``cursor``.
+
+    When ``user`` is given, only events in calendars they own or that are
+    shared with them are searched. ``next_cursor`` is None on the last page.
+    """
+    words = event_words(query)
+    if not words:
+        return [], None
+    limit = max(1, min(limit, MAX_EVENT_RESULTS))
+    after = decode_cursor(cursor) if cursor else None
+
+    matches = _event_matches(words)
+    if matches is None:
+        queryset = Event.objects.filter(calendar__deleted_at__isnull=True)
+        for word in words:
+            queryset = queryset.filter(Q(title__icontains=word) | Q(description__icontains=word))
+        if user is not None:
+            queryset = queryset.filter(Q(calendar__owner=user) | Q(calendar__shares__user=user)).distinct()
+        if after:
+            queryset = queryset.filter(pk__gt=after[1])
+        ranked = [(0.0, pk) for pk in queryset.order_by('pk').values_list('pk', flat=True)[:limit + 1]]
+    else:
+        sql, params = matches
+        # Soft-deleted calendars stay hidden until they are purged (core.purge)
+        conditions = ['c.deleted_at IS NULL']
+        if user is not None:
+            conditions.append(f'e.calendar_id IN ({_ACCESSIBLE_CALENDARS})')
+            params += [user.pk, user.pk]
+        if after:
+            conditions.append('(m.score > %s OR (m.score = %s AND m.id > %s))')
+            params += [after[0], after[0], after[1]]
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(
+                f'SELECT m.score, m.id FROM ({sql}) m JOIN core_event e ON e.id = m.id '
+                f'JOIN core_calendar c ON c.id = e.calendar_id WHERE {" AND ".join(conditions)} '
+                f'ORDER BY m.score, m.id LIMIT %s', params + [limit + 1],
+            )
+            ranked = db_cursor.fetchall()
+
+    page = ranked[:limit]
+    events = Event.objects.select_related('calendar').in_bulk([pk for _, pk in page])
+    results = [events[pk] for _, pk in page if pk in events]
+    next_cursor = encode_cursor(*page[-1]) if len(ranked) > limit else None
+    return results, next_cursor
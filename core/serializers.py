@@ -1,22 +1,48 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
+from .authentication import request_user
 from .models import User, Calendar, Event, Availability, Friend, CalendarShare, Holiday
 
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'last_login', 'is_staff', 'is_superuser']
+        fields = [
+            'id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'last_login', 'is_staff',
+            'is_superuser', 'timezone',
+        ]
         read_only_fields = ['id', 'date_joined', 'last_login']
 
 
+class UserSettingsSerializer(serializers.ModelSerializer):
+    """Fields users may change on their own account."""
+
+    class Meta:
+        model = User
+        fields = ['timezone']
+
+
+class UserSearchSerializer(UserSerializer):
+    is_friend = serializers.BooleanField(read_only=True, default=False)
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['is_friend']
+
+
+class FriendSuggestionSerializer(UserSerializer):
+    mutual_count = serializers.IntegerField(read_only=True)
+
+    class Meta(UserSerializer.Meta):
+        fields = UserSerializer.Meta.fields + ['mutual_count']
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
 
     class Meta:
         model = User
-        fields = ['username', 'email', 'password', 'password_confirm', 'first_name', 'last_name']
+        fields = ['username', 'email', 'password', 'password_confirm', 'first_name', 'last_name', 'timezone']
 
     def validate(self, attrs):
         if attrs['password'] != attrs['password_confirm']:
@@ -40,11 +66,14 @@ class CalendarSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Calendar
-        fields = ['id', 'owner', 'owner_id', 'name', 'description', 'created_at']
-        read_only_fields = ['id', 'created_at']
+        fields = [
+            'id', 'owner', 'owner_id', 'name', 'description', 'created_at',
+            'share_count', 'event_count', 'last_event_at',
+        ]
+        read_only_fields = ['id', 'created_at', 'share_count', 'event_count', 'last_event_at']
 
     def create(self, validated_data):
-        validated_data['owner'] = self.context['request'].user
+        validated_data['owner'] = request_user(self.context['request'])
         return super().create(validated_data)
 
 
@@ -67,7 +96,7 @@ class AvailabilitySerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
     def create(self, validated_data):
-        validated_data['user'] = self.context['request'].user
+        validated_data['user'] = request_user(self.context['request'])
         return super().create(validated_data)
 
 
@@ -85,7 +114,7 @@ class FriendSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
     def create(self, validated_data):
-        validated_data['user'] = self.context['request'].user
+        validated_data['user'] = request_user(self.context['request'])
         return super().create(validated_data)
 
 
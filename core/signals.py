@@ -0,0 +1,119 @@
+"""
+Signal receivers for the core app.
+
+Connected from ``CoreConfig.ready()``.
+"""
+from django.db import connections
+from django.db.models.signals import post_save, post_delete, post_migrate
+from django.dispatch import receiver
+
+from . import cache as object_cache
+from . import counters, search
+from .authentication import REVOKING_FIELDS
+from .models import User, Calendar, CalendarShare, Event, Availability
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, created=False, **kwargs):
+    object_cache.invalidate_user(instance.pk)
+    if not created:
+        # Share lists embed the serialized user
+        object_cache.invalidate_user_shares(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def revoke_changed_user_claims(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if created or raw:
+        return
+    # e.g. logins save only last_login
+    if update_fields is not None and not set(update_fields) & set(REVOKING_FIELDS):
+        return
+    object_cache.revoke_user_claims(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user_claims(sender, instance, **kwargs):
+    object_cache.revoke_user_claims(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Calendar)
+def invalidate_cached_calendar(sender, instance, **kwargs):
+    object_cache.invalidate_calendar(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=CalendarShare)
+def invalidate_cached_calendar_shares(sender, instance, **kwargs):
+    object_cache.invalidate_calendar_shares(instance.calendar_id)
+
+
+@receiver(post_save, sender=User)
+def update_user_search_terms(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or not search.uses_term_table():
+        return
+    if update_fields is not None and not set(update_fields) & set(search.SEARCH_FIELDS):
+        return
+    search.index_user(instance)
+
+
+def _calendar_deleted(instance, origin):
+    """True when the row goes away because its calendar is being deleted."""
+    return isinstance(origin, Calendar) and origin.pk == instance.calendar_id
+
+
+def _deleted_directly(origin):
+    """Events are only cascaded through their calendar, which is going away too."""
+    return isinstance(origin, Event) or getattr(origin, 'model', None) is Event
+
+
+@receiver(post_save, sender=CalendarShare)
+def count_created_share(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust(instance.calendar_id, shares=1)
+
+
+@receiver(post_delete, sender=CalendarShare)
+def count_deleted_share(sender, instance, origin=None, **kwargs):
+    if not _calendar_deleted(instance, origin):
+        counters.adjust(instance.calendar_id, shares=-1)
+
+
+@receiver(post_save, sender=Event)
+def count_saved_event(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_calendar_id, old_start = getattr(instance, '_loaded_position', (None, None))
+    if created:
+        counters.adjust(instance.calendar_id, events=1, last_event=instance.start_time)
+    elif old_calendar_id is not None and old_calendar_id != instance.calendar_id:
+        counters.adjust(old_calendar_id, events=-1, refresh_last_event=True)
+        object_cache.bump_calendar_version(old_calendar_id)
+        counters.adjust(instance.calendar_id, events=1, last_event=instance.start_time)
+    elif old_start != instance.start_time:
+        counters.adjust(instance.calendar_id, refresh_last_event=True)
+    instance._loaded_position = (instance.calendar_id, instance.start_time)
+
+
+@receiver(post_delete, sender=Event)
+def count_deleted_event(sender, instance, origin=None, **kwargs):
+    if _deleted_directly(origin):
+        counters.adjust(instance.calendar_id, events=-1, refresh_last_event=True)
+
+
+@receiver(post_save, sender=Calendar)
+@receiver([post_save, post_delete], sender=CalendarShare)
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=Availability)
+def bump_calendar_version(sender, instance, origin=None, **kwargs):
+    if sender is Calendar:
+        object_cache.bump_calendar_version(instance.pk)
+    elif not _calendar_deleted(instance, origin):
+        object_cache.bump_calendar_version(instance.calendar_id)
+
+
+@receiver(post_migrate)
+def restore_event_search_triggers(sender, using, **kwargs):
+    # Migrations that rebuild core_event on SQLite drop its triggers
+    connection = connections[using]
+    if (sender.name == 'core' and connection.vendor == 'sqlite'
+            and search.EVENT_FTS_TABLE in connection.introspection.table_names()):
+        search.install_event_index(connection)
@@ -0,0 +1,102 @@
+"""
+Request coalescing for hot, user-independent reads.
+
+When a shared calendar changes, every member's client refetches the same
+lists at once. ``get_or_compute`` makes concurrent callers with the same key
+share one computation:
+
+- a result cached in the last ``SINGLE_FLIGHT_CACHE_SECONDS`` is returned
+  straight away;
+- within a process, the first caller computes and the others wait for it;
+- across processes, the first caller takes a short lock in the cache and the
+  others poll for its result, computing it themselves if it never arrives.
+
+Keys must include everything the result depends on. The views key on the
+calendar's data version (``core.cache.get_calendar_versions``), so any change
+made through the ORM starts a new key; writes that bypass signals show up
+once the short cache entry expires.
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+
+from cathendar.metrics import registry
+
+LOCK_KEY = '{}:lock'
+# How long a caller waits for another one's result before computing it itself
+WAIT_SECONDS = 5.0
+POLL_INTERVAL = 0.01
+
+registry.describe('cathendar_single_flight_total', 'Coalesced reads by outcome (cached, shared or computed).')
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _record(outcome):
+    registry.inc('cathendar_single_flight_total', {'outcome': outcome})
+
+
+def _compute_once_across_processes(key, compute, timeout):
+    lock_key = LOCK_KEY.format(key)
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, WAIT_SECONDS):
+        token = None
+        deadline = time.monotonic() + WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            value = cache.get(key)
+            if value is not None:
+                _record('shared')
+                return value
+    try:
+        value = compute()
+        cache.set(key, value, timeout)
+    finally:
+        # Only release a lock we still hold: after WAIT_SECONDS it may have
+        # expired and been taken by another process. The cache has no
+        # compare-and-delete, so a lock that expires between the two calls
+        # can still be dropped early; it only costs a duplicate computation.
+        if token is not None and cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    _record('computed')
+    return value
+
+
+def get_or_compute(key, compute, timeout=None):
+    """Return the cached value for ``key``, computing it at most once among concurrent callers."""
+    timeout = settings.SINGLE_FLIGHT_CACHE_SECONDS if timeout is None else timeout
+    value = cache.get(key)
+    if value is not None:
+        _record('cached')
+        return value
+
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        try:
+            value = future.result(timeout=WAIT_SECONDS)
+        except FutureTimeoutError:
+            return compute()
+        _record('shared')
+        return value
+
+    try:
+        value = _compute_once_across_processes(key, compute, timeout)
+    except BaseException as exc:
+        # Waiters fail the same way (e.g. a 404)
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(value)
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+    return value
@@ -1,3 +1,1764 @@
-from django.test import TestCase
+"""
+Performance regression suite for the core API.
 
-# Create your tests here.
+Every route in ``core/urls.py`` is exercised through the Django test client
+against a synthetic dataset. Each endpoint has a query budget; exceeding it
+fails the run. Set ``PERF_REPORT`` to a file path to also write a p50/p95
+latency report there.
+
+The dataset is scaled by ``PERF_SCALE`` (1.0 = 1k users, 10k calendars,
+1M events); the default keeps ``manage.py test`` fast. ``PERF_ITERATIONS``
+controls how many times each endpoint is timed.
+"""
+import gzip
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipUnless
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import update_last_login
+from django.contrib.staticfiles import finders
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, OperationalError, connection
+from django.db.models import QuerySet
+from django.http import Http404, HttpResponse
+from django.test import AsyncClient, LiveServerTestCase, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, resolve
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from cathendar import db_router, static_serving
+from cathendar.metrics import CONTENT_TYPE, registry
+from cathendar.middleware import CompressionMiddleware, InstrumentationMiddleware
+
+from . import cache as object_cache
+from . import archive, bitmaps, counters, singleflight, throttling
+from . import urls as core_urls
+from .authentication import ClaimsJWTAuthentication, ClaimsRefreshToken
+from .friends import friend_suggestions, friends_sharing_calendars, mutual_friends
+from .management.commands import startup_time
+from .management.commands.load_test import percentile
+from .models import (
+    User, Calendar, Event, Availability, AvailabilityArchive, AvailabilityBitmap, Friend, CalendarShare,
+    Holiday,
+)
+from .partitioning import add_months, check_table, partition_name, partition_table, unpartition_table
+from .purge import purge_deleted, soft_delete_user
+from .renderers import HAS_MSGPACK, from_columnar
+from .search import decode_cursor, search_events, search_users
+from .timezones import LocalDays, day_index
+from .seeding import DEFAULT_PASSWORD, build_dataset
+from .views import AvailabilityViewSet, CalendarViewSet
+
+PERF_SCALE = float(os.getenv('PERF_SCALE', '0.01'))
+PERF_ITERATIONS = int(os.getenv('PERF_ITERATIONS', '5'))
+PERF_REPORT = os.getenv('PERF_REPORT')
+
+FULL_SCALE = {
+    'users': 1000,
+    'calendars_per_user': 10,
+    'events_per_calendar': 100,
+    'share_density': 0.005,
+}
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def _scaled_dataset_options():
+    users = max(10, int(FULL_SCALE['users'] * PERF_SCALE))
+    return {
+        'users': users,
+        'calendars_per_user': FULL_SCALE['calendars_per_user'],
+        # At least a full page of events so list endpoints exercise serializers
+        'events_per_calendar': max(25, int(FULL_SCALE['events_per_calendar'] * PERF_SCALE)),
+        'share_density': max(FULL_SCALE['share_density'], 2 / users),
+    }
+
+
+def _route_names(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLPattern):
+            yield pattern.name
+        else:
+            yield from _route_names(pattern.url_patterns)
+
+
+class Endpoint:
+    """A route under test with its query budget."""
+
+    def __init__(self, name, method, path, budget, data=None, staff=False, auth=True):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.budget = budget
+        self.data = data
+        self.staff = staff
+        self.auth = auth
+
+    def payload(self, ctx, iteration):
+        if callable(self.data):
+            return self.data(ctx, iteration)
+        return self.data
+
+
+# Query budgets include the JWT user lookup. Keep them independent of dataset
+# size: a budget that only holds for small datasets hides an N+1.
+ENDPOINTS = [
+    Endpoint('register', 'post', 'auth/register/', 16, auth=False, data=lambda ctx, i: {
+        'username': f'newuser{i}', 'email': f'newuser{i}@example.com',
+        'password': 'Sup3r-secret-pw', 'password_confirm': 'Sup3r-secret-pw',
+    }),
+    Endpoint('login', 'post', 'auth/login/', 10, auth=False, data=lambda ctx, i: {
+        'username': ctx['user'].username, 'password': ctx['password'],
+    }),
+    Endpoint('token-refresh', 'post', 'auth/refresh/', 2, auth=False, data=lambda ctx, i: {
+        'refresh': str(RefreshToken.for_user(ctx['user'])),
+    }),
+    Endpoint('user-list', 'get', 'users/', 3),
+    Endpoint('user-me', 'get', 'users/me/', 2),
+    Endpoint('user-detail', 'get', 'users/{other_user_id}/', 2),
+    Endpoint('user-search', 'get', 'users/search/?q=load', 2),
+    Endpoint('calendar-list', 'get', 'calendars/', 3),
+    Endpoint('calendar-detail', 'get', 'calendars/{calendar_id}/', 2),
+    Endpoint('calendar-shared-with', 'get', 'calendars/{calendar_id}/shared_with/', 3),
+    Endpoint('calendar-share', 'post', 'calendars/{calendar_id}/share/', 7, data=lambda ctx, i: {
+        'user_id': ctx['other_user_id'], 'permission': 'edit',
+    }),
+    Endpoint('calendar-share-bulk', 'post', 'calendars/{calendar_id}/share_bulk/', 6, data=lambda ctx, i: {
+        'user_ids': ctx['bulk_user_ids'], 'permission': ['view_only', 'edit'][i % 2],
+    }),
+    Endpoint('calendar-unshare-bulk', 'post', 'calendars/{calendar_id}/unshare_bulk/', 5, data=lambda ctx, i: {
+        'user_ids': ctx['bulk_user_ids'][i::PERF_ITERATIONS],
+    }),
+    Endpoint('calendar-create-shared', 'post', 'calendars/create_shared/', 5, data=lambda ctx, i: {
+        'user_id': ctx['other_user_id'],
+    }),
+    Endpoint('event-list', 'get', 'events/?calendar_id={calendar_id}', 3),
+    Endpoint('event-detail', 'get', 'events/{event_id}/', 2),
+    Endpoint('event-search', 'get', 'events/search/?q=stand', 3),
+    Endpoint('event-create', 'post', 'events/', 5, data=lambda ctx, i: {
+        'calendar': ctx['calendar_id'], 'title': f'Event {i}',
+        'start_time': '2025-06-01T10:00:00Z', 'end_time': '2025-06-01T11:00:00Z',
+    }),
+    Endpoint('availability-list', 'get', 'availability/?calendar_id={calendar_id}', 3),
+    Endpoint('availability-aggregated', 'get', 'availability/aggregated/?calendar_id={calendar_id}', 2),
+    Endpoint('availability-aggregated-archived', 'get',
+             'availability/aggregated/?calendar_id={calendar_id}&include_archived=true', 3),
+    Endpoint('availability-create', 'post', 'availability/', 7, data=lambda ctx, i: {
+        'calendar': ctx['calendar_id'], 'is_busy': True,
+        'start_time': f'2025-07-{i + 1:02d}T00:00:00Z', 'end_time': f'2025-07-{i + 1:02d}T23:59:59Z',
+    }),
+    Endpoint('availability-detail', 'get', 'availability/{availability_id}/', 2),
+    Endpoint('availability-free-days', 'get',
+             'availability/free_days/?calendar_id={calendar_id}&start_date=2025-01-01&end_date=2025-01-31', 3),
+    Endpoint('availability-month-summary', 'get',
+             'availability/month_summary/?calendar_id={calendar_id}&year=2025&month=1', 3),
+    Endpoint('friend-list', 'get', 'friends/', 3),
+    Endpoint('friend-detail', 'get', 'friends/{friend_id}/', 2),
+    Endpoint('friend-request', 'post', 'friends/request/', 4, data=lambda ctx, i: {
+        'friend_id': ctx['other_user_id'],
+    }),
+    Endpoint('friend-mutual', 'get', 'friends/mutual/?user_id={other_user_id}', 3),
+    Endpoint('friend-suggestions', 'get', 'friends/suggestions/', 3),
+    Endpoint('friend-sharing', 'get', 'friends/sharing/', 2),
+    Endpoint('calendar-share-list', 'get', 'calendar-shares/', 3),
+    Endpoint('calendar-share-detail', 'get', 'calendar-shares/{share_id}/', 2),
+    Endpoint('holiday-list', 'get', 'holidays/?country=US&year=2025', 3),
+    Endpoint('holiday-detail', 'get', 'holidays/{holiday_id}/', 2),
+    Endpoint('holiday-range', 'get',
+             'holidays/for_date_range/?country=US&start_date=2025-01-01&end_date=2025-12-31', 2),
+    Endpoint('async-calendar-data', 'get',
+             'async/calendars/{calendar_id}/data/?start_date=2025-01-01&end_date=2025-03-31', 6),
+    Endpoint('async-event-range', 'get',
+             'async/events/?calendar_id={calendar_id}&start_date=2025-01-01&end_date=2025-03-31', 4),
+    Endpoint('async-holiday-range', 'get',
+             'async/holidays/?country=US&start_date=2025-01-01&end_date=2025-12-31', 2),
+    Endpoint('admin-user-list', 'get', 'admin/users/', 3, staff=True),
+    Endpoint('admin-user-detail', 'get', 'admin/users/{other_user_id}/', 2, staff=True),
+    Endpoint('admin-user-search', 'get', 'admin/users/search/?q=load', 2, staff=True),
+    Endpoint('admin-user-stats', 'get', 'admin/users/stats/', 3, staff=True),
+    Endpoint('admin-calendar-list', 'get', 'admin/calendars/', 3, staff=True),
+    Endpoint('admin-calendar-detail', 'get', 'admin/calendars/{calendar_id}/', 2, staff=True),
+    Endpoint('admin-calendar-stats', 'get', 'admin/calendars/stats/', 3, staff=True),
+    Endpoint('admin-event-list', 'get', 'admin/events/', 3, staff=True),
+    Endpoint('admin-event-detail', 'get', 'admin/events/{event_id}/', 2, staff=True),
+    Endpoint('admin-event-stats', 'get', 'admin/events/stats/', 3, staff=True),
+    Endpoint('admin-event-search', 'get', 'admin/events/search/?q=stand', 3, staff=True),
+    Endpoint('admin-analytics-dashboard', 'get', 'admin/analytics/dashboard/', 10, staff=True),
+    Endpoint('admin-analytics-cache', 'get', 'admin/analytics/cache/', 1, staff=True),
+]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class EndpointPerformanceTests(TestCase):
+    """Query budgets and latency percentiles for every core API route."""
+
+    report = []
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = build_dataset(**_scaled_dataset_options())
+        cls.user = cls.dataset.users[0]
+        cls.other_user = cls.dataset.users[1]
+        cls.staff_user = User.objects.create_user(
+            'perf-staff', 'perf-staff@example.com', 'pw', is_staff=True
+        )
+        calendar = cls.user.calendars.first()
+        CalendarShare.objects.get_or_create(calendar=calendar, user=cls.other_user)
+        Availability.objects.bulk_create([
+            Availability(
+                user=user, calendar=calendar, is_busy=bool(day % 2),
+                start_time=f'2025-03-{day:02d}T00:00:00Z', end_time=f'2025-03-{day:02d}T23:59:59Z',
+            )
+            for user in (cls.user, cls.other_user)
+            for day in range(1, 29)
+        ])
+        Friend.objects.bulk_create([
+            Friend(user=cls.user, friend=friend) for friend in cls.dataset.users[1:30]
+        ])
+        Holiday.objects.bulk_create([
+            Holiday(date=date(2025, month, 1), name=f'Holiday {month}', country='US')
+            for month in range(1, 13)
+        ])
+        calendar_share = CalendarShare.objects.filter(calendar__owner=cls.user).first()
+        cls.context = {
+            'user': cls.user,
+            'password': cls.dataset.password,
+            'other_user_id': cls.other_user.pk,
+            # Users without a share on the calendar, so unshare_bulk leaves share_id alone
+            'bulk_user_ids': list(
+                User.objects.filter(pk__in=[user.pk for user in cls.dataset.users[2:]])
+                .exclude(calendar_shares__calendar=calendar).values_list('pk', flat=True)
+            ),
+            'calendar_id': calendar.pk,
+            'event_id': calendar.events.first().pk,
+            'availability_id': Availability.objects.filter(calendar=calendar).first().pk,
+            'friend_id': Friend.objects.filter(user=cls.user).first().pk,
+            'share_id': calendar_share.pk,
+            'holiday_id': Holiday.objects.first().pk,
+        }
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.report and PERF_REPORT:
+            with open(PERF_REPORT, 'w') as report:
+                report.write(f'{"endpoint":<30} {"queries":>7} {"budget":>6} {"p50 ms":>8} {"p95 ms":>8}\n')
+                for name, queries, budget, p50, p95 in cls.report:
+                    report.write(f'{name:<30} {queries:>7} {budget:>6} {p50:>8.2f} {p95:>8.2f}\n')
+        cls.report.clear()
+
+    def setUp(self):
+        # Cached rows must not leak between tests (primary keys get reused)
+        cache.clear()
+
+    def _client_for(self, endpoint):
+        client = APIClient()
+        if endpoint.auth:
+            user = self.staff_user if endpoint.staff else self.user
+            token = RefreshToken.for_user(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def _measure(self, endpoint):
+        client = self._client_for(endpoint)
+        path = '/api/' + endpoint.path.format(**self.context)
+        timings = []
+        max_queries = 0
+        for iteration in range(PERF_ITERATIONS):
+            payload = endpoint.payload(self.context, iteration)
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = getattr(client, endpoint.method)(path, payload, format='json')
+                timings.append((time.perf_counter() - start) * 1000)
+            self.assertLess(response.status_code, 400, f'{endpoint.name}: {response.content[:200]}')
+            max_queries = max(max_queries, len(queries))
+        return max_queries, timings
+
+    def test_endpoint_query_budgets(self):
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint=endpoint.name):
+                queries, timings = self._measure(endpoint)
+                self.report.append((
+                    endpoint.name, queries, endpoint.budget,
+                    percentile(timings, 0.5), percentile(timings, 0.95),
+                ))
+                self.assertLessEqual(
+                    queries, endpoint.budget,
+                    f'{endpoint.name} ran {queries} queries (budget {endpoint.budget})',
+                )
+
+    def test_every_route_has_a_budget(self):
+        routes = set(_route_names(core_urls.urlpatterns)) - {'api-root'}
+        covered = {
+            resolve('/api/' + endpoint.path.split('?')[0].format(**self.context)).url_name
+            for endpoint in ENDPOINTS
+        }
+        self.assertEqual(routes - covered, set())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class SeedLoadCommandTests(TestCase):
+
+    def _event_signature(self, prefix):
+        return list(
+            Event.objects.filter(calendar__owner__username__startswith=prefix)
+            .order_by('pk')
+            .values_list('title', 'start_time')
+        )
+
+    def test_same_seed_gives_same_dataset(self):
+        options = {
+            'users': 5, 'calendars_per_user': 2, 'events_per_calendar': 10,
+            'availability_days': 7, 'friends_per_user': 2, 'seed': 42, 'stdout': StringIO(),
+        }
+        call_command('seed_load', prefix='runa', **options)
+        call_command('seed_load', prefix='runb', **options)
+
+        self.assertEqual(User.objects.filter(username__startswith='runa').count(), 5)
+        self.assertEqual(Event.objects.count(), 5 * 2 * 10 * 2)
+        self.assertEqual(self._event_signature('runa'), self._event_signature('runb'))
+        self.assertTrue(User.objects.get(username='runa3').check_password(DEFAULT_PASSWORD))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class LoadTestCommandTests(LiveServerTestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('load0', 'load0@example.com', DEFAULT_PASSWORD)
+        Calendar.objects.create(owner=user, name='Load')
+
+    def test_one_user_one_flow(self):
+        out = StringIO()
+        call_command(
+            'load_test', base_url=self.live_server_url, concurrency=1, user_count=1, iterations=1,
+            ramp_up=0, month='2025-06', stdout=out,
+        )
+        lines = {line.split()[0]: line.split()[1:] for line in out.getvalue().splitlines() if line.strip()}
+        for step in ('login', 'calendars', 'events', 'availability', 'holidays', 'mark_availability'):
+            with self.subTest(step=step):
+                # requests, errors
+                self.assertEqual(lines[step][:2], ['1', '0'])
+        self.assertIn('page loads/s', out.getvalue())
+        self.assertTrue(Availability.objects.filter(user__username='load0').exists())
+
+    def test_percentile(self):
+        self.assertEqual(percentile([5, 1, 4, 2, 3], 0.5), 3)
+        self.assertEqual(percentile([5, 1, 4, 2, 3], 1), 5)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class FastAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('claims', 'claims@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_access_token_carries_user_claims(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        self.assertEqual(access['username'], 'claims')
+        self.assertFalse(access['is_staff'])
+
+    def test_reads_skip_user_query(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}')
+        # Views bind authentication_classes at import time (AUTH_FAST_PATH)
+        with mock.patch.object(CalendarViewSet, 'authentication_classes', [ClaimsJWTAuthentication]), \
+                CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/calendars/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([q for q in queries if 'FROM "core_user"' in q['sql']])
+
+    def _authenticate(self, user):
+        token = ClaimsRefreshToken.for_user(user).access_token
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return lambda: ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_deactivated_and_deleted_users_lose_access(self):
+        authenticate = self._authenticate(self.user)
+        self.assertTrue(authenticate().from_claims)
+        # Logging in elsewhere leaves outstanding tokens on the fast path
+        update_last_login(None, self.user)
+        self.assertTrue(authenticate().from_claims)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            authenticate()
+
+        soft_deleted = User.objects.create_user('soft', 'soft@example.com', 'pw')
+        authenticate = self._authenticate(soft_deleted)
+        soft_delete_user(soft_deleted)
+        with self.assertRaises(AuthenticationFailed):
+            authenticate()
+
+        deleted = User.objects.create_user('gone', 'gone@example.com', 'pw')
+        authenticate = self._authenticate(deleted)
+        deleted.delete()
+        with self.assertRaises(AuthenticationFailed):
+            authenticate()
+
+    def test_time_zone_change_applies_before_refresh(self):
+        authenticate = self._authenticate(self.user)
+        self.user.timezone = 'Asia/Tokyo'
+        self.user.save()
+        self.assertEqual(authenticate().timezone, 'Asia/Tokyo')
+
+    def test_write_responses_nest_the_full_user(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}')
+        with mock.patch.object(CalendarViewSet, 'authentication_classes', [ClaimsJWTAuthentication]):
+            response = client.post('/api/calendars/', {'name': 'Claims'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['owner']['email'], 'claims@example.com')
+
+    def test_refresh_picks_up_claim_changes(self):
+        refresh = str(ClaimsRefreshToken.for_user(self.user))
+        self.user.is_staff = True
+        self.user.save()
+
+        response = APIClient().post('/api/auth/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(AccessToken(response.data['access'])['is_staff'])
+
+    @override_settings(
+        PASSWORD_HASHERS=['core.hashers.ConfigurablePBKDF2PasswordHasher'],
+        PASSWORD_HASH_ITERATIONS=1000,
+    )
+    def test_password_hash_iterations_are_configurable(self):
+        self.assertTrue(make_password('pw').startswith('pbkdf2_sha256$1000$'))
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            user = User.objects.create_user('rehash', 'rehash@example.com', 'pw')
+        self.assertTrue(user.check_password('pw'))
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+
+class ObjectCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('cacheowner', 'cacheowner@example.com', 'pw')
+        cls.member = User.objects.create_user('cachemember', 'cachemember@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.owner, name='Cached')
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.member)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_user_is_cached_without_password(self):
+        self.assertEqual(object_cache.get_user(self.member.pk).username, 'cachemember')
+        with self.assertNumQueries(0):
+            user = object_cache.get_user(self.member.pk)
+        self.assertIn('password', user.get_deferred_fields())
+        self.assertNotIn(self.member.password, str(cache.get(object_cache.USER_KEY.format(self.member.pk)).__dict__))
+
+        self.member.first_name = 'Renamed'
+        self.member.save()
+        self.assertEqual(object_cache.get_user(self.member.pk).first_name, 'Renamed')
+        self.assertIsNone(object_cache.get_user(0))
+
+    def test_share_list_follows_share_user_and_calendar_changes(self):
+        shares = object_cache.get_calendar_shares(self.calendar.pk)
+        self.assertEqual([share['user']['username'] for share in shares], ['cachemember'])
+        self.assertNotIn('password', shares[0]['user'])
+        with self.assertNumQueries(0):
+            permission = object_cache.get_share_permission(self.calendar.pk, self.member.pk)
+            self.assertEqual(permission, CalendarShare.Permission.VIEW_ONLY)
+            self.assertIsNone(object_cache.get_share_permission(self.calendar.pk, self.owner.pk))
+
+        self.member.email = 'moved@example.com'
+        self.member.save()
+        self.assertEqual(object_cache.get_calendar_shares(self.calendar.pk)[0]['user']['email'], 'moved@example.com')
+
+        self.calendar.name = 'Renamed'
+        self.calendar.save()
+        self.assertEqual(object_cache.get_calendar_shares(self.calendar.pk)[0]['calendar_name'], 'Renamed')
+
+        share = CalendarShare.objects.get(user=self.member)
+        share.permission = CalendarShare.Permission.EDIT
+        share.save()
+        permission = object_cache.get_share_permission(self.calendar.pk, self.member.pk)
+        self.assertEqual(permission, CalendarShare.Permission.EDIT)
+        share.delete()
+        self.assertEqual(object_cache.get_calendar_shares(self.calendar.pk), [])
+
+    def test_calendar_versions(self):
+        first = object_cache.get_calendar_versions([self.calendar.pk])[self.calendar.pk]
+        self.assertEqual(object_cache.get_calendar_versions([self.calendar.pk]), {self.calendar.pk: first})
+        Event.objects.create(
+            calendar=self.calendar, title='Bump',
+            start_time=datetime(2025, 6, 2, 9, tzinfo=dt_timezone.utc),
+            end_time=datetime(2025, 6, 2, 10, tzinfo=dt_timezone.utc),
+        )
+        self.assertNotEqual(object_cache.get_calendar_versions([self.calendar.pk])[self.calendar.pk], first)
+
+
+SERVER_TIMING = re.compile(
+    r'^total;dur=\d+\.\d{2}, db;dur=\d+\.\d{2};desc="(\d+) queries", serialize;dur=\d+\.\d{2}$'
+)
+
+
+@override_settings(PERF_INSTRUMENTATION=True)
+class InstrumentationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('instrumented', 'instrumented@example.com', 'pw')
+        cls.staff = User.objects.create_user('metricsstaff', 'metricsstaff@example.com', 'pw', is_staff=True)
+        Calendar.objects.create(owner=cls.user, name='Instrumented')
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        # A fresh client loads the middleware chain under the settings above
+        self.client = APIClient()
+
+    def test_server_timing_header(self):
+        self.client.force_authenticate(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/calendars/')
+        self.assertEqual(response.status_code, 200)
+        match = SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        self.assertEqual(int(match.group(1)), len(queries))
+
+        metrics = registry.render()
+        self.assertIn(f'cathendar_db_queries_total{{view="calendar-list"}} {len(queries)}', metrics)
+        self.assertIn('cathendar_request_duration_seconds_count{view="calendar-list"} 1', metrics)
+        self.assertIn(f'cathendar_response_bytes_total{{view="calendar-list"}} {len(response.content)}', metrics)
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_header_can_be_turned_off(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/calendars/')
+        self.assertFalse(response.has_header('Server-Timing'))
+        self.assertIn('cathendar_request_duration_seconds_count{view="calendar-list"} 1', registry.render())
+
+    def test_removed_when_disabled(self):
+        with override_settings(PERF_INSTRUMENTATION=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                InstrumentationMiddleware(lambda request: HttpResponse())
+
+    def test_metrics_are_staff_only(self):
+        self.assertIn(self.client.get('/metrics/').status_code, (401, 403))
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/metrics/').status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], CONTENT_TYPE)
+        self.assertIn('# TYPE cathendar_request_duration_seconds histogram', response.content.decode())
+
+
+class UserSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('searcher', 'searcher@example.com', 'pw')
+        cls.ada = User.objects.create_user(
+            'alovelace', 'countess@example.com', 'pw', first_name='Ada', last_name='Lovelace'
+        )
+        cls.adam = User.objects.create_user('adam', 'adam.smith@example.com', 'pw', last_name='Smith')
+        cls.grace = User.objects.create_user('grace', 'amazing.grace@example.com', 'pw', first_name='Grace')
+        Friend.objects.create(user=cls.user, friend=cls.grace)
+
+    def _usernames(self, query, user=None):
+        return [u.username for u in search_users(query, user=user)]
+
+    def test_prefix_matches_any_field(self):
+        self.assertEqual(self._usernames('ada'), ['adam', 'alovelace'])
+        self.assertEqual(self._usernames('LOVE'), ['alovelace'])
+        self.assertEqual(self._usernames('countess'), ['alovelace'])
+        self.assertEqual(self._usernames('ada smi'), ['adam'])
+        self.assertEqual(self._usernames('   '), [])
+
+    def test_friends_rank_first_and_self_is_excluded(self):
+        results = list(search_users('a', user=self.user))
+        self.assertEqual([u.username for u in results], ['grace', 'adam', 'alovelace'])
+        self.assertTrue(results[0].is_friend)
+
+    def test_terms_follow_profile_changes(self):
+        self.grace.last_name = 'Hopper'
+        self.grace.save()
+        self.assertEqual(self._usernames('hopp'), ['grace'])
+
+        self.grace.delete()
+        self.assertEqual(self._usernames('hopp'), [])
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/users/search/', {'q': 'gra'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(u['username'], u['is_friend']) for u in response.data], [('grace', True)])
+
+
+class FriendGraphTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.me, cls.ann, cls.bob, cls.cat, cls.dan, cls.eve = [
+            User.objects.create_user(name, f'{name}@example.com', 'pw')
+            for name in ('me', 'ann', 'bob', 'cat', 'dan', 'eve')
+        ]
+        for user, friends in [
+            (cls.me, [cls.ann, cls.bob, cls.cat]),
+            (cls.ann, [cls.me, cls.bob, cls.dan, cls.eve]),
+            (cls.bob, [cls.cat, cls.dan]),
+            (cls.cat, [cls.dan]),
+        ]:
+            Friend.objects.bulk_create([Friend(user=user, friend=friend) for friend in friends])
+
+    def test_mutual_friends(self):
+        self.assertEqual(list(mutual_friends(self.me, self.ann)), [self.bob])
+        self.assertEqual(list(mutual_friends(self.me, self.eve)), [])
+
+    def test_suggestions_ranked_by_mutual_count(self):
+        suggestions = friend_suggestions(self.me)
+        self.assertEqual([(u.username, u.mutual_count) for u in suggestions], [('dan', 3), ('eve', 1)])
+
+    def test_friends_sharing_calendars(self):
+        mine = Calendar.objects.create(owner=self.me, name='Mine')
+        theirs = Calendar.objects.create(owner=self.bob, name='Theirs')
+        CalendarShare.objects.create(calendar=mine, user=self.ann)
+        CalendarShare.objects.create(calendar=theirs, user=self.me)
+        CalendarShare.objects.create(calendar=theirs, user=self.dan)
+        self.assertEqual(list(friends_sharing_calendars(self.me)), [self.ann, self.bob])
+
+    def test_soft_deleted_users_are_left_out(self):
+        mine = Calendar.objects.create(owner=self.me, name='Mine')
+        CalendarShare.objects.create(calendar=mine, user=self.ann)
+        CalendarShare.objects.create(calendar=mine, user=self.bob)
+        soft_delete_user(self.bob)
+        self.assertEqual(list(mutual_friends(self.me, self.ann)), [])
+        self.assertEqual(
+            [(u.username, u.mutual_count) for u in friend_suggestions(self.me)], [('dan', 2), ('eve', 1)],
+        )
+        self.assertEqual(list(friends_sharing_calendars(self.me)), [self.ann])
+
+    def test_suggestion_deleted_after_ranking_is_skipped(self):
+        in_bulk = QuerySet.in_bulk
+
+        def delete_dan_first(queryset, *args, **kwargs):
+            soft_delete_user(self.dan)
+            return in_bulk(queryset, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, 'in_bulk', autospec=True, side_effect=delete_dan_first):
+            suggestions = friend_suggestions(self.me)
+        self.assertEqual([(u.username, u.mutual_count) for u in suggestions], [('eve', 1)])
+
+
+class BulkShareTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.members = [
+            User.objects.create_user(f'member{i}', f'member{i}@example.com', 'pw') for i in range(5)
+        ]
+        cls.calendar = Calendar.objects.create(owner=cls.owner, name='Team')
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.members[0])
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/calendars/{self.calendar.pk}/share_bulk/'
+
+    def test_upserts_shares_in_one_batch(self):
+        # Warm the share cache so the response must reflect the invalidation
+        self.client.get(f'/api/calendars/{self.calendar.pk}/shared_with/')
+        response = self.client.post(self.url, {
+            'user_ids': [m.pk for m in self.members[:4]],
+            'shares': [{'user_id': self.members[0].pk, 'permission': 'admin'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(s['user']['username'], s['permission']) for s in response.data],
+            [('member0', 'view_only'), ('member1', 'view_only'), ('member2', 'view_only'), ('member3', 'view_only')],
+        )
+        shared_with = self.client.get(f'/api/calendars/{self.calendar.pk}/shared_with/')
+        self.assertEqual(len(shared_with.data), 4)
+
+        response = self.client.post(self.url, {
+            'shares': [{'user_id': self.members[1].pk, 'permission': 'edit'}],
+        }, format='json')
+        self.assertEqual(CalendarShare.objects.get(user=self.members[1]).permission, 'edit')
+        self.assertEqual(CalendarShare.objects.filter(calendar=self.calendar).count(), 4)
+
+    def test_rejects_unknown_users_and_permissions(self):
+        response = self.client.post(self.url, {'user_ids': [self.members[1].pk, 999999]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['user_ids'], [999999])
+
+        response = self.client.post(self.url, {'user_ids': [self.members[1].pk], 'permission': 'owner'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CalendarShare.objects.filter(calendar=self.calendar).count(), 1)
+
+    def test_unshare_bulk(self):
+        response = self.client.post(
+            f'/api/calendars/{self.calendar.pk}/unshare_bulk/',
+            {'user_ids': [m.pk for m in self.members]}, format='json',
+        )
+        self.assertEqual(response.data, {'deleted': 1})
+        self.assertFalse(CalendarShare.objects.filter(calendar=self.calendar).exists())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AsyncReadViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('async-owner', 'async-owner@example.com', 'pw')
+        cls.stranger = User.objects.create_user('async-stranger', 'async-stranger@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.owner, name='Async')
+        Event.objects.bulk_create([
+            Event(calendar=cls.calendar, title=f'Event {day}',
+                  start_time=f'2025-{month:02d}-{day:02d}T09:00:00Z',
+                  end_time=f'2025-{month:02d}-{day:02d}T10:00:00Z')
+            for month in (1, 2)
+            for day in (1, 15)
+        ])
+        Holiday.objects.create(date=date(2025, 1, 1), name='New Year', country='US')
+        cls.url = f'/api/async/calendars/{cls.calendar.pk}/data/'
+
+    def _auth(self, user):
+        return {'Authorization': f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'}
+
+    async def test_calendar_data_for_month(self):
+        response = await AsyncClient().get(
+            self.url, {'start_date': '2025-01-01', 'end_date': '2025-01-31'}, headers=self._auth(self.owner),
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['calendar']['name'], 'Async')
+        self.assertEqual([e['title'] for e in data['events']], ['Event 1', 'Event 15'])
+        self.assertEqual([h['name'] for h in data['holidays']], ['New Year'])
+
+    async def test_access_is_checked(self):
+        client = AsyncClient()
+        params = {'start_date': '2025-01-01', 'end_date': '2025-01-31'}
+        self.assertEqual((await client.get(self.url, params)).status_code, 401)
+        response = await client.get(self.url, params, headers=self._auth(self.stranger))
+        self.assertEqual(response.status_code, 403)
+        response = await client.get(self.url, {}, headers=self._auth(self.owner))
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(READ_REPLICA_ALIAS='default', READ_REPLICA_PIN_SECONDS=60)
+class ReplicaRoutingTests(TestCase):
+    """The test database stands in for the replica alias."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reader', 'reader@example.com', 'pw')
+        cls.other = User.objects.create_user('other-reader', 'other-reader@example.com', 'pw')
+
+    def setUp(self):
+        cache.clear()
+        db_router._replica_down_until = 0.0
+        self.factory = RequestFactory()
+        self.routed_to = []
+
+        def get_response(request):
+            self.routed_to.append(db_router.current_read_alias())
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        self.middleware = db_router.ReplicaRoutingMiddleware(get_response)
+
+    def _request(self, method, path, user):
+        token = RefreshToken.for_user(user).access_token
+        request = getattr(self.factory, method)(path, HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.middleware(request)
+        return self.routed_to[-1]
+
+    def test_safe_api_reads_use_replica(self):
+        self.assertEqual(self._request('get', '/api/calendars/', self.user), 'default')
+        self.assertEqual(self._request('get', '/api/admin/users/', self.user), 'default')
+        self.assertIsNone(self._request('get', '/admin-panel/', self.user))
+        self.assertIsNone(self._request('post', '/api/calendars/', self.user))
+
+    def test_writer_is_pinned_to_primary(self):
+        self._request('post', '/api/events/', self.user)
+        self.assertIsNone(self._request('get', '/api/events/', self.user))
+        self.assertEqual(self._request('get', '/api/events/', self.other), 'default')
+
+    def test_unavailable_replica_falls_back_to_primary(self):
+        with mock.patch.object(connection, 'ensure_connection', side_effect=OperationalError), \
+                self.assertLogs('cathendar.db_router', 'WARNING'):
+            self.assertIsNone(self._request('get', '/api/calendars/', self.user))
+        # Not retried until the retry window has passed
+        self.assertIsNone(self._request('get', '/api/calendars/', self.user))
+
+
+class PartitioningTests(TestCase):
+
+    def test_month_arithmetic_and_names(self):
+        self.assertEqual(add_months(date(2025, 11, 20), 3), date(2026, 2, 1))
+        self.assertEqual(add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+        self.assertEqual(partition_name('core_event', date(2025, 3, 1)), 'core_event_p2025_03')
+
+    def test_command_requires_postgresql(self):
+        if connection.vendor == 'postgresql':
+            self.skipTest('Runs against non-PostgreSQL backends only')
+        with self.assertRaisesMessage(CommandError, 'requires PostgreSQL'):
+            call_command('manage_partitions', stdout=StringIO())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Requires PostgreSQL')
+    def test_conversion_keeps_django_constraint_names(self):
+        def layout():
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(cursor, 'core_availability')
+            return {name: (c['columns'], c['foreign_key'], c['index']) for name, c in constraints.items()}
+
+        before = layout()
+        primary_key = before.pop('core_availability_pkey')
+        partition_table(connection, 'core_availability')
+        try:
+            after = layout()
+            self.assertEqual(after.pop('core_availability_pkey')[0], ['id', 'start_time'])
+            self.assertEqual(after, before)
+            self.assertEqual(check_table(connection, 'core_availability', Availability), [])
+            call_command('manage_partitions', check=True, stdout=StringIO())
+        finally:
+            unpartition_table(connection, 'core_availability')
+        self.assertEqual(layout(), dict(before, core_availability_pkey=primary_key))
+
+
+class AvailabilityArchiveTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('archiver', 'archiver@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.user, name='Archive')
+
+    def _mark(self, day, is_busy=True, start='00:00:00', end='23:59:59', title=''):
+        return Availability.objects.create(
+            user=self.user, calendar=self.calendar, is_busy=is_busy, title=title,
+            start_time=f'2024-01-{day:02d}T{start}Z', end_time=f'2024-01-{day:02d}T{end}Z',
+        )
+
+    def _ranges(self):
+        return list(AvailabilityArchive.objects.order_by('start_date').values_list(
+            'start_date', 'end_date', 'is_busy'
+        ))
+
+    def test_compaction_merges_consecutive_days(self):
+        for day in (1, 2, 3, 5):
+            self._mark(day)
+        self._mark(4, is_busy=False)
+        partial = self._mark(6, start='09:00:00', end='17:00:00')
+        self._mark(20)
+
+        call_command('compact_availability', horizon_days=30, stdout=StringIO())
+        self.assertEqual(self._ranges(), [
+            (date(2024, 1, 1), date(2024, 1, 3), True),
+            (date(2024, 1, 4), date(2024, 1, 4), False),
+            (date(2024, 1, 5), date(2024, 1, 5), True),
+            (date(2024, 1, 20), date(2024, 1, 20), True),
+        ])
+        self.assertEqual(list(Availability.objects.all()), [partial])
+
+        # Re-running later extends the range the new markers continue
+        self._mark(21)
+        call_command('compact_availability', horizon_days=30, stdout=StringIO())
+        self.assertEqual(self._ranges()[-1], (date(2024, 1, 20), date(2024, 1, 21), True))
+
+    def test_older_runs_only_extend_ranges_they_touch(self):
+        for day in range(10, 21):
+            self._mark(day)
+        call_command('compact_availability', horizon_days=30, stdout=StringIO())
+
+        # Archived after the newer range: Jan 4-9 stay uncovered
+        for day in (1, 2, 3, 8, 9):
+            self._mark(day)
+        call_command('compact_availability', horizon_days=30, stdout=StringIO())
+        self.assertEqual(self._ranges(), [
+            (date(2024, 1, 1), date(2024, 1, 3), True),
+            (date(2024, 1, 8), date(2024, 1, 20), True),
+        ])
+
+    def test_include_archived_expands_daily_rows(self):
+        for day in (1, 2):
+            self._mark(day)
+        call_command('compact_availability', horizon_days=30, stdout=StringIO())
+        self._mark(2, is_busy=False)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f'/api/availability/aggregated/?calendar_id={self.calendar.pk}'
+        self.assertEqual(len(client.get(url).json()), 1)
+        days = client.get(url + '&include_archived=true').json()
+        self.assertEqual(
+            [(d['start_time'][:10], d['is_busy']) for d in days],
+            [('2024-01-01', True), ('2024-01-02', False)],
+        )
+
+    def test_days_are_local_to_the_owner(self):
+        self.user.timezone = 'America/New_York'
+        self.user.save()
+        # New York midnight to 23:59:59 on Jan 1 and 2, and a UTC-midnight marker on Jan 5
+        for day in (1, 2):
+            Availability.objects.create(
+                user=self.user, calendar=self.calendar, is_busy=True,
+                start_time=f'2024-01-{day:02d}T05:00:00Z', end_time=f'2024-01-{day + 1:02d}T04:59:59Z',
+            )
+        utc_day = self._mark(5)
+
+        archived, ranges = archive.compact_availability(datetime(2024, 2, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual((archived, ranges), (2, 1))
+        self.assertEqual(self._ranges(), [(date(2024, 1, 1), date(2024, 1, 2), True)])
+        self.assertEqual(list(Availability.objects.all()), [utc_day])
+
+        days = archive.archived_availability(self.calendar.pk)
+        self.assertEqual(
+            [(d.start_time.isoformat(), d.end_time.isoformat()) for d in days],
+            [('2024-01-01T05:00:00+00:00', '2024-01-02T04:59:59+00:00'),
+             ('2024-01-02T05:00:00+00:00', '2024-01-03T04:59:59+00:00')],
+        )
+
+    def test_failed_compaction_leaves_archive_unchanged(self):
+        self._mark(1)
+        call_command('compact_availability', horizon_days=30, stdout=StringIO())
+        self._mark(2)
+        # The extended range and the marker deletes commit together
+        with mock.patch.object(AvailabilityArchive.objects, 'bulk_create', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                archive.compact_availability(datetime(2024, 2, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(self._ranges(), [(date(2024, 1, 1), date(2024, 1, 1), True)])
+        self.assertEqual(Availability.objects.count(), 1)
+
+
+class AvailabilityBitmapTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('bitowner', 'bitowner@example.com', 'pw')
+        cls.member = User.objects.create_user('bitmember', 'bitmember@example.com', 'pw')
+        cls.outsider = User.objects.create_user('bitoutsider', 'bitoutsider@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.owner, name='Bits')
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.member)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def _mark(self, user, day, is_busy=True, title=''):
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/availability/', {
+            'calendar': self.calendar.pk, 'is_busy': is_busy, 'title': title,
+            'start_time': f'{day}T00:00:00Z', 'end_time': f'{day}T23:59:59Z',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+    def test_masks_and_group_ops(self):
+        mask = bitmaps.range_mask(date(2024, 2, 27), date(2024, 3, 1))
+        self.assertEqual(
+            bitmaps.days_in(mask, 2024),
+            [date(2024, 2, 27), date(2024, 2, 28), date(2024, 2, 29), date(2024, 3, 1)],
+        )
+        self.assertEqual(bitmaps.month_mask(2024, 2).bit_count(), 29)
+        self.assertEqual(bitmaps.from_bytes(bitmaps.to_bytes(mask)), mask)
+        busy = {1: bitmaps.range_mask(date(2024, 2, 27), date(2024, 2, 27)), 2: 0}
+        self.assertEqual(bitmaps.free_on_all(busy, mask), [2])
+        self.assertEqual(bitmaps.everyone_free(busy, mask), mask & ~busy[1])
+        self.assertEqual(
+            [year for year, _ in bitmaps.split_by_year(date(2024, 12, 31), date(2025, 1, 1))], [2024, 2025]
+        )
+
+    def test_api_writes_keep_bitmaps_in_sync(self):
+        self._mark(self.owner, '2025-03-02')
+        self._mark(self.owner, '2025-03-03', is_busy=False)
+        busy, free = bitmaps.load(self.calendar.pk, [2025])[2025][self.owner.pk]
+        self.assertEqual(bitmaps.days_in(busy, 2025), [date(2025, 3, 2)])
+        self.assertEqual(bitmaps.days_in(free, 2025), [date(2025, 3, 3)])
+
+        # Re-marking a day replaces its status
+        self._mark(self.owner, '2025-03-02', is_busy=False)
+        busy, free = bitmaps.load(self.calendar.pk, [2025])[2025][self.owner.pk]
+        self.assertEqual(busy, 0)
+        self.assertEqual(bitmaps.days_in(free, 2025), [date(2025, 3, 2), date(2025, 3, 3)])
+
+        for marker in Availability.objects.filter(user=self.owner):
+            self.client.delete(f'/api/availability/{marker.pk}/')
+        self.assertFalse(AvailabilityBitmap.objects.exists())
+
+    def test_rebuild_matches_incremental_sync(self):
+        self._mark(self.owner, '2025-03-02')
+        self._mark(self.member, '2025-12-31', title='Away')
+        expected = set(AvailabilityBitmap.objects.values_list('user_id', 'year', 'busy_days', 'free_days'))
+        AvailabilityBitmap.objects.all().delete()
+        call_command('rebuild_availability_bitmaps', stdout=StringIO())
+        self.assertEqual(
+            set(AvailabilityBitmap.objects.values_list('user_id', 'year', 'busy_days', 'free_days')), expected
+        )
+
+    def test_free_days_and_month_summary(self):
+        self._mark(self.owner, '2025-03-02')
+        self._mark(self.member, '2025-03-04', title='Dentist')
+        self._mark(self.member, '2025-03-05', is_busy=False)
+
+        self.client.force_authenticate(self.owner)
+        response = self.client.get(
+            f'/api/availability/free_days/?calendar_id={self.calendar.pk}&start_date=2025-03-01&end_date=2025-03-05'
+        )
+        self.assertEqual(response.data['days'], ['2025-03-01', '2025-03-03', '2025-03-05'])
+        self.assertEqual(response.data['users_free_on_all_days'], [])
+        response = self.client.get(
+            f'/api/availability/free_days/?calendar_id={self.calendar.pk}'
+            f'&start_date=2025-03-03&end_date=2025-03-03&user_ids={self.owner.pk},{self.member.pk}'
+        )
+        self.assertEqual(response.data['users_free_on_all_days'], [self.owner.pk, self.member.pk])
+
+        response = self.client.get(f'/api/availability/month_summary/?calendar_id={self.calendar.pk}&year=2025&month=3')
+        member = response.data['users'][1]
+        self.assertEqual((member['busy'], member['free']), (['2025-03-04'], ['2025-03-05']))
+        self.assertEqual(member['notes'], [{'date': '2025-03-04', 'title': 'Dentist', 'description': ''}])
+        self.assertEqual(len(response.data['everyone_free']), 31 - 2)
+
+    def test_days_are_local_to_the_user(self):
+        self.member.timezone = 'America/New_York'
+        self.member.save()
+        # What the calendar UI sends for 2025-03-10 from New York: local midnight to 23:59:59.999
+        self.client.force_authenticate(self.member)
+        response = self.client.post('/api/availability/', {
+            'calendar': self.calendar.pk, 'is_busy': True, 'title': 'Trip',
+            'start_time': '2025-03-10T04:00:00Z', 'end_time': '2025-03-11T03:59:59.999Z',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        busy, _ = bitmaps.load(self.calendar.pk, [2025])[2025][self.member.pk]
+        self.assertEqual(bitmaps.days_in(busy, 2025), [date(2025, 3, 10)])
+        response = self.client.get(f'/api/availability/month_summary/?calendar_id={self.calendar.pk}&year=2025&month=3')
+        member = response.data['users'][1]
+        self.assertEqual(member['busy'], ['2025-03-10'])
+        self.assertEqual(member['notes'], [{'date': '2025-03-10', 'title': 'Trip', 'description': ''}])
+        response = self.client.get(
+            f'/api/availability/free_days/?calendar_id={self.calendar.pk}&start_date=2025-03-09&end_date=2025-03-11'
+        )
+        self.assertEqual(response.data['days'], ['2025-03-09', '2025-03-11'])
+
+        # Changing zone re-buckets existing markers
+        self.assertEqual(self.client.patch('/api/users/me/', {'timezone': 'UTC'}).status_code, 200)
+        busy, _ = bitmaps.load(self.calendar.pk, [2025])[2025][self.member.pk]
+        self.assertEqual(bitmaps.days_in(busy, 2025), [date(2025, 3, 10), date(2025, 3, 11)])
+        AvailabilityBitmap.objects.all().delete()
+        bitmaps.rebuild()
+        self.assertEqual(bitmaps.days_in(bitmaps.load(self.calendar.pk, [2025])[2025][self.member.pk][0], 2025),
+                         [date(2025, 3, 10), date(2025, 3, 11)])
+
+    def test_rejects_bad_input_and_outsiders(self):
+        self.client.force_authenticate(self.owner)
+        url = f'/api/availability/free_days/?calendar_id={self.calendar.pk}'
+        self.assertEqual(self.client.get(url + '&start_date=2025-03-05&end_date=2025-03-01').status_code, 400)
+        self.assertEqual(self.client.get(url + '&start_date=nope&end_date=2025-03-01').status_code, 400)
+        self.assertEqual(self.client.get(
+            f'/api/availability/month_summary/?calendar_id={self.calendar.pk}&year=2025&month=13'
+        ).status_code, 400)
+        self.client.force_authenticate(self.outsider)
+        self.assertEqual(self.client.get(url + '&start_date=2025-03-01&end_date=2025-03-05').status_code, 403)
+
+
+class CalendarCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('counter', 'counter@example.com', 'pw')
+        cls.others = [User.objects.create_user(f'counted{i}', f'counted{i}@example.com', 'pw') for i in range(3)]
+
+    def setUp(self):
+        cache.clear()
+        self.calendar = Calendar.objects.create(owner=self.owner, name='Counted')
+
+    def _counters(self, calendar=None):
+        calendar = calendar or self.calendar
+        calendar.refresh_from_db()
+        return calendar.share_count, calendar.event_count, calendar.last_event_at
+
+    def _event(self, day, calendar=None):
+        start = datetime(2025, 5, day, 10, tzinfo=dt_timezone.utc)
+        return Event.objects.create(
+            calendar=calendar or self.calendar, title='E', start_time=start, end_time=start + timedelta(hours=1),
+        )
+
+    def test_signals_maintain_counters(self):
+        first, last = self._event(1), self._event(9)
+        CalendarShare.objects.create(calendar=self.calendar, user=self.others[0])
+        self.assertEqual(self._counters(), (1, 2, last.start_time))
+
+        # A stale instance saving must not overwrite the counters
+        stale = Calendar.objects.get(pk=self.calendar.pk)
+        self._event(5)
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertEqual(self._counters()[1], 3)
+
+        Event.objects.get(pk=last.pk).delete()
+        self.assertEqual(self._counters()[1:], (2, datetime(2025, 5, 5, 10, tzinfo=dt_timezone.utc)))
+
+        moved = Event.objects.get(pk=first.pk)
+        other = Calendar.objects.create(owner=self.owner, name='Other')
+        moved.calendar = other
+        moved.save()
+        self.assertEqual(self._counters()[1], 1)
+        self.assertEqual(self._counters(other)[1:], (1, first.start_time))
+
+    def test_bulk_share_paths_and_admin_stats(self):
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        client.post(f'/api/calendars/{self.calendar.pk}/share_bulk/',
+                    {'user_ids': [u.pk for u in self.others]}, format='json')
+        self.assertEqual(self._counters()[0], 3)
+        with CaptureQueriesContext(connection) as queries:
+            client.post(f'/api/calendars/{self.calendar.pk}/unshare_bulk/',
+                        {'user_ids': [u.pk for u in self.others[:2]]}, format='json')
+        self.assertEqual(self._counters()[0], 1)
+        self.assertEqual(sum('UPDATE "core_calendar"' in q['sql'] for q in queries.captured_queries), 1)
+
+        staff = User.objects.create_user('counterstaff', 'counterstaff@example.com', 'pw', is_staff=True)
+        client.force_authenticate(staff)
+        self.assertEqual(client.get('/api/admin/calendars/stats/').data['shared_calendars'], 1)
+
+    def test_deleting_a_calendar_skips_its_own_counters(self):
+        self._event(1)
+        CalendarShare.objects.create(calendar=self.calendar, user=self.others[0])
+        with CaptureQueriesContext(connection) as queries:
+            self.calendar.delete()
+        self.assertFalse(any('UPDATE "core_calendar"' in q['sql'] for q in queries.captured_queries))
+
+    def test_reconcile_command_repairs_drift(self):
+        self._event(3)
+        Calendar.objects.filter(pk=self.calendar.pk).update(event_count=7, share_count=2, last_event_at=None)
+        self.assertEqual([c.pk for c in counters.drifted()], [self.calendar.pk])
+        out = StringIO()
+        call_command('reconcile_calendar_counters', dry_run=True, stdout=out)
+        self.assertIn('1 calendars have drifted', out.getvalue())
+        call_command('reconcile_calendar_counters', stdout=StringIO())
+        self.assertEqual(self._counters(), (0, 1, datetime(2025, 5, 3, 10, tzinfo=dt_timezone.utc)))
+        self.assertEqual(counters.drifted(), [])
+
+
+# Uncompressed HTML and gzipped total (HTML + local CSS/JS) per page
+PAGE_WEIGHT_BUDGETS = {
+    '/': (8_000, 16_000),
+    '/admin-panel/': (7_000, 6_000),
+    '/admin-panel/calendars/': (7_000, 8_000),
+}
+
+
+class PageWeightTests(TestCase):
+    """Bytes each page downloads on a cold cache; assets are cacheable, HTML is not."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('weigher', 'weigher@example.com', 'pw', is_staff=True)
+
+    def test_page_weight_budgets(self):
+        self.client.force_login(self.user)
+        for url, (html_budget, total_budget) in PAGE_WEIGHT_BUDGETS.items():
+            html = self.client.get(url).content
+            assets = [
+                finders.find(path.decode()) for path in
+                re.findall(rb'(?:href|src)="/static/([^"]+)"', html)
+            ]
+            asset_bytes = [open(asset, 'rb').read() for asset in assets]
+            total_gzip = len(gzip.compress(html)) + sum(len(gzip.compress(data)) for data in asset_bytes)
+            with self.subTest(url=url):
+                self.assertLessEqual(len(html), html_budget)
+                self.assertLessEqual(total_gzip, total_budget)
+
+
+class StaticPipelineTests(TestCase):
+
+    def test_collectstatic_writes_hashed_and_precompressed_files(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(
+            STATIC_ROOT=root,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'cathendar.storage.CompressedManifestStaticFilesStorage'},
+            },
+        ):
+            from django.contrib.staticfiles.storage import staticfiles_storage
+
+            call_command('collectstatic', interactive=False, verbosity=0)
+            hashed = staticfiles_storage.stored_name('calendar_app/js/calendar.js')
+            self.assertRegex(hashed, r'^calendar_app/js/calendar\.[0-9a-f]{12}\.js$')
+            with open(os.path.join(root, hashed), 'rb') as original, \
+                    open(os.path.join(root, hashed + '.gz'), 'rb') as compressed:
+                self.assertEqual(gzip.decompress(compressed.read()), original.read())
+
+            static_serving._immutable_names.cache_clear()
+            try:
+                factory = RequestFactory()
+                response = static_serving.serve(factory.get('/', HTTP_ACCEPT_ENCODING='gzip, br;q=0'), hashed)
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+                self.assertEqual(response['Content-Type'], 'text/javascript')
+                self.assertIn('immutable', response['Cache-Control'])
+                self.assertIn('Accept-Encoding', response['Vary'])
+                response.close()
+
+                response = static_serving.serve(factory.get('/'), 'calendar_app/js/calendar.js')
+                self.assertFalse(response.has_header('Content-Encoding'))
+                self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+                response.close()
+                with self.assertRaises(Http404):
+                    static_serving.serve(factory.get('/'), '../settings.py')
+            finally:
+                static_serving._immutable_names.cache_clear()
+
+
+class CalendarPagePayloadTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('painter', 'painter@example.com', 'pw')
+        cls.friend = User.objects.create_user('viewer', 'viewer@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.friend, name='Friend')
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.user)
+        for day in (1, 15):
+            start = datetime(2025, 3, day, 9, tzinfo=dt_timezone.utc)
+            Event.objects.create(calendar=cls.calendar, title=f'Day {day}', start_time=start,
+                                 end_time=start + timedelta(hours=1))
+        later = datetime(2025, 6, 1, tzinfo=dt_timezone.utc)
+        Event.objects.create(calendar=cls.calendar, title='Later', start_time=later, end_time=later + timedelta(hours=1))
+        Holiday.objects.create(date=date(2025, 3, 17), name='Holiday', country='US')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def _payload(self):
+        response = self.client.get('/month/2025/3/')
+        self.assertEqual(response.status_code, 200)
+        return response.context['initial_data']
+
+    def test_month_page_embeds_initial_data(self):
+        response = self.client.get('/month/2025/3/')
+        self.assertContains(response, '<script id="initial-data" type="application/json">')
+        payload = response.context['initial_data']
+        self.assertEqual([c['name'] for c in payload['calendars']], ['Friend'])
+        self.assertEqual([e['title'] for e in payload['events']], ['Day 1', 'Day 15'])
+        self.assertEqual(payload['events'][0]['calendar_id'], self.calendar.pk)
+        self.assertEqual([h['name'] for h in payload['holidays']], ['Holiday'])
+        self.assertTrue(payload['fixed_month'])
+        self.assertEqual(self.client.get('/month/2025/13/').status_code, 404)
+
+    def test_payload_is_cached_until_calendar_data_changes(self):
+        self._payload()
+        with CaptureQueriesContext(connection) as queries:
+            self._payload()
+        self.assertFalse(any('core_event' in q['sql'] for q in queries.captured_queries))
+
+        Availability.objects.create(
+            user=self.user, calendar=self.calendar, start_time=datetime(2025, 3, 3, tzinfo=dt_timezone.utc),
+            end_time=datetime(2025, 3, 3, 23, 59, 59, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(len(self._payload()['availabilities']), 1)
+        Calendar.objects.filter(pk=self.calendar.pk).first().delete()
+        self.assertEqual(self._payload()['calendars'], [])
+
+
+class CompactFormatTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('compact-owner', 'compact-owner@example.com', 'pw')
+        cls.member = User.objects.create_user('compact-member', 'compact-member@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.owner, name='Compact')
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.member)
+        Availability.objects.bulk_create([
+            Availability(
+                user=user, calendar=cls.calendar, is_busy=day % 2 == 0,
+                start_time=datetime(2025, 5, day, tzinfo=dt_timezone.utc),
+                end_time=datetime(2025, 5, day, 23, 59, 59, tzinfo=dt_timezone.utc),
+            )
+            for user in (cls.owner, cls.member)
+            for day in range(1, 11)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+        self.url = f'/api/availability/aggregated/?calendar_id={self.calendar.pk}'
+
+    def test_columnar_round_trips_and_dedupes_users(self):
+        rows = self.client.get(self.url).json()
+        response = self.client.get(self.url + '&format=columnar')
+        self.assertEqual(response['Content-Type'], 'application/vnd.cathendar.columnar+json')
+        data = response.json()
+        self.assertEqual(sorted(user['id'] for user in data['users']), [self.owner.pk, self.member.pk])
+        self.assertEqual(from_columnar(data), rows)
+        self.assertLess(len(response.content), len(self.client.get(self.url).content) * 0.6)
+
+        response = self.client.get(
+            f'/api/events/?calendar_id={self.calendar.pk}', HTTP_ACCEPT='application/vnd.cathendar.columnar+json',
+        )
+        self.assertEqual(response.json()['results'], {'count': 0, 'fields': [], 'columns': []})
+        # Non-list bodies keep their shape
+        self.assertEqual(self.client.get('/api/availability/aggregated/?format=columnar').json(),
+                         {'error': 'calendar_id required'})
+
+    def test_msgpack(self):
+        if not HAS_MSGPACK:
+            self.skipTest('msgpack is not installed')
+        import msgpack
+
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(from_columnar(msgpack.unpackb(response.content)), self.client.get(self.url).json())
+
+    def test_compression_middleware(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        body = b'{"title": "Standup"}' * 200
+        with override_settings(RESPONSE_COMPRESSION=True, RESPONSE_COMPRESSION_MIN_BYTES=1024):
+            middleware = CompressionMiddleware(lambda request: HttpResponse(body))
+            response = middleware(request)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(gzip.decompress(response.content), body)
+
+            small = CompressionMiddleware(lambda request: HttpResponse(body[:500]))(request)
+            self.assertFalse(small.has_header('Content-Encoding'))
+        with override_settings(RESPONSE_COMPRESSION=False):
+            with self.assertRaises(MiddlewareNotUsed):
+                CompressionMiddleware(lambda request: HttpResponse(body))
+
+    def test_compression_keeps_brotli_off_html(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='br, gzip')
+        html = b'<input type="hidden" name="csrfmiddlewaretoken" value="secret">' + b'<p>Standup</p>' * 200
+        fake_brotli = mock.Mock()
+        fake_brotli.compress.return_value = b'br'
+        with override_settings(RESPONSE_COMPRESSION=True, RESPONSE_COMPRESSION_MIN_BYTES=1024), \
+                mock.patch('cathendar.middleware.brotli', fake_brotli):
+            page = CompressionMiddleware(lambda request: HttpResponse(html))(request)
+            # Padded gzip (BREACH mitigation) rather than brotli
+            self.assertEqual(page['Content-Encoding'], 'gzip')
+            self.assertEqual(gzip.decompress(page.content), html)
+            fake_brotli.compress.assert_not_called()
+
+            api = CompressionMiddleware(
+                lambda request: HttpResponse(b'{"title": "Standup"}' * 200, content_type='application/json')
+            )(request)
+            self.assertEqual(api['Content-Encoding'], 'br')
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('bench_formats', calendar_id=self.calendar.pk, repeat=1, stdout=out)
+        self.assertIn('columnar', out.getvalue())
+
+
+def _throttle_rates(**rates):
+    return override_settings(
+        API_THROTTLING=True,
+        REST_FRAMEWORK=dict(settings.REST_FRAMEWORK, DEFAULT_THROTTLE_RATES=dict(
+            settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates,
+        )),
+    )
+
+
+class ThrottlingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('throttled', 'throttled@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.user, name='Throttled')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_token_bucket(self):
+        self.assertEqual(throttling.parse_rate('120/min'), (120, 60))
+        results = [throttling.take('bucket', 2, 1.0, now=100.0) for _ in range(3)]
+        self.assertEqual([allowed for allowed, _ in results], [True, True, False])
+        self.assertAlmostEqual(results[2][1], 1.0)
+        self.assertTrue(throttling.take('bucket', 2, 1.0, now=101.0)[0])
+        self.assertFalse(throttling.take('bucket', 2, 1.0, now=101.5)[0])
+
+    @_throttle_rates(login='2/min')
+    def test_login_is_limited_without_touching_the_database(self):
+        client = APIClient()
+        credentials = {'username': 'throttled', 'password': 'wrong'}
+        for _ in range(2):
+            self.assertEqual(client.post('/api/auth/login/', credentials).status_code, 401)
+        with self.assertNumQueries(0):
+            response = client.post('/api/auth/login/', credentials)
+        self.assertEqual(response.status_code, 429)
+        # 30s less the time the first two logins took
+        self.assertIn(int(response['Retry-After']), range(1, 31))
+        self.assertIn('cathendar_throttled_requests_total{scope="login"}', registry.render())
+
+    @_throttle_rates(**{'availability-aggregated': '1/min'})
+    def test_scoped_action(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = f'/api/availability/aggregated/?calendar_id={self.calendar.pk}'
+        self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(client.get(url).status_code, 429)
+        # Other actions only count against the overall user rate
+        self.assertEqual(client.get(f'/api/availability/?calendar_id={self.calendar.pk}').status_code, 200)
+
+    @_throttle_rates(user='1/min')
+    def test_authenticated_rejection_makes_no_queries(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}')
+        url = f'/api/availability/?calendar_id={self.calendar.pk}'
+        # With the claims fast path authentication is free, so only the throttle could query
+        with mock.patch.object(AvailabilityViewSet, 'authentication_classes', [ClaimsJWTAuthentication]):
+            self.assertEqual(client.get(url).status_code, 200)
+            with self.assertNumQueries(0):
+                response = client.get(url)
+        self.assertEqual(response.status_code, 429)
+        # Keyed by the token's user, so another IP shares the bucket
+        self.assertEqual(client.get(url, REMOTE_ADDR='10.0.0.2').status_code, 429)
+        self.assertTrue(cache.get(throttling.BUCKET_KEY.format('user', f'user:{self.user.pk}')))
+
+        # The key never needs request.user (a bare Django request has none)
+        throttle = throttling.UserTokenBucketThrottle()
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(throttle.get_client_key(request), f'user:{self.user.pk}')
+        forged = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {str(token)[:-2]}xx', REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(throttle.get_client_key(forged), 'ip:10.0.0.3')
+
+    def test_disabled_under_tests(self):
+        client = APIClient()
+        for _ in range(12):
+            self.assertEqual(client.post('/api/auth/login/', {}).status_code, 401)
+
+
+class SingleFlightTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('coalesced', 'coalesced@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(owner=cls.user, name='Coalesced')
+        Event.objects.create(
+            calendar=cls.calendar, title='Standup',
+            start_time=datetime(2025, 6, 2, 9, tzinfo=dt_timezone.utc),
+            end_time=datetime(2025, 6, 2, 10, tzinfo=dt_timezone.utc),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_concurrent_callers_share_one_computation(self):
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return b'result'
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(singleflight.get_or_compute, 'flight', compute) for _ in range(4)]
+            time.sleep(0.05)
+            release.set()
+            self.assertEqual({future.result() for future in futures}, {b'result'})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(singleflight.get_or_compute('flight', compute), b'result')
+        self.assertEqual(len(calls), 1)
+
+    def test_slow_leader_leaves_another_process_lock_alone(self):
+        lock_key = singleflight.LOCK_KEY.format('slow')
+
+        def compute():
+            # Our lock expired and another process took it
+            cache.set(lock_key, 'theirs')
+            return b'result'
+
+        self.assertEqual(singleflight.get_or_compute('slow', compute), b'result')
+        self.assertEqual(cache.get(lock_key), 'theirs')
+        # A caller that gave up waiting on the lock does not release it either
+        cache.delete('slow')
+        with mock.patch.object(singleflight, 'WAIT_SECONDS', 0.05):
+            self.assertEqual(singleflight.get_or_compute('slow', lambda: b'again'), b'again')
+        self.assertEqual(cache.get(lock_key), 'theirs')
+
+    def test_responses_are_shared_until_the_calendar_changes(self):
+        url = f'/api/events/?calendar_id={self.calendar.pk}'
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertNotEqual(self.client.get(url + '&format=columnar').content, first.content)
+
+        Event.objects.create(
+            calendar=self.calendar, title='Retro',
+            start_time=datetime(2025, 6, 3, 9, tzinfo=dt_timezone.utc),
+            end_time=datetime(2025, 6, 3, 10, tzinfo=dt_timezone.utc),
+        )
+        self.assertEqual(self.client.get(url).json()['count'], 2)
+
+
+class TimezoneTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tokyo', 'tokyo@example.com', 'pw', timezone='Asia/Tokyo')
+        cls.calendar = Calendar.objects.create(owner=cls.user, name='Tokyo')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}')
+
+    def test_local_days_match_zoneinfo_across_transitions(self):
+        for name in ('America/New_York', 'America/Sao_Paulo', 'Australia/Lord_Howe', 'Asia/Kolkata'):
+            days, zone = LocalDays(name), ZoneInfo(name)
+            moment = datetime(2018, 1, 1, tzinfo=dt_timezone.utc)
+            while moment.year < 2020:
+                self.assertEqual(days.day(moment), moment.astimezone(zone).date(), (name, moment))
+                moment += timedelta(hours=7, minutes=13)
+            # Sao Paulo skipped midnight when DST started on 2018-11-04
+            start = days.start_of(date(2018, 11, 4))
+            self.assertEqual(start.astimezone(zone).date(), date(2018, 11, 4))
+            self.assertLess((start - timedelta(seconds=1)).astimezone(zone).date(), date(2018, 11, 4))
+
+    def test_day_index(self):
+        days = LocalDays('America/New_York')
+        overnight = Event(pk=1, start_time=datetime(2025, 3, 9, 3, tzinfo=dt_timezone.utc),
+                          end_time=datetime(2025, 3, 10, 4, 0, tzinfo=dt_timezone.utc))
+        # 00:00-24:00 local on the 10th, ending exactly at midnight
+        whole_day = Availability(pk=2, start_time=days.start_of(date(2025, 3, 10)),
+                                 end_time=days.start_of(date(2025, 3, 11)))
+        holiday = Holiday(pk=3, date=date(2025, 3, 10))
+        index = day_index(days, date(2025, 3, 1), date(2025, 3, 31), [overnight], [whole_day], [holiday])
+        self.assertEqual(list(index), ['2025-03-08', '2025-03-09', '2025-03-10'])
+        self.assertEqual(index['2025-03-10'], {'events': [], 'availability': [2], 'holidays': [3]})
+
+    def test_marking_a_day_replaces_the_local_day_only(self):
+        # 2025-05-01 in Tokyo is 2025-04-30T15:00Z to 2025-05-01T15:00Z
+        previous_local_day = Availability.objects.create(
+            user=self.user, calendar=self.calendar,
+            start_time=datetime(2025, 4, 29, 15, tzinfo=dt_timezone.utc),
+            end_time=datetime(2025, 4, 30, 14, 59, 59, tzinfo=dt_timezone.utc),
+        )
+        response = self.client.post('/api/availability/', {
+            'calendar': self.calendar.pk, 'start_time': '2025-04-30T15:00:00Z',
+            'end_time': '2025-05-01T14:59:59Z', 'is_busy': True,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.client.post('/api/availability/', {
+            'calendar': self.calendar.pk, 'start_time': '2025-04-30T15:00:00Z',
+            'end_time': '2025-05-01T14:59:59Z', 'is_busy': False,
+        }, format='json')
+        markers = Availability.objects.filter(user=self.user).order_by('start_time')
+        self.assertEqual([(m.pk == previous_local_day.pk, m.is_busy) for m in markers], [(True, True), (False, False)])
+
+    def test_setting_and_bucketed_range(self):
+        self.assertEqual(self.client.patch('/api/users/me/', {'timezone': 'Mars/Olympus'}).status_code, 400)
+        response = self.client.patch('/api/users/me/', {'timezone': 'Asia/Tokyo', 'is_staff': True})
+        self.assertEqual(response.json()['timezone'], 'Asia/Tokyo')
+        self.assertFalse(response.json()['is_staff'])
+
+        event = Event.objects.create(
+            calendar=self.calendar, title='Late', start_time=datetime(2025, 5, 31, 16, tzinfo=dt_timezone.utc),
+            end_time=datetime(2025, 5, 31, 17, tzinfo=dt_timezone.utc),
+        )
+        response = self.client.get(
+            f'/api/async/calendars/{self.calendar.pk}/data/', {'start_date': '2025-06-01', 'end_date': '2025-06-30'},
+        )
+        data = response.json()
+        self.assertEqual(data['timezone'], 'Asia/Tokyo')
+        self.assertEqual(data['days'], {'2025-06-01': {'events': [event.pk], 'availability': [], 'holidays': []}})
+
+
+
+class EventSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('searcher', 'searcher@example.com', 'pw')
+        cls.stranger = User.objects.create_user('stranger', 'stranger@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(name='Team', owner=cls.stranger)
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.user, permission='view_only')
+        cls.private = Calendar.objects.create(name='Private', owner=cls.stranger)
+        start = datetime(2025, 6, 2, 9, tzinfo=dt_timezone.utc)
+        cls.title_match = Event.objects.create(
+            calendar=cls.calendar, title='Quarterly planning', start_time=start, end_time=start,
+        )
+        cls.description_match = Event.objects.create(
+            calendar=cls.calendar, title='Offsite', description='Planning for the quarter',
+            start_time=start, end_time=start,
+        )
+        Event.objects.create(calendar=cls.private, title='Planning', start_time=start, end_time=start)
+        # Written without signals, like seed_load
+        Event.objects.bulk_create([
+            Event(calendar=cls.calendar, title=f'Plan review {i}', start_time=start, end_time=start)
+            for i in range(3)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_ranked_prefix_matches_in_accessible_calendars(self):
+        events, next_cursor = search_events('PLAN quart', user=self.user)
+        self.assertEqual(events, [self.title_match, self.description_match])
+        self.assertIsNone(next_cursor)
+        self.assertEqual(len(search_events('plan', user=self.user)[0]), 5)
+        self.assertEqual(len(search_events('plan')[0]), 6)
+        self.assertEqual(search_events('"*)', user=self.user), ([], None))
+
+    def test_index_follows_updates_and_deletes(self):
+        self.title_match.title = 'Roadmap'
+        self.title_match.save()
+        self.assertEqual(search_events('roadmap')[0], [self.title_match])
+        self.assertNotIn(self.title_match, search_events('quarterly')[0])
+        Event.objects.filter(pk=self.title_match.pk).delete()
+        self.assertEqual(search_events('roadmap')[0], [])
+
+    def test_cursor_pagination(self):
+        seen, url = [], '/api/events/search/?q=plan&limit=2'
+        while url:
+            data = self.client.get(url).json()
+            seen += [event['id'] for event in data['results']]
+            url = data['next']
+        self.assertEqual(seen, [event.pk for event in search_events('plan', user=self.user, limit=10)[0]])
+        self.assertEqual(len(set(seen)), 5)
+        self.assertEqual(self.client.get('/api/events/search/?q=plan&cursor=bogus').status_code, 400)
+        with self.assertRaises(ValueError):
+            decode_cursor('bogus')
+
+    def test_admin_search(self):
+        staff = User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True)
+        self.client.force_authenticate(staff)
+        self.assertEqual(len(self.client.get('/api/admin/events/search/?q=plan').json()['results']), 6)
+
+        self.client.force_login(staff)
+        staff.is_superuser = True
+        staff.save()
+        response = self.client.get('/admin/core/event/', {'q': 'quarter'})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+
+
+class SoftDeleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.member = User.objects.create_user('member', 'member@example.com', 'pw')
+        cls.calendar = Calendar.objects.create(name='Doomed', owner=cls.owner)
+        cls.other = Calendar.objects.create(name='Kept', owner=cls.member)
+        CalendarShare.objects.create(calendar=cls.calendar, user=cls.member, permission='edit')
+        CalendarShare.objects.create(calendar=cls.other, user=cls.owner, permission='edit')
+        start = datetime(2025, 6, 2, tzinfo=dt_timezone.utc)
+        for calendar in (cls.calendar, cls.other):
+            Event.objects.bulk_create([
+                Event(calendar=calendar, title=f'Sync {i}', start_time=start, end_time=start) for i in range(7)
+            ])
+            Availability.objects.bulk_create([
+                Availability(user=user, calendar=calendar, start_time=start, end_time=start)
+                for user in (cls.owner, cls.member)
+            ])
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_calendar_is_hidden_then_purged_in_batches(self):
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.client.delete(f'/api/calendars/{self.calendar.pk}/').status_code, 204)
+        self.assertTrue(Event.objects.filter(calendar_id=self.calendar.pk).exists())
+
+        self.assertEqual(self.client.get(f'/api/calendars/{self.calendar.pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/events/?calendar_id={self.calendar.pk}').json()['count'], 0)
+        results = self.client.get('/api/events/search/?q=sync').json()['results']
+        self.assertEqual({row['calendar'] for row in results}, {self.other.pk})
+        # The serializer no longer finds the calendar
+        self.assertEqual(
+            self.client.post('/api/events/', {
+                'calendar': self.calendar.pk, 'title': 'Late', 'start_time': '2025-06-01T10:00:00Z',
+                'end_time': '2025-06-01T11:00:00Z',
+            }).status_code, 400,
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            out = StringIO()
+            call_command('purge_deleted', batch_size=3, stdout=out)
+        self.assertIn('Purged 1 calendars and 0 users', out.getvalue())
+        # 7 events in batches of 3: three DELETEs and a final empty SELECT
+        event_deletes = [q for q in queries.captured_queries if q['sql'].startswith('DELETE FROM "core_event"')]
+        self.assertEqual(len(event_deletes), 3)
+        self.assertFalse(Calendar.all_objects.filter(pk=self.calendar.pk).exists())
+        self.assertFalse(Event.objects.filter(calendar_id=self.calendar.pk).exists())
+        self.assertEqual(Event.objects.filter(calendar=self.other).count(), 7)
+
+    def test_user_delete_removes_their_calendars_and_rows(self):
+        staff = User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True)
+        self.client.force_authenticate(staff)
+        self.assertEqual(self.client.delete(f'/api/admin/users/{self.owner.pk}/').status_code, 204)
+        self.owner.refresh_from_db()
+        self.assertFalse(self.owner.is_active)
+        self.assertFalse(Calendar.objects.filter(owner=self.owner).exists())
+        self.assertEqual(self.client.get(f'/api/admin/users/{self.owner.pk}/').status_code, 404)
+        self.assertEqual(list(search_users('owner')), [])
+
+        self.assertEqual(purge_deleted(batch_size=2)[:2], (1, 1))
+        self.assertFalse(User.objects.filter(pk=self.owner.pk).exists())
+        self.assertEqual(list(Availability.objects.values_list('calendar_id', 'user_id')), [(self.other.pk, self.member.pk)])
+        self.assertFalse(CalendarShare.objects.filter(calendar=self.other).exists())
+        self.assertEqual(Calendar.objects.get(pk=self.other.pk).share_count, 0)
+
+    def test_admin_stats_leave_out_soft_deleted_rows(self):
+        staff = User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True)
+        self.client.force_authenticate(staff)
+        soft_delete_user(self.owner)
+        self.assertEqual(self.client.get('/api/admin/users/stats/').data['total_users'], 2)
+        self.assertEqual(self.client.get('/api/admin/events/stats/').data['total_events'], 7)
+        dashboard = self.client.get('/api/admin/analytics/dashboard/').data
+        self.assertEqual((dashboard['users']['total'], dashboard['events']['total']), (2, 7))
+
+
+# Modules that must not be imported when a process boots; they load on first use
+LAZY_MODULES = ['holidays', 'msgpack', 'channels.routing', 'channels.auth']
+
+
+class StartupTests(TestCase):
+    """What booting a worker imports: settings, apps, the ASGI handler and the URLconf."""
+
+    def test_startup_imports(self):
+        result = subprocess.run(
+            [sys.executable, '-c', startup_time.STARTUP_SCRIPT],
+            capture_output=True, text=True, cwd=settings.BASE_DIR,
+            env=dict(os.environ, DJANGO_SETTINGS_MODULE='cathendar.settings'),
+        )
+        self.assertEqual(result.returncode, 0, result.stderr[-2000:])
+        loaded = set(result.stdout.split())
+        for module in LAZY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, loaded)
+
+    def test_import_report(self):
+        report = startup_time.top_level_imports(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |       3500 | django\n'
+            'import time:        80 |       2000 |   django.utils\n'
+            'import time:       900 |       1500 | cathendar.urls\n'
+        )
+        self.assertEqual(report, [(3500, 'django'), (1500, 'cathendar.urls')])
+
+    def test_populate_holidays_rejects_unknown_country(self):
+        out = StringIO()
+        call_command('populate_holidays', country='xx', stdout=out)
+        self.assertIn('Invalid country code: XX', out.getvalue())
+        self.assertFalse(Holiday.objects.exists())
@@ -0,0 +1,161 @@
+"""
+Token-bucket rate limiting for the API.
+
+Each (scope, client) pair has a bucket holding up to N tokens that refills at
+N per period, from rates written the DRF way (``'120/min'``) in
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``. A request takes one token; an
+empty bucket means 429 with a Retry-After of the time until the next token.
+Unlike DRF's SimpleRateThrottle, which stores every request timestamp, a
+bucket is two numbers, and short bursts up to N are allowed.
+
+On Redis a bucket is updated by one Lua script, so concurrent workers never
+lose updates; other cache backends (locmem in development and tests) use a
+per-process lock. Checks only touch the cache, so rejected requests never
+reach the database: authenticated clients are keyed by the user id in their
+bearer token, not by ``request.user``. Rejections are counted in
+``cathendar_throttled_requests_total`` on ``/metrics/``.
+
+Set ``API_THROTTLING=False`` to turn every throttle into a no-op.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+BUCKET_KEY = 'throttle:{}:{}'
+
+# KEYS[1] bucket; ARGV capacity, refill per second, now, ttl.
+# Returns {allowed, seconds until the next token}.
+_TAKE_SCRIPT = '''
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'at')
+local tokens = tonumber(state[1]) or capacity
+local at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - at) * refill)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return {allowed, tostring((1 - math.min(tokens, 1)) / refill)}
+'''
+
+_local_lock = threading.Lock()
+
+
+def _redis_client():
+    """The raw redis-py client behind the default cache, if it is Redis."""
+    backend = getattr(cache, '_cache', None)
+    if backend is None or not hasattr(backend, 'get_client'):
+        return None
+    return backend.get_client(write=True)
+
+
+def take(key, capacity, refill_per_second, now=None):
+    """Take a token from bucket ``key``; return ``(allowed, seconds_until_next_token)``."""
+    now = time.time() if now is None else now
+    # Long enough for an empty bucket to refill completely
+    ttl = int(capacity / refill_per_second) + 1
+    client = _redis_client()
+    if client is not None:
+        allowed, wait = client.eval(_TAKE_SCRIPT, 1, cache.make_and_validate_key(key), capacity,
+                                    refill_per_second, now, ttl)
+        return bool(allowed), float(wait)
+
+    with _local_lock:
+        tokens, at = cache.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + max(0.0, now - at) * refill_per_second)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(key, (tokens, now), ttl)
+    return allowed, (1 - min(tokens, 1)) / refill_per_second
+
+
+def _token_user_id(request):
+    """User id claim of a valid bearer token in ``request``, else None. Checks the signature only."""
+    # Imported here: simplejwt loads auth models, which need the app registry
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken
+    from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    try:
+        raw_token = authentication.get_raw_token(header)
+        if raw_token is None:
+            return None
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def parse_rate(rate):
+    """``'120/min'`` -> ``(120, 60)``"""
+    count, period = rate.split('/')
+    return int(count), {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Base class; subclasses define ``get_scope`` and ``get_client_key``."""
+
+    def get_scope(self, view):
+        raise NotImplementedError
+
+    def get_client_key(self, request):
+        # From the bearer token's signed user id rather than request.user,
+        # which may cost a session or user query just to reject the request
+        user_id = _token_user_id(request)
+        if user_id is not None:
+            return f'user:{user_id}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        if not getattr(settings, 'API_THROTTLING', True):
+            return True
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        if not rate:
+            return True
+        capacity, period = parse_rate(rate)
+        allowed, self.wait_seconds = take(
+            BUCKET_KEY.format(scope, self.get_client_key(request)), capacity, capacity / period,
+        )
+        if not allowed:
+            # Imported here: cathendar.metrics imports DRF views, which load these throttles
+            from cathendar.metrics import registry
+
+            registry.inc('cathendar_throttled_requests_total', {'scope': scope})
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Overall limit per user (per IP for anonymous requests): the ``user`` rate."""
+
+    def get_scope(self, view):
+        return 'user'
+
+
+class ScopedTokenBucketThrottle(TokenBucketThrottle):
+    """
+    Extra limit for views or actions that set ``throttle_scope``. For an
+    action, declare ``throttle_scope = None`` on the viewset and pass it to
+    ``@action(..., throttle_scope='availability-aggregated')``.
+    """
+
+    def get_scope(self, view):
+        return getattr(view, 'throttle_scope', None)
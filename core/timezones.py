@@ -0,0 +1,148 @@
+"""
+Local-day bucketing.
+
+Times are stored in UTC, but users see days in their own zone
+(``User.timezone``). The UTC offset transitions of each zone are computed
+once per year and cached, so ``LocalDays`` maps an instant to a local date
+(or a local date to the instant it starts) with a bisect and integer
+arithmetic instead of a time zone conversion.
+
+``day_index`` buckets a range's events, availability and holidays into
+``{'YYYY-MM-DD': {...ids}}`` for the range endpoints. It computes the UTC
+instants of the range's local midnights once and places each row with two
+bisects, several times faster than converting every row (and far faster
+than pytz localisation).
+"""
+import bisect
+import math
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.core.exceptions import ValidationError
+
+DEFAULT_TIMEZONE = 'UTC'
+DAY_SECONDS = 86400
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def is_valid(name):
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+def validate_timezone(value):
+    if not is_valid(value):
+        raise ValidationError(f'Unknown time zone: {value}')
+
+
+@lru_cache(maxsize=1024)
+def transitions(zone_name, year):
+    """
+    ``(starts, offsets, end)``: sorted UTC timestamps from which each offset
+    (in seconds) applies, valid until ``end``. Covers ``year`` with a day of
+    margin either side.
+    """
+    zone = ZoneInfo(zone_name)
+
+    def offset(timestamp):
+        return int(datetime.fromtimestamp(timestamp, zone).utcoffset().total_seconds())
+
+    first = int(datetime(year, 1, 1, tzinfo=dt_timezone.utc).timestamp()) - DAY_SECONDS
+    last = int(datetime(year + 1, 1, 1, tzinfo=dt_timezone.utc).timestamp()) + DAY_SECONDS
+    starts, offsets = [first], [offset(first)]
+    # Zones change offset at most a few times a year, never twice in a day
+    for timestamp in range(first, last, DAY_SECONDS):
+        following = min(timestamp + DAY_SECONDS, last)
+        if offset(following) == offsets[-1]:
+            continue
+        low, high = timestamp, following
+        while high - low > 1:
+            middle = (low + high) // 2
+            if offset(middle) == offsets[-1]:
+                low = middle
+            else:
+                high = middle
+        starts.append(high)
+        offsets.append(offset(high))
+    return starts, offsets, last
+
+
+class LocalDays:
+    """Instant <-> local date conversions for one zone."""
+
+    def __init__(self, zone_name=DEFAULT_TIMEZONE):
+        self.zone_name = zone_name
+        # (from, until, offset) of the last lookup; rows of a month mostly share one
+        self._window = (0, 0, 0)
+
+    def offset(self, timestamp):
+        low, high, offset = self._window
+        if low <= timestamp < high:
+            return offset
+        year = date.fromordinal(_EPOCH_ORDINAL + int(timestamp // DAY_SECONDS)).year
+        starts, offsets, end = transitions(self.zone_name, year)
+        i = bisect.bisect_right(starts, timestamp) - 1
+        self._window = (starts[i], starts[i + 1] if i + 1 < len(starts) else end, offsets[i])
+        return offsets[i]
+
+    def day(self, value):
+        """The local date of an aware datetime."""
+        timestamp = math.floor(value.timestamp())
+        return date.fromordinal(_EPOCH_ORDINAL + (timestamp + self.offset(timestamp)) // DAY_SECONDS)
+
+    def start_of(self, day):
+        """The UTC instant at which local ``day`` begins."""
+        local = (day.toordinal() - _EPOCH_ORDINAL) * DAY_SECONDS
+        # Try the offsets in force around that midnight: when it is skipped
+        # by a DST change the day starts later, when repeated at the first one
+        candidates = {
+            local - offset
+            for offset in (self.offset(local - DAY_SECONDS), self.offset(local + DAY_SECONDS))
+        }
+        timestamp = min(
+            (candidate for candidate in candidates
+             if self.day(datetime.fromtimestamp(candidate, dt_timezone.utc)) == day),
+            default=local - self.offset(local),
+        )
+        return datetime.fromtimestamp(timestamp, dt_timezone.utc)
+
+    def bounds(self, first, last):
+        """UTC ``(start, end)`` of the local days ``first`` to ``last``; ``end`` is exclusive."""
+        return self.start_of(first), self.start_of(last + timedelta(days=1))
+
+
+def local_days(name):
+    """``LocalDays`` for a zone name, falling back to UTC for unknown names."""
+    return LocalDays(name if name and is_valid(name) else DEFAULT_TIMEZONE)
+
+
+def day_index(days, first, last, events=(), availabilities=(), holidays=()):
+    """
+    ``{'YYYY-MM-DD': {'events': [...], 'availability': [...], 'holidays': [...]}}``
+    of ids, for each local day from ``first`` to ``last`` that has any. Events
+    and markers are listed on every day they touch.
+    """
+    dates = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    # midnights[i] starts dates[i]; the final entry ends the range
+    midnights = [days.start_of(day) for day in dates] + [days.start_of(last + timedelta(days=1))]
+    index = {}
+
+    def add(i, kind, pk):
+        entry = index.setdefault(dates[i].isoformat(), {'events': [], 'availability': [], 'holidays': []})
+        entry[kind].append(pk)
+
+    for kind, items in (('events', events), ('availability', availabilities)):
+        for item in items:
+            start = bisect.bisect_right(midnights, item.start_time) - 1
+            # An interval ending exactly at midnight does not touch the next day
+            end = max(bisect.bisect_left(midnights, item.end_time) - 1, start)
+            for i in range(max(start, 0), min(end, len(dates) - 1) + 1):
+                add(i, kind, item.pk)
+    for holiday in holidays:
+        if first <= holiday.date <= last:
+            add((holiday.date - first).days, 'holidays', holiday.pk)
+    return dict(sorted(index.items()))
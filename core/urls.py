@@ -6,6 +6,7 @@ from .views import (
     CalendarViewSet, EventViewSet, AvailabilityViewSet,
     FriendViewSet, CalendarShareViewSet, HolidayViewSet
 )
+from . import async_views
 from .admin_views import (
     AdminUserViewSet, AdminCalendarViewSet, AdminEventViewSet, AdminAnalyticsViewSet
 )
@@ -30,6 +31,9 @@ urlpatterns = [
     path('auth/register/', UserRegistrationView.as_view(), name='register'),
     path('auth/login/', UserLoginView.as_view(), name='login'),
     path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('async/calendars/<int:calendar_id>/data/', async_views.calendar_data, name='async-calendar-data'),
+    path('async/events/', async_views.event_range, name='async-event-range'),
+    path('async/holidays/', async_views.holiday_range, name='async-holiday-range'),
     path('admin/', include(admin_router.urls)),
     path('', include(router.urls)),
 ]
@@ -1,22 +1,72 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.http import Http404, HttpResponse
 from django.contrib.auth import authenticate
 
+from . import archive, bitmaps, friends
+from . import cache as object_cache
+from . import counters
+from . import singleflight
+from .authentication import ClaimsRefreshToken, request_user
 from .models import User, Calendar, Event, Availability, Friend, CalendarShare, Holiday
+from .purge import soft_delete_calendar
+from .renderers import compact_renderer_classes
+from .search import search_events, search_users
 from .serializers import (
-    UserSerializer, UserRegistrationSerializer, CalendarSerializer,
-    EventSerializer, AvailabilitySerializer, FriendSerializer, CalendarShareSerializer,
-    HolidaySerializer
+    UserSerializer, UserSearchSerializer, UserSettingsSerializer, FriendSuggestionSerializer,
+    UserRegistrationSerializer, CalendarSerializer, EventSerializer, AvailabilitySerializer, FriendSerializer,
+    CalendarShareSerializer, HolidaySerializer
 )
+from .timezones import local_days
+
+EDIT_PERMISSIONS = (CalendarShare.Permission.EDIT, CalendarShare.Permission.ADMIN)
+MAX_BULK_SHARES = 1000
+MAX_FREE_DAYS_RANGE = 366
+SHARED_RESPONSE_KEY = 'core:shared-response:{}:{}:{}:{}:{}'
+
+
+def get_calendar_or_404(calendar_id):
+    """Cached equivalent of ``get_object_or_404(Calendar, id=calendar_id)``."""
+    calendar = object_cache.get_calendar(calendar_id) if calendar_id else None
+    if calendar is None:
+        raise Http404('No Calendar matches the given query.')
+    return calendar
+
+
+def shared_response(view, request, calendar_id, build):
+    """
+    Render ``build()`` once for all concurrent identical requests on a
+    calendar (see ``core.singleflight``). Only for responses that do not
+    depend on the requesting user.
+    """
+    renderer = request.accepted_renderer
+    if renderer.format == 'api':
+        return Response(build())
+    version = object_cache.get_calendar_versions([calendar_id])[calendar_id]
+    key = SHARED_RESPONSE_KEY.format(
+        calendar_id, version, request.get_host(), request.get_full_path(), request.accepted_media_type,
+    )
+
+    def render():
+        content = renderer.render(build(), request.accepted_media_type, view.get_renderer_context())
+        content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+        return content, content_type
+
+    content, content_type = singleflight.get_or_compute(key, render)
+    return HttpResponse(content, content_type=content_type)
 
 
 class UserRegistrationView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'register'
 
     def post(self, request):
         serializer = UserRegistrationSerializer(data=request.data)
@@ -35,7 +85,7 @@ class UserRegistrationView(APIView):
             login(request, user)
             
             # Also return JWT tokens for API calls
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'user': UserSerializer(user).data,
                 'refresh': str(refresh),
@@ -46,6 +96,7 @@ class UserRegistrationView(APIView):
 
 class UserLoginView(APIView):
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'login'
 
     def post(self, request):
         username = request.data.get('username')
@@ -59,7 +110,7 @@ class UserLoginView(APIView):
                 login(request, user)
                 
                 # Also return JWT tokens for API calls
-                refresh = RefreshToken.for_user(user)
+                refresh = ClaimsRefreshToken.for_user(user)
                 return Response({
                     'user': UserSerializer(user).data,
                     'refresh': str(refresh),
@@ -69,12 +120,32 @@ class UserLoginView(APIView):
 
 
 class UserViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deleted_at__isnull=True)
     serializer_class = UserSerializer
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get', 'patch'])
     def me(self, request):
-        serializer = self.get_serializer(request.user)
+        user = object_cache.get_user(request.user.pk)
+        if request.method == 'PATCH':
+            settings_serializer = UserSettingsSerializer(user, data=request.data, partial=True)
+            settings_serializer.is_valid(raise_exception=True)
+            previous_zone = user.timezone
+            user = settings_serializer.save()
+            if user.timezone != previous_zone:
+                # Busy/free days are bucketed in the user's zone
+                bitmaps.rebuild(user_ids=[user.pk])
+        serializer = self.get_serializer(user)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Prefix search on username, name and email; friends are ranked first"""
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        users = search_users(request.query_params.get('q', ''), user=request.user, limit=limit)
+        serializer = UserSearchSerializer(users, many=True)
         return Response(serializer.data)
 
 
@@ -86,23 +157,22 @@ class CalendarViewSet(viewsets.ModelViewSet):
         # Return calendars owned by user or shared with user
         return Calendar.objects.filter(
             Q(owner=user) | Q(shares__user=user)
-        ).distinct()
+        ).select_related('owner').distinct()
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
+        serializer.save(owner=request_user(self.request))
 
     @action(detail=True, methods=['get'])
     def shared_with(self, request, pk=None):
         calendar = self.get_object()
-        shares = CalendarShare.objects.filter(calendar=calendar)
-        serializer = CalendarShareSerializer(shares, many=True)
-        return Response(serializer.data)
+        return Response(object_cache.get_calendar_shares(calendar.pk))
 
     def perform_destroy(self, instance):
         # Only calendar owner can delete the calendar
         if instance.owner != self.request.user:
             raise permissions.PermissionDenied("Only the calendar owner can delete this calendar")
-        instance.delete()
+        # Hidden at once; its events and availability are purged in the background
+        soft_delete_calendar(instance)
 
     @action(detail=True, methods=['post'])
     def share(self, request, pk=None):
@@ -127,6 +197,90 @@ class CalendarViewSet(viewsets.ModelViewSet):
         serializer = CalendarShareSerializer(share)
         return Response(serializer.data)
     
+    @action(detail=True, methods=['post'])
+    def share_bulk(self, request, pk=None):
+        """
+        Share with many users at once.
+
+        Accepts ``shares: [{user_id, permission}, ...]`` and/or ``user_ids``
+        with a common ``permission``. Existing shares get the new permission.
+        """
+        calendar = self.get_object()
+        if calendar.owner_id != request.user.pk:
+            return Response({'error': 'Only calendar owner can share'},
+                          status=status.HTTP_403_FORBIDDEN)
+
+        default_permission = request.data.get('permission', CalendarShare.Permission.VIEW_ONLY)
+        entries = [
+            (entry.get('user_id'), entry.get('permission', default_permission))
+            for entry in request.data.get('shares') or []
+            if isinstance(entry, dict)
+        ]
+        entries += [(user_id, default_permission) for user_id in request.data.get('user_ids') or []]
+        if not entries:
+            return Response({'error': 'shares or user_ids required'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(entries) > MAX_BULK_SHARES:
+            return Response({'error': f'At most {MAX_BULK_SHARES} shares per request'},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        permissions_by_user = {}
+        for user_id, permission in entries:
+            try:
+                user_id = int(user_id)
+            except (TypeError, ValueError):
+                return Response({'error': f'Invalid user_id: {user_id}'}, status=status.HTTP_400_BAD_REQUEST)
+            if permission not in CalendarShare.Permission.values:
+                return Response({'error': f'Invalid permission: {permission}'}, status=status.HTTP_400_BAD_REQUEST)
+            permissions_by_user[user_id] = permission
+        if calendar.owner_id in permissions_by_user:
+            return Response({'error': 'Cannot share a calendar with its owner'}, status=status.HTTP_400_BAD_REQUEST)
+
+        existing = set(User.objects.filter(id__in=permissions_by_user).values_list('id', flat=True))
+        missing = sorted(set(permissions_by_user) - existing)
+        if missing:
+            return Response({'error': 'Unknown users', 'user_ids': missing}, status=status.HTTP_400_BAD_REQUEST)
+
+        CalendarShare.objects.bulk_create(
+            [
+                CalendarShare(calendar=calendar, user_id=user_id, permission=permission)
+                for user_id, permission in permissions_by_user.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['calendar', 'user'],
+            update_fields=['permission'],
+        )
+        # bulk_create sends no post_save, so invalidate and recount once for the batch
+        object_cache.invalidate_calendar_shares(calendar.pk)
+        object_cache.bump_calendar_version(calendar.pk)
+        counters.recount([calendar.pk])
+
+        shares = CalendarShare.objects.filter(
+            calendar=calendar, user_id__in=permissions_by_user
+        ).select_related('user', 'calendar').order_by('user_id')
+        serializer = CalendarShareSerializer(shares, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['post'])
+    def unshare_bulk(self, request, pk=None):
+        """Remove the shares of every user in ``user_ids``"""
+        calendar = self.get_object()
+        if calendar.owner_id != request.user.pk:
+            return Response({'error': 'Only calendar owner can unshare'},
+                          status=status.HTTP_403_FORBIDDEN)
+        user_ids = request.data.get('user_ids')
+        if not isinstance(user_ids, list) or not user_ids:
+            return Response({'error': 'user_ids required'}, status=status.HTTP_400_BAD_REQUEST)
+        if not all(isinstance(user_id, int) for user_id in user_ids):
+            return Response({'error': 'user_ids must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(user_ids) > MAX_BULK_SHARES:
+            return Response({'error': f'At most {MAX_BULK_SHARES} users per request'},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        with counters.deferred():
+            deleted, _ = CalendarShare.objects.filter(calendar=calendar, user_id__in=user_ids).delete()
+        object_cache.invalidate_calendar_shares(calendar.pk)
+        return Response({'deleted': deleted})
+
     @action(detail=False, methods=['post'])
     def create_shared(self, request):
         """Create a new shared calendar with another user"""
@@ -167,61 +321,79 @@ class CalendarViewSet(viewsets.ModelViewSet):
 
 class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
+    renderer_classes = compact_renderer_classes()
 
     def get_queryset(self):
         calendar_id = self.request.query_params.get('calendar_id')
+        queryset = Event.objects.select_related('calendar').filter(calendar__deleted_at__isnull=True)
         if calendar_id:
-            return Event.objects.filter(calendar_id=calendar_id)
-        return Event.objects.all()
+            return queryset.filter(calendar_id=calendar_id)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        calendar_id = request.query_params.get('calendar_id', '')
+        if not calendar_id.isdigit():
+            return super().list(request, *args, **kwargs)
+        return shared_response(self, request, int(calendar_id), lambda: super(EventViewSet, self).list(
+            request, *args, **kwargs
+        ).data)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Full-text search over events in the user's calendars, best match first"""
+        try:
+            limit = int(request.query_params.get('limit', 20))
+            events, next_cursor = search_events(
+                request.query_params.get('q', ''), user=request.user,
+                cursor=request.query_params.get('cursor'), limit=limit,
+            )
+        except ValueError:
+            return Response({'error': 'limit must be an integer and cursor a value from next'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'next': next_cursor and replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor),
+            'results': self.get_serializer(events, many=True).data,
+        })
 
     def perform_create(self, serializer):
         calendar_id = self.request.data.get('calendar')
-        calendar = get_object_or_404(Calendar, id=calendar_id)
+        calendar = get_calendar_or_404(calendar_id)
         # Check permissions
-        if calendar.owner != self.request.user:
-            share = CalendarShare.objects.filter(
-                calendar=calendar,
-                user=self.request.user,
-                permission__in=[CalendarShare.Permission.EDIT, CalendarShare.Permission.ADMIN]
-            ).first()
-            if not share:
+        if calendar.owner_id != self.request.user.pk:
+            permission = object_cache.get_share_permission(calendar.pk, self.request.user.pk)
+            if permission not in EDIT_PERMISSIONS:
                 raise permissions.PermissionDenied("You don't have permission to add events to this calendar")
         serializer.save()
 
     def perform_destroy(self, instance):
-        calendar = instance.calendar
+        calendar = get_calendar_or_404(instance.calendar_id)
         # Check if user owns the calendar or has edit/admin permission
-        if calendar.owner != self.request.user:
-            share = CalendarShare.objects.filter(
-                calendar=calendar,
-                user=self.request.user,
-                permission__in=[CalendarShare.Permission.EDIT, CalendarShare.Permission.ADMIN]
-            ).first()
-            if not share:
+        if calendar.owner_id != self.request.user.pk:
+            permission = object_cache.get_share_permission(calendar.pk, self.request.user.pk)
+            if permission not in EDIT_PERMISSIONS:
                 raise permissions.PermissionDenied("You don't have permission to delete events from this calendar")
         instance.delete()
 
 
 class AvailabilityViewSet(viewsets.ModelViewSet):
     serializer_class = AvailabilitySerializer
+    renderer_classes = compact_renderer_classes()
+    # Set per action (see core.throttling)
+    throttle_scope = None
 
     def get_queryset(self):
         calendar_id = self.request.query_params.get('calendar_id')
-        queryset = Availability.objects.all()
+        queryset = Availability.objects.select_related('user', 'calendar').filter(calendar__deleted_at__isnull=True)
         if calendar_id:
             queryset = queryset.filter(calendar_id=calendar_id)
         return queryset
 
     def perform_create(self, serializer):
         calendar_id = self.request.data.get('calendar')
-        calendar = get_object_or_404(Calendar, id=calendar_id)
+        calendar = get_calendar_or_404(calendar_id)
         # Check if user has access to calendar
-        if calendar.owner != self.request.user:
-            share = CalendarShare.objects.filter(
-                calendar=calendar,
-                user=self.request.user
-            ).first()
-            if not share:
+        if calendar.owner_id != self.request.user.pk:
+            if object_cache.get_share_permission(calendar.pk, self.request.user.pk) is None:
                 raise permissions.PermissionDenied("You don't have access to this calendar")
         
         # Get the date range for the availability
@@ -229,39 +401,170 @@ class AvailabilityViewSet(viewsets.ModelViewSet):
         end_time = serializer.validated_data.get('end_time')
         
         # Delete any existing availability for this user/calendar/date combination
-        # We'll match by date (ignoring time) to ensure only one status per day
+        # We'll match by date (ignoring time) to ensure only one status per day,
+        # taking days in the user's time zone
         if start_time:
-            start_date = start_time.date()
-            end_date = end_time.date() if end_time else start_date
-            
-            # Delete existing availabilities that overlap with this date range
+            days = local_days(self.request.user.timezone)
+            start_date = days.day(start_time)
+            end_date = days.day(end_time) if end_time else start_date
+            range_start, range_end = days.bounds(start_date, max(start_date, end_date))
+
+            # Delete existing availabilities that start within this date range
             Availability.objects.filter(
                 user=self.request.user,
                 calendar=calendar,
-                start_time__date__gte=start_date,
-                start_time__date__lte=end_date
+                start_time__gte=range_start,
+                start_time__lt=range_end,
             ).delete()
         
-        serializer.save(user=self.request.user)
+        availability = serializer.save(user=request_user(self.request))
+        days = local_days(self.request.user.timezone)
+        bitmaps.sync_user(
+            availability.user_id, availability.calendar_id,
+            bitmaps.years_between(availability.start_time, availability.end_time, days), days,
+        )
+
+    def _marker_days(self, availability):
+        """``LocalDays`` of the user a marker belongs to"""
+        if availability.user_id == self.request.user.pk:
+            return local_days(self.request.user.timezone)
+        return bitmaps.user_days(availability.user_id)
+
+    def perform_update(self, serializer):
+        days = self._marker_days(serializer.instance)
+        old_years = bitmaps.years_between(serializer.instance.start_time, serializer.instance.end_time, days)
+        old_calendar_id = serializer.instance.calendar_id
+        availability = serializer.save()
+        bitmaps.sync_user(availability.user_id, old_calendar_id, old_years, days)
+        bitmaps.sync_user(
+            availability.user_id, availability.calendar_id,
+            bitmaps.years_between(availability.start_time, availability.end_time, days), days,
+        )
+
+    def perform_destroy(self, instance):
+        days = self._marker_days(instance)
+        years = bitmaps.years_between(instance.start_time, instance.end_time, days)
+        instance.delete()
+        bitmaps.sync_user(instance.user_id, instance.calendar_id, years, days)
+
+    def _readable_calendar(self, request):
+        """The ?calendar_id= calendar if the user can see it, else an error Response."""
+        calendar_id = request.query_params.get('calendar_id')
+        if not calendar_id:
+            return Response({'error': 'calendar_id required'}, status=status.HTTP_400_BAD_REQUEST)
+        calendar = get_calendar_or_404(calendar_id)
+        if calendar.owner_id != request.user.pk:
+            if object_cache.get_share_permission(calendar.pk, request.user.pk) is None:
+                return Response({'error': "You don't have access to this calendar"},
+                              status=status.HTTP_403_FORBIDDEN)
+        return calendar
+
+    @staticmethod
+    def _member_ids(calendar):
+        return [calendar.owner_id] + [share['user']['id'] for share in object_cache.get_calendar_shares(calendar.pk)]
 
     @action(detail=False, methods=['get'])
+    def free_days(self, request):
+        """Days in a range on which no member is busy, and members free on every day"""
+        calendar = self._readable_calendar(request)
+        if isinstance(calendar, Response):
+            return calendar
+        try:
+            start = date.fromisoformat(request.query_params.get('start_date', ''))
+            end = date.fromisoformat(request.query_params.get('end_date', ''))
+            user_ids = [int(i) for i in request.query_params.get('user_ids', '').split(',') if i]
+        except ValueError:
+            return Response({'error': 'start_date and end_date (YYYY-MM-DD) are required; user_ids must be integers'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        if end < start or (end - start).days > MAX_FREE_DAYS_RANGE:
+            return Response({'error': f'Range must be 1 to {MAX_FREE_DAYS_RANGE} days'},
+                          status=status.HTTP_400_BAD_REQUEST)
+
+        members = user_ids or self._member_ids(calendar)
+        years = dict(bitmaps.split_by_year(start, end))
+        loaded = bitmaps.load(calendar.pk, years, members)
+        days, busy_anywhere = [], set()
+        for year, mask in years.items():
+            busy_by_user = {user_id: busy for user_id, (busy, free) in loaded[year].items()}
+            days += bitmaps.days_in(bitmaps.everyone_free(busy_by_user, mask), year)
+            busy_anywhere.update(set(busy_by_user) - set(bitmaps.free_on_all(busy_by_user, mask)))
+        return Response({
+            'days': [day.isoformat() for day in days],
+            'users_free_on_all_days': [user_id for user_id in members if user_id not in busy_anywhere],
+        })
+
+    @action(detail=False, methods=['get'])
+    def month_summary(self, request):
+        """Per-member busy/free days and notes for one month, from the bitmaps"""
+        calendar = self._readable_calendar(request)
+        if isinstance(calendar, Response):
+            return calendar
+        try:
+            year = int(request.query_params.get('year', ''))
+            month = int(request.query_params.get('month', ''))
+            mask = bitmaps.month_mask(year, month)
+        except ValueError:
+            return Response({'error': 'year and month are required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        members = self._member_ids(calendar)
+        loaded = bitmaps.load(calendar.pk, [year], members)[year]
+        notes = defaultdict(list)
+        first = date(year, month, 1)
+        # Notes are sparse: only markers with a title or description. Fetched
+        # with a day of margin, then placed on the owner's local day
+        for user_id, zone, start_time, title, description in Availability.objects.filter(
+            calendar=calendar,
+            start_time__gte=datetime.combine(first - timedelta(days=1), time.min, tzinfo=dt_timezone.utc),
+            start_time__lt=datetime.combine(first + timedelta(days=32), time.min, tzinfo=dt_timezone.utc),
+        ).exclude(title='', description='').order_by('start_time').values_list(
+            'user_id', 'user__timezone', 'start_time', 'title', 'description'
+        ):
+            day = local_days(zone).day(start_time)
+            if (day.year, day.month) == (year, month):
+                notes[user_id].append({'date': day.isoformat(), 'title': title, 'description': description})
+
+        users = []
+        for user_id in members:
+            busy, free = loaded.get(user_id, (0, 0))
+            users.append({
+                'user_id': user_id,
+                'busy': [day.isoformat() for day in bitmaps.days_in(busy & mask, year)],
+                'free': [day.isoformat() for day in bitmaps.days_in(free & mask, year)],
+                'busy_count': (busy & mask).bit_count(),
+                'free_count': (free & mask).bit_count(),
+                'notes': notes.get(user_id, []),
+            })
+        everyone_free = bitmaps.everyone_free({u: b for u, (b, f) in loaded.items()}, mask)
+        return Response({
+            'year': year,
+            'month': month,
+            'users': users,
+            'everyone_free': [day.isoformat() for day in bitmaps.days_in(everyone_free, year)],
+        })
+
+    @action(detail=False, methods=['get'], throttle_scope='availability-aggregated')
     def aggregated(self, request):
         calendar_id = request.query_params.get('calendar_id')
         if not calendar_id:
             return Response({'error': 'calendar_id required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        calendar = get_object_or_404(Calendar, id=calendar_id)
-        # Get all availabilities for this calendar
-        availabilities = Availability.objects.filter(calendar=calendar)
-        serializer = self.get_serializer(availabilities, many=True)
-        return Response(serializer.data)
+        calendar = get_calendar_or_404(calendar_id)
+
+        def build():
+            # Get all availabilities for this calendar
+            availabilities = Availability.objects.filter(calendar=calendar).select_related('user', 'calendar')
+            if request.query_params.get('include_archived') in ('1', 'true', 'True'):
+                availabilities = archive.with_archived_availability(calendar.pk, list(availabilities))
+            return self.get_serializer(availabilities, many=True).data
+
+        return shared_response(self, request, calendar.pk, build)
 
 
 class FriendViewSet(viewsets.ModelViewSet):
     serializer_class = FriendSerializer
 
     def get_queryset(self):
-        return Friend.objects.filter(user=self.request.user)
+        return Friend.objects.filter(user=self.request.user).select_related('friend')
 
     @action(detail=False, methods=['post'])
     def request(self, request):
@@ -282,12 +585,40 @@ class FriendViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, 
                       status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
 
+    @action(detail=False, methods=['get'])
+    def mutual(self, request):
+        """Friends the current user has in common with ?user_id="""
+        user_id = request.query_params.get('user_id')
+        if not user_id:
+            return Response({'error': 'user_id required'}, status=status.HTTP_400_BAD_REQUEST)
+        other = get_object_or_404(User, id=user_id)
+        serializer = UserSerializer(friends.mutual_friends(request.user, other), many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def suggestions(self, request):
+        """Friends of friends, ranked by number of mutual friends"""
+        try:
+            limit = int(request.query_params.get('limit', 20))
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = FriendSuggestionSerializer(friends.friend_suggestions(request.user, limit=limit), many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def sharing(self, request):
+        """Friends that have a calendar in common with the current user"""
+        serializer = UserSerializer(friends.friends_sharing_calendars(request.user), many=True)
+        return Response(serializer.data)
+
 
 class CalendarShareViewSet(viewsets.ModelViewSet):
     serializer_class = CalendarShareSerializer
 
     def get_queryset(self):
-        return CalendarShare.objects.filter(calendar__owner=self.request.user)
+        return CalendarShare.objects.filter(
+            calendar__owner=self.request.user, calendar__deleted_at__isnull=True,
+        ).select_related('user', 'calendar')
 
 
 class HolidayViewSet(viewsets.ReadOnlyModelViewSet):
@@ -0,0 +1,58 @@
+async function loadAnalytics() {
+    try {
+        console.log('Loading analytics data...');
+        const data = await fetchAPI('analytics/dashboard/');
+        console.log('Analytics data loaded:', data);
+
+        if (data && data.users) {
+            document.getElementById('totalUsers').textContent = data.users.total || 0;
+            document.getElementById('activeUsers').textContent = data.users.active || 0;
+            document.getElementById('totalCalendars').textContent = data.calendars.total || 0;
+            document.getElementById('sharedCalendars').textContent = data.calendars.shared || 0;
+            document.getElementById('totalEvents').textContent = data.events.total || 0;
+            document.getElementById('upcomingEvents').textContent = data.events.upcoming || 0;
+            document.getElementById('totalAvailabilities').textContent = data.availability.total_markers || 0;
+            document.getElementById('busyMarkers').textContent = data.availability.busy_markers || 0;
+            document.getElementById('totalFriendships').textContent = data.friendships.total || 0;
+
+            const detailsHTML = `
+                <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 20px;">
+                    <div>
+                        <h4 style="margin-bottom: 10px; color: #475569;">User Statistics</h4>
+                        <p>Total Users: <strong>${data.users.total || 0}</strong></p>
+                        <p>Active Users (30 days): <strong>${data.users.active || 0}</strong></p>
+                        <p>Inactive Users: <strong>${(data.users.total || 0) - (data.users.active || 0)}</strong></p>
+                    </div>
+                    <div>
+                        <h4 style="margin-bottom: 10px; color: #475569;">Calendar Statistics</h4>
+                        <p>Total Calendars: <strong>${data.calendars.total || 0}</strong></p>
+                        <p>Shared Calendars: <strong>${data.calendars.shared || 0}</strong></p>
+                        <p>Private Calendars: <strong>${(data.calendars.total || 0) - (data.calendars.shared || 0)}</strong></p>
+                    </div>
+                    <div>
+                        <h4 style="margin-bottom: 10px; color: #475569;">Event Statistics</h4>
+                        <p>Total Events: <strong>${data.events.total || 0}</strong></p>
+                        <p>Upcoming Events: <strong>${data.events.upcoming || 0}</strong></p>
+                        <p>Past Events: <strong>${(data.events.total || 0) - (data.events.upcoming || 0)}</strong></p>
+                    </div>
+                    <div>
+                        <h4 style="margin-bottom: 10px; color: #475569;">Availability Statistics</h4>
+                        <p>Total Markers: <strong>${data.availability.total_markers || 0}</strong></p>
+                        <p>Busy Markers: <strong>${data.availability.busy_markers || 0}</strong></p>
+                        <p>Available Markers: <strong>${(data.availability.total_markers || 0) - (data.availability.busy_markers || 0)}</strong></p>
+                    </div>
+                </div>
+            `;
+            document.getElementById('analyticsDetails').innerHTML = detailsHTML;
+        } else {
+            throw new Error('Invalid response format');
+        }
+    } catch (error) {
+        console.error('Analytics load error:', error);
+        const errorMsg = error.message || 'Unknown error';
+        document.getElementById('analyticsDetails').innerHTML =
+            '<div class="error" style="padding: 20px; text-align: center;">Failed to load analytics.<br><small style="color: #64748b;">Error: ' + errorMsg + '</small><br><button onclick="location.reload()" class="btn btn-primary" style="margin-top: 10px;">Refresh Page</button></div>';
+    }
+}
+
+loadAnalytics();
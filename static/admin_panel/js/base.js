@@ -0,0 +1,125 @@
+const API_BASE = '/api/admin/';
+const getAuthHeaders = () => {
+    return {
+        'Content-Type': 'application/json',
+    };
+};
+
+// Get CSRF token from meta tag or cookie
+const getCSRFToken = () => {
+    // Try meta tag first (Django provides this)
+    const metaTag = document.querySelector('meta[name=csrf-token]');
+    if (metaTag) return metaTag.getAttribute('content');
+
+    // Try hidden input (from {% csrf_token %})
+    const csrfInput = document.querySelector('input[name=csrfmiddlewaretoken]');
+    if (csrfInput) return csrfInput.value;
+
+    // Fallback to cookie
+    const getCookie = (name) => {
+        const value = `; ${document.cookie}`;
+        const parts = value.split(`; ${name}=`);
+        if (parts.length === 2) return parts.pop().split(';').shift();
+        return null;
+    };
+    return getCookie('csrftoken');
+};
+
+const fetchAPI = async (endpoint, options = {}) => {
+    try {
+        const csrftoken = getCSRFToken();
+        const headers = {
+            ...getAuthHeaders(),
+            ...options.headers,
+        };
+
+        // Add CSRF token for session authentication
+        if (csrftoken) {
+            headers['X-CSRFToken'] = csrftoken;
+        }
+
+        const response = await fetch(API_BASE + endpoint, {
+            ...options,
+            headers: headers,
+            credentials: 'include',
+        });
+
+        if (!response.ok) {
+            let errorText = '';
+            try {
+                errorText = await response.text();
+            } catch (e) {
+                errorText = 'Unknown error';
+            }
+            console.error('API Error:', response.status, response.statusText, errorText);
+            throw new Error(`HTTP ${response.status}: ${errorText.substring(0, 200)}`);
+        }
+
+        return await response.json();
+    } catch (error) {
+        console.error('API Error:', error);
+        throw error;
+    }
+};
+
+// Notification Modal Functions
+let confirmCallback = null;
+
+function showNotification(title, message, type = 'info') {
+    const modal = document.getElementById('notificationModal');
+    const icon = document.getElementById('notificationIcon');
+    const titleEl = document.getElementById('notificationTitle');
+    const messageEl = document.getElementById('notificationMessage');
+    const button = document.getElementById('notificationButton');
+
+    titleEl.textContent = title;
+    messageEl.textContent = message;
+
+    const icons = {
+        success: '<i class="fas fa-check-circle"></i>',
+        error: '<i class="fas fa-times-circle"></i>',
+        warning: '<i class="fas fa-exclamation-triangle"></i>',
+        info: '<i class="fas fa-info-circle"></i>'
+    };
+
+    const colors = {
+        success: '#10b981',
+        error: '#ef4444',
+        warning: '#f59e0b',
+        info: '#3b82f6'
+    };
+
+    icon.innerHTML = icons[type] || icons.info;
+    button.style.background = `linear-gradient(135deg, ${colors[type]} 0%, ${colors[type]}dd 100%)`;
+
+    modal.style.display = 'flex';
+}
+
+function closeNotificationModal() {
+    document.getElementById('notificationModal').style.display = 'none';
+}
+
+// Confirmation Modal Functions
+function showConfirm(title, message, callback) {
+    const modal = document.getElementById('confirmModal');
+    const titleEl = document.getElementById('confirmTitle');
+    const messageEl = document.getElementById('confirmMessage');
+
+    titleEl.textContent = title;
+    messageEl.textContent = message;
+    confirmCallback = callback;
+
+    modal.style.display = 'flex';
+}
+
+function closeConfirmModal() {
+    document.getElementById('confirmModal').style.display = 'none';
+    confirmCallback = null;
+}
+
+function executeConfirmAction() {
+    if (confirmCallback) {
+        confirmCallback();
+    }
+    closeConfirmModal();
+}
@@ -0,0 +1,25 @@
+async function loadDashboard() {
+    try {
+        console.log('Loading dashboard data...');
+        const data = await fetchAPI('analytics/dashboard/');
+        console.log('Dashboard data loaded:', data);
+
+        if (data && data.users) {
+            document.getElementById('totalUsers').textContent = data.users.total || 0;
+            document.getElementById('activeUsers').textContent = data.users.active || 0;
+            document.getElementById('totalCalendars').textContent = data.calendars.total || 0;
+            document.getElementById('sharedCalendars').textContent = data.calendars.shared || 0;
+            document.getElementById('totalEvents').textContent = data.events.total || 0;
+            document.getElementById('upcomingEvents').textContent = data.events.upcoming || 0;
+        } else {
+            throw new Error('Invalid response format');
+        }
+    } catch (error) {
+        console.error('Dashboard load error:', error);
+        const errorMsg = error.message || 'Unknown error';
+        document.getElementById('statsGrid').innerHTML =
+            '<div class="error" style="padding: 20px; text-align: center;">Failed to load dashboard data.<br><small style="color: #64748b;">Error: ' + errorMsg + '</small><br><button onclick="location.reload()" class="btn btn-primary" style="margin-top: 10px;">Refresh Page</button></div>';
+    }
+}
+
+loadDashboard();
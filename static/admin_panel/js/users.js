@@ -0,0 +1,262 @@
+async function loadUsers() {
+    try {
+        const query = document.getElementById('userSearch').value.trim();
+        const [users, stats] = await Promise.all([
+            query
+                ? fetchAPI(`users/search/?q=${encodeURIComponent(query)}`).then(results => ({ results }))
+                : fetchAPI('users/'),
+            fetchAPI('users/stats/')
+        ]);
+
+        document.getElementById('userStats').textContent =
+            `Total: ${stats.total_users} | Active: ${stats.active_users}`;
+
+        if (users.results && users.results.length > 0) {
+            const tableHTML = `
+                <table>
+                    <thead>
+                        <tr>
+                            <th>ID</th>
+                            <th>Email</th>
+                            <th>Username</th>
+                            <th>Name</th>
+                            <th>Date Joined</th>
+                            <th>Actions</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                        ${users.results.map(user => `
+                            <tr>
+                                <td>${user.id}</td>
+                                <td>${user.email}</td>
+                                <td>${user.username}</td>
+                                <td>${user.first_name || ''} ${user.last_name || ''}</td>
+                                <td>${new Date(user.date_joined).toLocaleDateString()}</td>
+                                <td>
+                                    <button class="btn btn-sm btn-info" onclick="viewUser(${user.id})">View</button>
+                                    <button class="btn btn-sm btn-warning" onclick="editUser(${user.id})">Edit</button>
+                                    <button class="btn btn-sm btn-danger" onclick="deleteUser(${user.id})">Delete</button>
+                                </td>
+                            </tr>
+                        `).join('')}
+                    </tbody>
+                </table>
+            `;
+            document.getElementById('usersTable').innerHTML = tableHTML;
+        } else {
+            document.getElementById('usersTable').innerHTML =
+                '<div class="loading">No users found.</div>';
+        }
+    } catch (error) {
+        document.getElementById('usersTable').innerHTML =
+            '<div class="error">Failed to load users. Please refresh the page.</div>';
+    }
+}
+
+async function viewUser(userId) {
+    try {
+        const user = await fetchAPI(`users/${userId}/`);
+        document.getElementById('modalTitle').textContent = 'View User';
+        const modalBody = document.getElementById('modalBody');
+        modalBody.innerHTML = `
+            <p><strong>ID:</strong> ${user.id}</p>
+            <p><strong>Email:</strong> ${user.email}</p>
+            <p><strong>Username:</strong> ${user.username}</p>
+            <p><strong>Name:</strong> ${user.first_name || ''} ${user.last_name || ''}</p>
+            <p><strong>Date Joined:</strong> ${new Date(user.date_joined).toLocaleString()}</p>
+            ${user.last_login ? `<p><strong>Last Login:</strong> ${new Date(user.last_login).toLocaleString()}</p>` : '<p><strong>Last Login:</strong> Never</p>'}
+        `;
+        openModal();
+    } catch (error) {
+        showNotification('Error', 'Failed to load user details. Please try again.', 'error');
+    }
+}
+
+async function editUser(userId) {
+    try {
+        const user = await fetchAPI(`users/${userId}/`);
+        document.getElementById('modalTitle').textContent = 'Edit User';
+        const modalBody = document.getElementById('modalBody');
+        modalBody.innerHTML = `
+            <form id="editUserForm">
+                <input type="hidden" name="id" value="${user.id}">
+                <div class="form-group">
+                    <label>Email</label>
+                    <input type="email" name="email" class="form-control" value="${user.email}">
+                </div>
+                <div class="form-group">
+                    <label>Username</label>
+                    <input type="text" name="username" class="form-control" value="${user.username}">
+                </div>
+                <div class="form-group">
+                    <label>First Name</label>
+                    <input type="text" name="first_name" class="form-control" value="${user.first_name || ''}">
+                </div>
+                <div class="form-group">
+                    <label>Last Name</label>
+                    <input type="text" name="last_name" class="form-control" value="${user.last_name || ''}">
+                </div>
+                <button type="submit" class="btn btn-primary">Save Changes</button>
+            </form>
+        `;
+        openModal();
+
+        document.getElementById('editUserForm').addEventListener('submit', async (e) => {
+            e.preventDefault();
+            const formData = new FormData(e.target);
+            const data = Object.fromEntries(formData.entries());
+            await saveUser(user.id, data);
+        });
+    } catch (error) {
+        showNotification('Error', 'Failed to load user details for editing. Please try again.', 'error');
+    }
+}
+
+async function saveUser(userId, data) {
+    try {
+        // Convert datetime strings if present
+        const updateData = {
+            email: data.email,
+            username: data.username,
+            first_name: data.first_name || '',
+            last_name: data.last_name || ''
+        };
+        await fetchAPI(`users/${userId}/`, {
+            method: 'PUT',
+            body: JSON.stringify(updateData),
+        });
+        closeModal();
+        showNotification('Success', 'User updated successfully!', 'success');
+        loadUsers();
+    } catch (error) {
+        showNotification('Error', 'Failed to save user details: ' + (error.message || 'Unknown error'), 'error');
+    }
+}
+
+async function deleteUser(userId) {
+    showConfirm(
+        'Delete User',
+        `Are you sure you want to delete user ${userId}? This action cannot be undone.`,
+        async () => {
+            try {
+                await fetchAPI(`users/${userId}/`, {
+                    method: 'DELETE',
+                });
+                showNotification('Success', 'User deleted successfully!', 'success');
+                loadUsers();
+            } catch (error) {
+                showNotification('Error', 'Failed to delete user. Please try again.', 'error');
+            }
+        }
+    );
+}
+
+function openModal() {
+    document.getElementById('userModal').style.display = 'flex';
+}
+
+function closeModal() {
+    document.getElementById('userModal').style.display = 'none';
+}
+
+function showCreateUser() {
+    document.getElementById('modalTitle').textContent = 'Create New User';
+    const modalBody = document.getElementById('modalBody');
+    modalBody.innerHTML = `
+        <form id="createUserForm">
+            <div class="form-group">
+                <label>Email *</label>
+                <input type="email" name="email" class="form-control" required>
+            </div>
+            <div class="form-group">
+                <label>Username *</label>
+                <input type="text" name="username" class="form-control" required>
+            </div>
+            <div class="form-group">
+                <label>Password *</label>
+                <input type="password" name="password" class="form-control" required>
+            </div>
+            <div class="form-group">
+                <label>First Name</label>
+                <input type="text" name="first_name" class="form-control">
+            </div>
+            <div class="form-group">
+                <label>Last Name</label>
+                <input type="text" name="last_name" class="form-control">
+            </div>
+            <div class="form-group">
+                <label>
+                    <input type="checkbox" name="is_staff"> Staff Member
+                </label>
+            </div>
+            <div class="form-group">
+                <label>
+                    <input type="checkbox" name="is_superuser"> Superuser
+                </label>
+            </div>
+            <button type="submit" class="btn btn-primary">Create User</button>
+        </form>
+    `;
+    openModal();
+
+    document.getElementById('createUserForm').addEventListener('submit', async (e) => {
+        e.preventDefault();
+        const formData = new FormData(e.target);
+        const data = Object.fromEntries(formData.entries());
+        data.is_staff = data.is_staff === 'on';
+        data.is_superuser = data.is_superuser === 'on';
+        await createUser(data);
+    });
+}
+
+async function createUser(data) {
+    try {
+        // Use registration endpoint or create directly
+        const response = await fetch('/api/auth/register/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                email: data.email,
+                username: data.username,
+                password: data.password,
+                password_confirm: data.password,
+                first_name: data.first_name || '',
+                last_name: data.last_name || ''
+            }),
+            credentials: 'include'
+        });
+
+        if (response.ok) {
+            const userData = await response.json();
+            // Update staff status if needed
+            if (data.is_staff || data.is_superuser) {
+                await fetchAPI(`users/${userData.user.id}/`, {
+                    method: 'PUT',
+                    body: JSON.stringify({
+                        ...userData.user,
+                        is_staff: data.is_staff,
+                        is_superuser: data.is_superuser
+                    })
+                });
+            }
+            closeModal();
+            showNotification('Success', 'User created successfully!', 'success');
+            loadUsers();
+        } else {
+            const error = await response.json();
+            showNotification('Error', 'Failed to create user: ' + (error.error || JSON.stringify(error)), 'error');
+        }
+    } catch (error) {
+        showNotification('Error', 'Failed to create user. Please try again.', 'error');
+    }
+}
+
+let userSearchTimer = null;
+document.getElementById('userSearch').addEventListener('input', () => {
+    clearTimeout(userSearchTimer);
+    userSearchTimer = setTimeout(loadUsers, 250);
+});
+
+loadUsers();
@@ -0,0 +1,138 @@
+const API_BASE = '/api/';
+let authToken = null;
+
+// Try to get token from localStorage or session
+const getAuthHeaders = () => {
+    const headers = {
+        'Content-Type': 'application/json',
+    };
+    if (authToken) {
+        headers['Authorization'] = `Bearer ${authToken}`;
+    }
+    return headers;
+};
+
+const fetchAPI = async (endpoint, options = {}) => {
+    try {
+        const response = await fetch(API_BASE + endpoint, {
+            ...options,
+            headers: {
+                ...getAuthHeaders(),
+                ...options.headers,
+            },
+            credentials: 'include',
+        });
+
+        if (response.status === 401) {
+            // Redirect to login if unauthorized
+            window.location.href = '/login/';
+            return;
+        }
+
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        // Handle 204 No Content (common for DELETE requests)
+        if (response.status === 204 || response.status === 201) {
+            // Check if there's actually content to parse
+            const contentType = response.headers.get('content-type');
+            if (!contentType || !contentType.includes('application/json')) {
+                return null; // Success but no content
+            }
+        }
+
+        // Try to parse JSON, but handle empty responses gracefully
+        const text = await response.text();
+        if (!text) {
+            return null; // Empty response is OK for DELETE
+        }
+        return JSON.parse(text);
+    } catch (error) {
+        console.error('API Error:', error);
+        throw error;
+    }
+};
+
+// Check if user is authenticated (optional - session auth handles redirect)
+document.addEventListener('DOMContentLoaded', () => {
+    // Session auth will redirect if not logged in, so this is just for JWT token
+    const token = localStorage.getItem('authToken');
+    if (token) {
+        authToken = token;
+    }
+
+    // Drop the IndexedDB month cache (calendar.js) on logout
+    const logoutLink = document.getElementById('logoutLink');
+    if (logoutLink && window.indexedDB) {
+        logoutLink.addEventListener('click', event => {
+            event.preventDefault();
+            const request = indexedDB.deleteDatabase('cathendar');
+            request.onsuccess = request.onerror = request.onblocked = () => {
+                window.location.href = logoutLink.href;
+            };
+        });
+    }
+});
+
+// Notification Modal Functions
+let confirmCallback = null;
+
+function showNotification(title, message, type = 'info') {
+    const modal = document.getElementById('notificationModal');
+    const icon = document.getElementById('notificationIcon');
+    const titleEl = document.getElementById('notificationTitle');
+    const messageEl = document.getElementById('notificationMessage');
+    const button = document.getElementById('notificationButton');
+
+    titleEl.textContent = title;
+    messageEl.textContent = message;
+
+    const icons = {
+        success: '<i class="fas fa-check-circle"></i>',
+        error: '<i class="fas fa-times-circle"></i>',
+        warning: '<i class="fas fa-exclamation-triangle"></i>',
+        info: '<i class="fas fa-info-circle"></i>'
+    };
+
+    const colors = {
+        success: '#10b981',
+        error: '#ef4444',
+        warning: '#f59e0b',
+        info: '#3b82f6'
+    };
+
+    icon.innerHTML = icons[type] || icons.info;
+    button.style.background = `linear-gradient(135deg, ${colors[type]} 0%, ${colors[type]}dd 100%)`;
+
+    modal.style.display = 'flex';
+}
+
+function closeNotificationModal() {
+    document.getElementById('notificationModal').style.display = 'none';
+}
+
+// Confirmation Modal Functions
+function showConfirm(title, message, callback) {
+    const modal = document.getElementById('confirmModal');
+    const titleEl = document.getElementById('confirmTitle');
+    const messageEl = document.getElementById('confirmMessage');
+
+    titleEl.textContent = title;
+    messageEl.textContent = message;
+    confirmCallback = callback;
+
+    modal.style.display = 'flex';
+}
+
+function closeConfirmModal() {
+    document.getElementById('confirmModal').style.display = 'none';
+    confirmCallback = null;
+}
+
+function executeConfirmAction() {
+    if (confirmCallback) {
+        confirmCallback();
+    }
+    closeConfirmModal();
+}
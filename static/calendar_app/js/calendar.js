@@ -0,0 +1,1023 @@
+let currentDate = new Date();
+let calendars = [];
+let selectedCalendarId = null;
+let events = [];
+let availabilities = [];
+let holidays = [];
+const userCountry = 'US'; // Default country, can be made user-configurable
+
+const monthNames = ['January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'];
+const dayNames = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'];
+
+function updateMonthDisplay() {
+    const monthYear = `${monthNames[currentDate.getMonth()]} ${currentDate.getFullYear()}`;
+    document.getElementById('currentMonth').textContent = monthYear;
+}
+
+function changeMonth(direction) {
+    currentDate.setMonth(currentDate.getMonth() + direction);
+    updateMonthDisplay();
+    loadAllCalendarData(); // Reload holidays for new month
+}
+
+function goToToday() {
+    currentDate = new Date();
+    updateMonthDisplay();
+    loadAllCalendarData(); // Reload holidays for current month
+}
+
+
+function getDaysInMonth(year, month) {
+    return new Date(year, month + 1, 0).getDate();
+}
+
+function getFirstDayOfMonth(year, month) {
+    return new Date(year, month, 1).getDay();
+}
+
+async function loadCalendars() {
+    try {
+        const data = await fetchAPI('calendars/');
+        calendars = data.results || data || [];
+        renderCalendarsList();
+
+        // Load all calendar data (merged view) - no need to select a specific calendar
+        await loadAllCalendarData();
+    } catch (error) {
+        console.error('Failed to load calendars:', error);
+        document.getElementById('calendarsList').innerHTML =
+            '<li class="error">Failed to load calendars</li>';
+        events = [];
+        availabilities = [];
+        renderCalendar();
+    }
+}
+
+function renderCalendarsList() {
+    const list = document.getElementById('calendarsList');
+    if (calendars.length === 0) {
+        list.innerHTML = '<li style="color: #94a3b8; padding: 10px;">No calendars yet</li>';
+        return;
+    }
+    list.innerHTML = calendars.map(cal => {
+        const calendarOwnerId = cal.owner ? (typeof cal.owner === 'object' ? cal.owner.id : cal.owner) : null;
+        const canDelete = calendarOwnerId === currentUserId;
+        const isShared = calendarOwnerId !== currentUserId;
+        return `
+        <li class="calendar-item ${selectedCalendarId === cal.id ? 'active' : ''}"
+            onclick="selectCalendar(${cal.id})">
+            <span>
+                <span class="calendar-color" style="background: #667eea;"></span>
+                ${cal.name}
+                ${isShared ? '<span style="color: #94a3b8; font-size: 11px; margin-left: 6px;">(Shared)</span>' : ''}
+            </span>
+            ${canDelete ? `
+                <div class="calendar-actions" onclick="event.stopPropagation();">
+                    <button class="calendar-delete-btn" onclick="deleteCalendar(${cal.id}, '${cal.name.replace(/'/g, "\\'")}');" title="Delete calendar">
+                        <i class="fas fa-trash-alt"></i>
+                    </button>
+                </div>
+            ` : isShared ? `
+                <div class="calendar-actions" onclick="event.stopPropagation();">
+                    <span style="color: #94a3b8; font-size: 12px;" title="Shared calendar - view only">
+                        <i class="fas fa-eye"></i>
+                    </span>
+                </div>
+            ` : ''}
+        </li>
+    `;
+    }).join('');
+}
+
+async function selectCalendar(calendarId) {
+    selectedCalendarId = calendarId;
+    renderCalendarsList();
+    // Still load all data for merged view, but highlight selected calendar
+    await loadAllCalendarData();
+}
+
+// Months of data kept in memory (least recently used first) and in IndexedDB
+const MONTH_CACHE_SIZE = 12;
+const MONTH_CACHE_FRESH_MS = 60 * 1000;
+const MONTH_STORE_MAX_AGE_MS = 7 * 24 * 60 * 60 * 1000;
+const monthCache = new Map();
+
+// Thin promise wrapper over an IndexedDB object store; every call resolves
+// to null when IndexedDB is unavailable (e.g. private browsing)
+const monthStore = (() => {
+    const STORE = 'months';
+    let dbPromise = null;
+
+    function open() {
+        if (!dbPromise) {
+            dbPromise = new Promise(resolve => {
+                if (!window.indexedDB) {
+                    resolve(null);
+                    return;
+                }
+                const request = indexedDB.open('cathendar', 1);
+                request.onupgradeneeded = () => request.result.createObjectStore(STORE);
+                request.onsuccess = () => {
+                    // Don't block the logout handler in base.js
+                    request.result.onversionchange = () => request.result.close();
+                    resolve(request.result);
+                };
+                request.onerror = () => resolve(null);
+            });
+        }
+        return dbPromise;
+    }
+
+    async function run(mode, action) {
+        const db = await open();
+        if (!db) return null;
+        return new Promise(resolve => {
+            const transaction = db.transaction(STORE, mode);
+            const request = action(transaction.objectStore(STORE));
+            transaction.oncomplete = () => resolve(request ? request.result : null);
+            transaction.onerror = transaction.onabort = () => resolve(null);
+        });
+    }
+
+    return {
+        get: key => run('readonly', store => store.get(key)),
+        put: (key, value) => run('readwrite', store => store.put(value, key)),
+        clear: () => run('readwrite', store => store.clear()),
+        // Drops stale entries and other users' entries
+        prune: (maxAgeMs, userId) => run('readwrite', store => {
+            store.openCursor().onsuccess = event => {
+                const cursor = event.target.result;
+                if (!cursor) return;
+                if (!cursor.value || Date.now() - cursor.value.fetchedAt > maxAgeMs ||
+                        !String(cursor.key).startsWith(`${userId}:`)) {
+                    cursor.delete();
+                }
+                cursor.continue();
+            };
+            return null;
+        }),
+    };
+})();
+
+function toDateKey(date) {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
+}
+
+function monthKey(year, month) {
+    const calendarIds = calendars.map(cal => cal.id).sort((a, b) => a - b).join(',');
+    return `${currentUserId}:${calendarIds}:${year}-${month + 1}`;
+}
+
+function isFresh(data) {
+    return data && Date.now() - data.fetchedAt < MONTH_CACHE_FRESH_MS;
+}
+
+function rememberMonth(key, data, persist = true) {
+    monthCache.delete(key);
+    monthCache.set(key, data);
+    while (monthCache.size > MONTH_CACHE_SIZE) {
+        monthCache.delete(monthCache.keys().next().value);
+    }
+    if (persist) {
+        monthStore.put(key, data);
+    }
+}
+
+async function recallMonth(key) {
+    if (monthCache.has(key)) {
+        const data = monthCache.get(key);
+        rememberMonth(key, data, false);
+        return data;
+    }
+    const stored = await monthStore.get(key);
+    if (stored) {
+        rememberMonth(key, stored, false);
+    }
+    return stored;
+}
+
+function invalidateMonthCache() {
+    monthCache.clear();
+    monthStore.clear();
+}
+
+// One request per calendar for the month (plus a day either side for time zones)
+async function fetchMonth(year, month) {
+    const query = `start_date=${toDateKey(new Date(year, month, 0))}` +
+        `&end_date=${toDateKey(new Date(year, month + 1, 1))}&country=${userCountry}`;
+    const results = await Promise.all(
+        calendars.map(cal => fetchAPI(`async/calendars/${cal.id}/data/?${query}`))
+    );
+    const data = {
+        events: [],
+        availabilities: [],
+        holidays: results.length > 0 ? results[0].holidays : [],
+        days: {},
+        fetchedAt: Date.now(),
+    };
+    results.forEach((result, i) => {
+        // Add calendar info to each event for filtering/display
+        result.events.forEach(event => {
+            event.calendar_id = calendars[i].id;
+        });
+        data.events = data.events.concat(result.events);
+        data.availabilities = data.availabilities.concat(result.availability);
+        // Merge the per-day ids (holidays only once, from the first calendar)
+        for (const [day, ids] of Object.entries(result.days || {})) {
+            const merged = data.days[day] || (data.days[day] = { events: [], availability: [], holidays: [] });
+            merged.events.push(...ids.events);
+            merged.availability.push(...ids.availability);
+            if (i === 0) merged.holidays.push(...ids.holidays);
+        }
+    });
+    return data;
+}
+
+function isCurrentMonth(key) {
+    return monthKey(currentDate.getFullYear(), currentDate.getMonth()) === key;
+}
+
+function showMonthData(data) {
+    events = data.events;
+    availabilities = data.availabilities;
+    holidays = data.holidays;
+    dayIndex = data.days || null;
+    renderCalendar();
+}
+
+const whenIdle = window.requestIdleCallback || (callback => setTimeout(callback, 200));
+
+function prefetchAdjacentMonths() {
+    whenIdle(() => {
+        for (const offset of [-1, 1]) {
+            const target = new Date(currentDate.getFullYear(), currentDate.getMonth() + offset, 1);
+            const key = monthKey(target.getFullYear(), target.getMonth());
+            if (isFresh(monthCache.get(key))) continue;
+            fetchMonth(target.getFullYear(), target.getMonth())
+                .then(data => rememberMonth(key, data))
+                .catch(() => {});  // best effort; the month loads normally when opened
+        }
+    });
+}
+
+// Show the current month from cache when possible, refetching it when stale.
+// Pass refresh after a write to drop every cached month.
+async function loadAllCalendarData({ refresh = false } = {}) {
+    if (calendars.length === 0) {
+        events = [];
+        availabilities = [];
+        holidays = [];
+        renderCalendar();
+        return;
+    }
+
+    const key = monthKey(currentDate.getFullYear(), currentDate.getMonth());
+    try {
+        if (refresh) {
+            invalidateMonthCache();
+        }
+        const cached = refresh ? null : await recallMonth(key);
+        if (cached && isCurrentMonth(key)) {
+            showMonthData(cached);
+        }
+        if (!isFresh(cached)) {
+            const data = await fetchMonth(currentDate.getFullYear(), currentDate.getMonth());
+            rememberMonth(key, data);
+            // The user may have moved to another month meanwhile
+            if (isCurrentMonth(key)) {
+                showMonthData(data);
+            }
+        }
+        prefetchAdjacentMonths();
+    } catch (error) {
+        console.error('Failed to load calendar data:', error);
+        events = [];
+        availabilities = [];
+        holidays = [];
+        renderCalendar();
+    }
+}
+
+let calendarsById = new Map();
+let eventsByDay = new Map();
+let availabilitiesByDay = new Map();
+let holidaysByDay = new Map();
+// Ids per day in the user's time zone, as returned by the server
+let dayIndex = null;
+
+function groupBy(items, keyOf) {
+    const groups = new Map();
+    for (const item of items || []) {
+        const key = item ? keyOf(item) : null;
+        if (key === null) continue;
+        if (!groups.has(key)) groups.set(key, []);
+        groups.get(key).push(item);
+    }
+    return groups;
+}
+
+function groupByDayIndex(items, kind) {
+    const byId = new Map((items || []).map(item => [item.id, item]));
+    const groups = new Map();
+    for (const [day, ids] of Object.entries(dayIndex)) {
+        const dayItems = ids[kind].map(id => byId.get(id)).filter(Boolean);
+        if (dayItems.length > 0) groups.set(day, dayItems);
+    }
+    return groups;
+}
+
+// Bucket the loaded data by day (YYYY-MM-DD) once per render, so each cell
+// is a map lookup. The server's buckets follow the user's time zone setting;
+// without them, fall back to the browser's.
+function indexCalendarData() {
+    calendarsById = new Map(calendars.map(cal => [cal.id, cal]));
+    if (dayIndex) {
+        eventsByDay = groupByDayIndex(events, 'events');
+        availabilitiesByDay = groupByDayIndex(availabilities, 'availability');
+        holidaysByDay = groupByDayIndex(holidays, 'holidays');
+        return;
+    }
+    eventsByDay = groupBy(events, e => e.start_time ? toDateKey(new Date(e.start_time)) : null);
+    availabilitiesByDay = groupBy(availabilities, a => a.start_time ? toDateKey(new Date(a.start_time)) : null);
+    holidaysByDay = groupBy(holidays, h => h.date ? h.date.split('T')[0] : null);
+}
+
+function availabilityUserId(avail) {
+    return avail.user ? (typeof avail.user === 'object' ? avail.user.id : avail.user) : null;
+}
+
+function myAvailabilityOn(date) {
+    return (availabilitiesByDay.get(toDateKey(date)) || []).find(a => availabilityUserId(a) === currentUserId);
+}
+
+function renderCalendar() {
+    const container = document.getElementById('calendarContainer');
+    indexCalendarData();
+    renderMonthView(container);
+}
+
+function renderMonthView(container) {
+    const year = currentDate.getFullYear();
+    const month = currentDate.getMonth();
+    const daysInMonth = getDaysInMonth(year, month);
+    const firstDay = getFirstDayOfMonth(year, month);
+
+    let html = '<div class="calendar-grid">';
+
+    // Day headers
+    dayNames.forEach(day => {
+        html += `<div class="calendar-day-header">${day}</div>`;
+    });
+
+    // Empty cells for days before month starts
+    for (let i = 0; i < firstDay; i++) {
+        html += '<div class="calendar-day other-month"></div>';
+    }
+
+    // Days of the month
+    const today = new Date();
+    for (let day = 1; day <= daysInMonth; day++) {
+        const date = new Date(year, month, day);
+        const isToday = date.toDateString() === today.toDateString();
+        const dayEvents = getEventsForDate(date);
+        const dayAvailabilities = getAvailabilitiesForDate(date);
+        const dayHolidays = getHolidaysForDate(date);
+
+        html += `<div class="calendar-day ${isToday ? 'today' : ''}"
+                      onclick="openDayModal('${date.toISOString()}')">
+            <div class="day-number">${day}</div>
+            <div class="day-events">
+                ${dayHolidays.map(holiday => {
+                    const holidayName = (holiday.name || '').replace(/"/g, '&quot;').replace(/'/g, "&#39;");
+                    return `
+                    <div class="event-item holiday-item" onclick="event.stopPropagation(); showHolidayDetails('${holidayName}', '${holiday.country || userCountry}');" title="${holidayName} (Holiday)">
+                        <div class="event-dot holiday" style="background: #f59e0b;"></div>
+                        <span class="event-title" style="color: #f59e0b; font-weight: 500;">${holidayName}</span>
+                    </div>
+                `;
+                }).join('')}
+                ${dayEvents.map(e => {
+                    const title = (e.title || '').replace(/"/g, '&quot;').replace(/'/g, "&#39;");
+                    const desc = (e.description || '').replace(/"/g, '&quot;').replace(/'/g, "&#39;").replace(/\n/g, '\\n');
+                    // Check if user owns the calendar this event belongs to or has edit/admin permission
+                    const eventCalendarId = e.calendar || e.calendar_id;
+                    const eventCalendar = calendarsById.get(eventCalendarId);
+                    const calendarOwnerId = eventCalendar && eventCalendar.owner ? (typeof eventCalendar.owner === 'object' ? eventCalendar.owner.id : eventCalendar.owner) : null;
+                    const isOwner = calendarOwnerId === currentUserId;
+                    // Check if user has edit/admin permission on shared calendar
+                    let hasEditPermission = isOwner;
+                    if (!isOwner && eventCalendar) {
+                        // Check shares for edit/admin permission
+                        const share = eventCalendar.shares && eventCalendar.shares.find(s => {
+                            const shareUserId = s.user ? (typeof s.user === 'object' ? s.user.id : s.user) : null;
+                            return shareUserId === currentUserId && (s.permission === 'edit' || s.permission === 'admin');
+                        });
+                        hasEditPermission = !!share;
+                    }
+                    const canDelete = hasEditPermission;
+                    const calendarName = eventCalendar ? eventCalendar.name : 'Unknown';
+                    return `
+                    <div class="event-item" onclick="event.stopPropagation(); showEventDetails(${e.id}, '${title}', '${desc}', ${canDelete});" title="${title} (${calendarName})">
+                        <div class="event-dot event"></div>
+                        <span class="event-title">${title}</span>
+                    </div>
+                `;
+                }).join('')}
+                ${dayAvailabilities.length > 0 ? `
+                    <div class="availability-list" onclick="event.stopPropagation();">
+                        ${dayAvailabilities.map(avail => {
+                            const availUser = avail.user ? (typeof avail.user === 'object' ? avail.user : {id: avail.user}) : null;
+                            if (!availUser) return '';
+                            const userName = availUser.email || availUser.username || `User ${availUser.id}`;
+                            const isCurrentUser = availUser.id === currentUserId;
+                            const displayName = isCurrentUser ? 'You' : userName.split('@')[0]; // Show just username part
+                            const statusIcon = avail.is_busy ? '<i class="fas fa-circle" style="color: #ef4444; font-size: 8px;"></i>' : '<i class="fas fa-circle" style="color: #10b981; font-size: 8px;"></i>';
+                            const statusText = avail.is_busy ? 'Busy' : 'Available';
+                            const availTitle = avail.title || '';
+                            const availDesc = avail.description || '';
+                            const hasDetails = availTitle || availDesc;
+                            const detailsIcon = hasDetails ? '<i class="fas fa-info-circle" style="font-size: 8px; margin-left: 4px; opacity: 0.7;"></i>' : '';
+                            return `
+                                <div class="availability-marker ${avail.is_busy ? 'busy' : 'available'}"
+                                     onclick="event.stopPropagation(); showAvailabilityDetails(${avail.id}, ${availUser.id}, '${userName.replace(/'/g, "\\'")}', ${avail.is_busy}, '${(availTitle || '').replace(/'/g, "\\'")}', '${(availDesc || '').replace(/'/g, "\\'").replace(/\n/g, '\\n')}', ${isCurrentUser});"
+                                     style="cursor: pointer;"
+                                     title="Click to view details - ${userName}: ${statusText}${hasDetails ? ' (Has details)' : ''}">
+                                    ${statusIcon} ${displayName}: ${statusText}${detailsIcon}
+                                </div>
+                            `;
+                        }).join('')}
+                    </div>
+                ` : ''}
+            </div>
+        </div>`;
+    }
+
+    // Empty cells for days after month ends
+    const totalCells = firstDay + daysInMonth;
+    const remainingCells = 42 - totalCells; // 6 rows * 7 days
+    for (let i = 0; i < remainingCells && totalCells + i < 42; i++) {
+        html += '<div class="calendar-day other-month"></div>';
+    }
+
+    html += '</div>';
+    container.innerHTML = html;
+}
+
+function getEventsForDate(date) {
+    return eventsByDay.get(toDateKey(date)) || [];
+}
+
+function getAvailabilitiesForDate(date) {
+    // Get ALL users' availability for this date (for shared calendars)
+    const dayAvailabilities = availabilitiesByDay.get(toDateKey(date)) || [];
+
+    // Group by user and get the most recent one per user
+    const userAvailMap = new Map();
+    dayAvailabilities.forEach(avail => {
+        const availUserId = avail.user ? (typeof avail.user === 'object' ? avail.user.id : avail.user) : null;
+        if (availUserId) {
+            // Keep the most recent availability for each user
+            if (!userAvailMap.has(availUserId) || new Date(avail.start_time) > new Date(userAvailMap.get(availUserId).start_time)) {
+                userAvailMap.set(availUserId, avail);
+            }
+        }
+    });
+
+    return Array.from(userAvailMap.values());
+}
+
+function getHolidaysForDate(date) {
+    return holidaysByDay.get(toDateKey(date)) || [];
+}
+
+function showHolidayDetails(holidayName, country) {
+    document.getElementById('modalTitle').textContent = 'Holiday';
+    const modalBody = document.getElementById('modalBody');
+
+    const escapeHtml = (text) => {
+        const div = document.createElement('div');
+        div.textContent = text || '';
+        return div.innerHTML;
+    };
+
+    const safeName = escapeHtml(holidayName);
+
+    modalBody.innerHTML = `
+        <div style="padding: 20px 0;">
+            <div style="margin-bottom: 20px;">
+                <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 15px;">
+                    <i class="fas fa-calendar-check" style="color: #f59e0b; font-size: 24px;"></i>
+                    <h4 style="color: #667eea; margin: 0;">
+                        ${safeName}
+                    </h4>
+                </div>
+                <div style="background: #fef3c7; padding: 15px; border-radius: 8px; border-left: 4px solid #f59e0b;">
+                    <p style="color: #92400e; margin: 0; font-size: 14px;">
+                        <i class="fas fa-flag" style="margin-right: 6px;"></i>
+                        Public holiday in ${country}
+                    </p>
+                </div>
+            </div>
+            <div style="display: flex; gap: 10px;">
+                <button class="btn btn-secondary" style="flex: 1;" onclick="closeModal()">Close</button>
+            </div>
+        </div>
+    `;
+    openModal();
+}
+
+function openDayModal(dateISO) {
+    const date = new Date(dateISO);
+    const dateFormatted = date.toLocaleDateString('en-US', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' });
+    document.getElementById('modalTitle').textContent = dateFormatted;
+    const modalBody = document.getElementById('modalBody');
+    modalBody.innerHTML = `
+        <div style="margin-bottom: 30px;">
+            <h4 style="margin-bottom: 20px; color: #667eea; display: flex; align-items: center; gap: 8px;">
+                <i class="fas fa-calendar-plus"></i> Add New Event
+            </h4>
+            <form id="addEventForm">
+                <input type="hidden" name="start_time" value="${date.toISOString()}">
+                <input type="hidden" name="end_time" value="${new Date(date.getTime() + 60 * 60 * 1000).toISOString()}">
+                <div class="form-group">
+                    <label>Calendar *</label>
+                    <select name="calendar" class="form-control" required>
+                        ${calendars.map(cal => {
+                            const calendarOwnerId = cal.owner ? (typeof cal.owner === 'object' ? cal.owner.id : cal.owner) : null;
+                            const canAddEvents = calendarOwnerId === currentUserId ||
+                                (cal.shares && cal.shares.some(s => {
+                                    const shareUserId = s.user ? (typeof s.user === 'object' ? s.user.id : s.user) : null;
+                                    return shareUserId === currentUserId && (s.permission === 'edit' || s.permission === 'admin');
+                                }));
+                            if (!canAddEvents) return '';
+                            return `<option value="${cal.id}" ${selectedCalendarId === cal.id ? 'selected' : ''}>${cal.name}</option>`;
+                        }).filter(opt => opt !== '').join('')}
+                    </select>
+                </div>
+                <div class="form-group">
+                    <label>Event Title *</label>
+                    <input type="text" name="title" class="form-control" placeholder="Enter event title" required>
+                </div>
+                <div class="form-group">
+                    <label>Description</label>
+                    <textarea name="description" class="form-control" placeholder="Add event details (optional)"></textarea>
+                </div>
+                <button type="submit" class="btn btn-primary" style="width: 100%; margin-top: 10px;">Create Event</button>
+            </form>
+        </div>
+        <hr>
+        <div>
+            <h4 style="margin-bottom: 20px; color: #667eea; display: flex; align-items: center; gap: 8px;">
+                <i class="fas fa-clock"></i> Availability Status
+            </h4>
+            ${(() => {
+                const allAvailabilities = getAvailabilitiesForDate(date);
+
+                if (allAvailabilities.length > 0) {
+                    return `
+                        <div style="background: #f8fafc; padding: 15px; border-radius: 8px; margin-bottom: 15px;">
+                            <p style="margin: 0 0 10px 0; color: #475569; font-size: 14px; font-weight: 600;">Everyone's Status:</p>
+                            ${allAvailabilities.map(avail => {
+                                const availUser = avail.user ? (typeof avail.user === 'object' ? avail.user : {id: avail.user}) : null;
+                                if (!availUser) return '';
+                                const userName = availUser.email || availUser.username || `User ${availUser.id}`;
+                                const isCurrentUser = availUser.id === currentUserId;
+                                const displayName = isCurrentUser ? 'You' : userName;
+                                const statusColor = avail.is_busy ? '#ef4444' : '#10b981';
+                                const statusText = avail.is_busy ? 'Busy' : 'Available';
+                                return `
+                                    <div style="display: flex; align-items: center; gap: 8px; padding: 6px 0; border-bottom: 1px solid #e2e8f0;">
+                                        <i class="fas fa-circle" style="color: ${statusColor}; font-size: 10px;"></i>
+                                        <span style="color: #475569; font-size: 14px;">
+                                            <strong>${displayName}</strong>: ${statusText}
+                                        </span>
+                                    </div>
+                                `;
+                            }).join('')}
+                        </div>
+                    `;
+                }
+                return '<p style="color: #94a3b8; font-style: italic; padding: 15px; background: #f8fafc; border-radius: 8px;">No availability marked for this day yet.</p>';
+            })()}
+            <p style="color: #64748b; font-size: 14px; margin-bottom: 15px;">Mark your availability for this day:</p>
+            ${(() => {
+                const existingAvail = myAvailabilityOn(date);
+                if (existingAvail) {
+                    return `
+                        <div style="background: #f1f5f9; padding: 15px; border-radius: 8px; margin-bottom: 15px;">
+                            <p style="margin: 0; color: #475569; font-size: 14px;">
+                                Your current status: <strong style="color: ${existingAvail.is_busy ? '#ef4444' : '#10b981'}">${existingAvail.is_busy ? 'Busy' : 'Available'}</strong>
+                            </p>
+                        </div>
+                    `;
+                }
+                return '';
+            })()}
+            <form id="markAvailabilityForm">
+                <div class="form-group">
+                    <label>Title/Note (Optional)</label>
+                    <input type="text" id="availabilityTitle" class="form-control" placeholder="e.g., 'Working from home', 'Out of office'" value="${(() => {
+                        const existingAvail = myAvailabilityOn(date);
+                        return existingAvail ? (existingAvail.title || '') : '';
+                    })()}">
+                </div>
+                <div class="form-group">
+                    <label>Description (Optional)</label>
+                    <textarea id="availabilityDescription" class="form-control" placeholder="Add more details about your availability...">${(() => {
+                        const existingAvail = myAvailabilityOn(date);
+                        return existingAvail ? (existingAvail.description || '') : '';
+                    })()}</textarea>
+                </div>
+                <div class="availability-buttons">
+                    <button type="button" class="btn btn-success" onclick="submitAvailability('${dateISO}', false)">
+                        <i class="fas fa-check" style="margin-right: 6px;"></i> Mark as Available
+                    </button>
+                    <button type="button" class="btn btn-danger" onclick="submitAvailability('${dateISO}', true)">
+                        <i class="fas fa-times" style="margin-right: 6px;"></i> Mark as Busy
+                    </button>
+                </div>
+            </form>
+            ${(() => {
+                const existingAvail = myAvailabilityOn(date);
+                if (existingAvail) {
+                    return `
+                        <button class="btn btn-secondary" style="width: 100%; margin-top: 10px;" onclick="removeAvailability('${dateISO}')">
+                            Remove My Availability
+                        </button>
+                    `;
+                }
+                return '';
+            })()}
+        </div>
+    `;
+    openModal();
+
+    document.getElementById('addEventForm').addEventListener('submit', async (e) => {
+        e.preventDefault();
+        const formData = new FormData(e.target);
+        const data = Object.fromEntries(formData.entries());
+        await createEvent(data);
+    });
+}
+
+function submitAvailability(dateISO, isBusy) {
+    const title = document.getElementById('availabilityTitle')?.value || '';
+    const description = document.getElementById('availabilityDescription')?.value || '';
+    markAvailability(dateISO, isBusy, title, description);
+}
+
+function openModal() {
+    document.getElementById('dayModal').style.display = 'flex';
+}
+
+function closeModal() {
+    document.getElementById('dayModal').style.display = 'none';
+}
+
+async function createEvent(data) {
+    try {
+        await fetchAPI('events/', {
+            method: 'POST',
+            body: JSON.stringify(data),
+        });
+        closeModal();
+        showNotification('Success', 'Event created successfully!', 'success');
+        loadAllCalendarData({ refresh: true });
+    } catch (error) {
+        showNotification('Error', 'Failed to create event. Please try again.', 'error');
+    }
+}
+
+async function deleteEvent(eventId) {
+    // Show confirmation modal
+    showConfirm(
+        'Delete Event',
+        'Are you sure you want to delete this event? This action cannot be undone.',
+        async () => {
+            try {
+                await fetchAPI(`events/${eventId}/`, {
+                    method: 'DELETE',
+                });
+                closeModal();
+                showNotification('Success', 'Event deleted successfully!', 'success');
+                loadAllCalendarData({ refresh: true });
+            } catch (error) {
+                console.error('Failed to delete event:', error);
+                showNotification('Error', 'Failed to delete event. Please try again.', 'error');
+            }
+        }
+    );
+}
+
+async function markAvailability(dateISO, isBusy, title = '', description = '') {
+    const date = new Date(dateISO);
+    // Set start to beginning of day and end to end of day
+    const startOfDay = new Date(date);
+    startOfDay.setHours(0, 0, 0, 0);
+    const endOfDay = new Date(date);
+    endOfDay.setHours(23, 59, 59, 999);
+
+    // Use selected calendar or first available calendar
+    const calendarToUse = selectedCalendarId || (calendars.length > 0 ? calendars[0].id : null);
+    if (!calendarToUse) {
+        showNotification('Error', 'No calendar available. Please create a calendar first.', 'error');
+        return;
+    }
+
+    const data = {
+        calendar: calendarToUse,
+        start_time: startOfDay.toISOString(),
+        end_time: endOfDay.toISOString(),
+        is_busy: isBusy,
+        title: title || '',
+        description: description || '',
+    };
+
+    try {
+        await fetchAPI('availability/', {
+            method: 'POST',
+            body: JSON.stringify(data),
+        });
+        closeModal();
+        showNotification('Success', `Availability marked as ${isBusy ? 'Busy' : 'Available'}!`, 'success');
+        loadAllCalendarData({ refresh: true });
+    } catch (error) {
+        showNotification('Error', 'Failed to mark availability. Please try again.', 'error');
+    }
+}
+
+function showAvailabilityDetails(availabilityId, userId, userName, isBusy, title, description, isCurrentUser) {
+    document.getElementById('modalTitle').textContent = 'Availability Details';
+    const modalBody = document.getElementById('modalBody');
+
+    // Escape HTML to prevent XSS
+    const escapeHtml = (text) => {
+        const div = document.createElement('div');
+        div.textContent = text || '';
+        return div.innerHTML;
+    };
+
+    const safeTitle = escapeHtml(title);
+    const safeDescription = description ? escapeHtml(description.replace(/\\n/g, '\n')) : '';
+    const statusColor = isBusy ? '#ef4444' : '#10b981';
+    const statusText = isBusy ? 'Busy' : 'Available';
+    const displayName = isCurrentUser ? 'You' : userName;
+
+    modalBody.innerHTML = `
+        <div style="padding: 20px 0;">
+            <div style="margin-bottom: 20px;">
+                <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 15px;">
+                    <i class="fas fa-circle" style="color: ${statusColor}; font-size: 16px;"></i>
+                    <h4 style="color: #667eea; margin: 0; display: flex; align-items: center; gap: 8px;">
+                        <i class="fas fa-user"></i> ${escapeHtml(displayName)}: ${statusText}
+                    </h4>
+                </div>
+                ${safeTitle ? `
+                    <div style="background: #f8fafc; padding: 15px; border-radius: 8px; border-left: 4px solid ${statusColor}; margin-bottom: 15px;">
+                        <p style="color: #475569; margin: 0; font-weight: 600; font-size: 16px;">${safeTitle}</p>
+                    </div>
+                ` : ''}
+                ${safeDescription ? `
+                    <div style="background: #f8fafc; padding: 15px; border-radius: 8px; border-left: 4px solid ${statusColor};">
+                        <p style="color: #475569; margin: 0; line-height: 1.6; white-space: pre-wrap;">${safeDescription}</p>
+                    </div>
+                ` : (!safeTitle ? '<p style="color: #94a3b8; font-style: italic;">No additional details provided.</p>' : '')}
+            </div>
+            <div style="display: flex; gap: 10px;">
+                <button class="btn btn-secondary" style="flex: 1;" onclick="closeModal()">Close</button>
+            </div>
+        </div>
+    `;
+    openModal();
+}
+
+async function removeAvailability(dateISO) {
+    const date = new Date(dateISO);
+
+    // Find existing availability for this date for current user
+    const existingAvail = myAvailabilityOn(date);
+
+    if (existingAvail) {
+        try {
+            await fetchAPI(`availability/${existingAvail.id}/`, {
+                method: 'DELETE',
+            });
+            closeModal();
+            showNotification('Success', 'Availability removed successfully!', 'success');
+            loadAllCalendarData({ refresh: true });
+        } catch (error) {
+            showNotification('Error', 'Failed to remove availability. Please try again.', 'error');
+        }
+    }
+}
+
+function showEventDetails(eventId, title, description, canDelete = false) {
+    document.getElementById('modalTitle').textContent = 'Event Details';
+    const modalBody = document.getElementById('modalBody');
+
+    // Escape HTML to prevent XSS
+    const escapeHtml = (text) => {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    };
+
+    const safeTitle = escapeHtml(title || 'Untitled Event');
+    const safeDescription = description ? escapeHtml(description.replace(/\\n/g, '\n')) : '';
+
+    modalBody.innerHTML = `
+        <div style="padding: 20px 0;">
+            <div style="margin-bottom: 20px;">
+                <h4 style="color: #667eea; margin-bottom: 10px; display: flex; align-items: center; gap: 8px;">
+                    <i class="fas fa-calendar-alt"></i> ${safeTitle}
+                </h4>
+                ${safeDescription ? `
+                    <div style="background: #f8fafc; padding: 15px; border-radius: 8px; border-left: 4px solid #667eea;">
+                        <p style="color: #475569; margin: 0; line-height: 1.6; white-space: pre-wrap;">${safeDescription}</p>
+                    </div>
+                ` : '<p style="color: #94a3b8; font-style: italic;">No description provided.</p>'}
+            </div>
+            <div style="display: flex; gap: 10px;">
+                <button class="btn btn-secondary" style="flex: 1;" onclick="closeModal()">Close</button>
+                ${canDelete ? `
+                    <button class="btn btn-danger" style="flex: 1;" onclick="deleteEvent(${eventId})">
+                        <i class="fas fa-trash-alt" style="margin-right: 6px;"></i> Delete Event
+                    </button>
+                ` : ''}
+            </div>
+        </div>
+    `;
+    openModal();
+}
+
+async function showShareWithUser() {
+    try {
+        // Get calendars that are already shared (to filter out users we already have shared calendars with)
+        const existingSharedUserIds = new Set();
+        calendars.forEach(cal => {
+            // Check if this calendar is shared (not owned by current user)
+            const calendarOwnerId = cal.owner ? (typeof cal.owner === 'object' ? cal.owner.id : cal.owner) : null;
+            if (calendarOwnerId !== currentUserId) {
+                existingSharedUserIds.add(calendarOwnerId);
+            }
+        });
+
+        document.getElementById('modalTitle').textContent = 'Share With User';
+        const modalBody = document.getElementById('modalBody');
+
+        modalBody.innerHTML = `
+            <div style="padding: 20px 0;">
+                <p style="color: #64748b; font-size: 14px; margin-bottom: 20px;">
+                    Create a new shared calendar with another user. Both of you will be able to see events and availability in this calendar.
+                </p>
+                <form id="shareWithUserForm">
+                    <div class="form-group">
+                        <label>Select User to Share With *</label>
+                        <input type="search" id="shareUserSearch" class="form-control" placeholder="Search by name, username or email" autocomplete="off" style="margin-bottom: 8px;">
+                        <select name="user_id" id="shareUserSelect" class="form-control" required>
+                            <option value="">Type to search users...</option>
+                        </select>
+                    </div>
+                    <div class="form-group">
+                        <label>Calendar Name (Optional)</label>
+                        <input type="text" name="name" id="calendarName" class="form-control" placeholder="Leave empty for auto-generated name">
+                        <small style="color: #94a3b8; font-size: 11px; margin-top: 5px; display: block;">
+                            If left empty, will be named: "YourUsername & TheirUsername"
+                        </small>
+                    </div>
+                    <div style="display: flex; gap: 10px; margin-top: 20px;">
+                        <button type="button" class="btn btn-secondary" style="flex: 1;" onclick="closeModal()">Cancel</button>
+                        <button type="submit" class="btn btn-primary" style="flex: 1;">
+                            <i class="fas fa-user-plus" style="margin-right: 6px;"></i> Create Shared Calendar
+                        </button>
+                    </div>
+                </form>
+            </div>
+        `;
+
+        openModal();
+
+        // Search server-side as the user types instead of loading every user
+        const searchInput = document.getElementById('shareUserSearch');
+        const userSelect = document.getElementById('shareUserSelect');
+        let searchTimer = null;
+        let searchSeq = 0;
+        searchInput.addEventListener('input', () => {
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(async () => {
+                const query = searchInput.value.trim();
+                const seq = ++searchSeq;
+                if (!query) {
+                    userSelect.innerHTML = '<option value="">Type to search users...</option>';
+                    return;
+                }
+                try {
+                    const users = await fetchAPI(`users/search/?q=${encodeURIComponent(query)}`);
+                    if (seq !== searchSeq) return; // a newer search is in flight
+                    const matches = users.filter(u => !existingSharedUserIds.has(u.id));
+                    userSelect.innerHTML = `<option value="">${matches.length ? 'Choose a user...' : 'No matching users'}</option>` +
+                        matches.map(u => {
+                            const displayName = u.username || u.email || `User ${u.id}`;
+                            return `<option value="${u.id}">${u.is_friend ? '★ ' : ''}${displayName}${u.email ? ` (${u.email})` : ''}</option>`;
+                        }).join('');
+                } catch (error) {
+                    console.error('User search failed:', error);
+                }
+            }, 250);
+        });
+        searchInput.focus();
+
+        document.getElementById('shareWithUserForm').addEventListener('submit', async (e) => {
+            e.preventDefault();
+            const formData = new FormData(e.target);
+            const data = {
+                user_id: parseInt(formData.get('user_id')),
+                name: formData.get('name') || ''
+            };
+
+            try {
+                await fetchAPI('calendars/create_shared/', {
+                    method: 'POST',
+                    body: JSON.stringify(data),
+                });
+                showNotification('Success', 'Shared calendar created successfully!', 'success');
+                closeModal();
+                await loadCalendars(); // Reload calendars to show the new shared calendar
+            } catch (error) {
+                console.error('Failed to create shared calendar:', error);
+                const errorMsg = error.message || 'Failed to create shared calendar. Please try again.';
+                showNotification('Error', errorMsg, 'error');
+            }
+        });
+    } catch (error) {
+        console.error('Failed to load users:', error);
+        showNotification('Error', 'Failed to load users. Please try again.', 'error');
+    }
+}
+
+
+async function deleteCalendar(calendarId, calendarName) {
+    // Show confirmation modal
+    showConfirm(
+        'Delete Calendar',
+        `Are you sure you want to delete "${calendarName}"? This will also delete all events and availability markers in this calendar. This action cannot be undone.`,
+        async () => {
+            try {
+                await fetchAPI(`calendars/${calendarId}/`, {
+                    method: 'DELETE',
+                });
+                // If deleted calendar was selected, clear selection
+                if (selectedCalendarId === calendarId) {
+                    selectedCalendarId = null;
+                }
+                showNotification('Success', 'Calendar deleted successfully!', 'success');
+                await loadCalendars();
+            } catch (error) {
+                console.error('Failed to delete calendar:', error);
+                showNotification('Error', 'Failed to delete calendar. Please try again.', 'error');
+            }
+        }
+    );
+}
+
+
+// Month data rendered into the page by the server (calendar_app/payload.py)
+function takeInitialData() {
+    const element = document.getElementById('initial-data');
+    if (!element) return null;
+    const data = JSON.parse(element.textContent);
+    element.remove();
+    return data;
+}
+
+// Initialize
+document.addEventListener('DOMContentLoaded', async () => {
+    monthStore.prune(MONTH_STORE_MAX_AGE_MS, currentUserId);
+    const initial = takeInitialData();
+    if (initial && initial.fixed_month) {
+        currentDate = new Date(initial.year, initial.month - 1, 1);
+    }
+    updateMonthDisplay();
+
+    // The server picks the month in the user's time zone setting; near a month
+    // boundary the browser's own zone may disagree
+    if (initial && initial.year === currentDate.getFullYear() && initial.month === currentDate.getMonth() + 1) {
+        calendars = initial.calendars;
+        renderCalendarsList();
+        const data = {
+            events: initial.events,
+            availabilities: initial.availabilities,
+            holidays: initial.holidays,
+            days: initial.days,
+            fetchedAt: Date.now(),
+        };
+        rememberMonth(monthKey(currentDate.getFullYear(), currentDate.getMonth()), data);
+        showMonthData(data);
+        prefetchAdjacentMonths();
+    } else {
+        await loadCalendars();
+    }
+});
@@ -0,0 +1,109 @@
+// Prevent form submission errors if elements don't exist yet
+document.addEventListener('DOMContentLoaded', function() {
+    const loginForm = document.getElementById('loginForm');
+    const registerForm = document.getElementById('registerForm');
+
+    if (loginForm) {
+        loginForm.addEventListener('submit', handleLogin);
+    }
+
+    if (registerForm) {
+        registerForm.addEventListener('submit', handleRegister);
+    }
+});
+
+async function handleLogin(e) {
+    e.preventDefault();
+    const username = document.getElementById('username').value;
+    const password = document.getElementById('password').value;
+    const errorDiv = document.getElementById('errorMessage');
+
+    try {
+        const response = await fetch('/api/auth/login/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ username, password }),
+            credentials: 'include'
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            // Store token for API calls
+            if (data.access) {
+                localStorage.setItem('authToken', data.access);
+            }
+            // Session is created server-side, redirect to calendar
+            window.location.href = '/';
+        } else {
+            errorDiv.textContent = data.error || data.detail || 'Login failed';
+            errorDiv.style.display = 'block';
+        }
+    } catch (error) {
+        errorDiv.textContent = 'Network error. Please try again.';
+        errorDiv.style.display = 'block';
+    }
+}
+
+function showRegisterForm() {
+    document.getElementById('loginSection').style.display = 'none';
+    document.getElementById('registerSection').style.display = 'block';
+    const username = document.getElementById('username').value;
+    if (username) {
+        document.getElementById('reg_username').value = username;
+    }
+}
+
+function showLoginForm() {
+    document.getElementById('registerSection').style.display = 'none';
+    document.getElementById('loginSection').style.display = 'block';
+}
+
+async function handleRegister(e) {
+    e.preventDefault();
+    const errorDiv = document.getElementById('errorMessage');
+    errorDiv.style.display = 'none';
+
+    const registerData = {
+        username: document.getElementById('reg_username').value,
+        email: document.getElementById('reg_email').value,
+        password: document.getElementById('reg_password').value,
+        password_confirm: document.getElementById('reg_password_confirm').value,
+        first_name: document.getElementById('reg_first_name').value,
+        last_name: document.getElementById('reg_last_name').value
+    };
+
+    if (registerData.password !== registerData.password_confirm) {
+        errorDiv.textContent = 'Passwords do not match!';
+        errorDiv.style.display = 'block';
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/auth/register/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify(registerData),
+            credentials: 'include'
+        });
+
+        const data = await response.json();
+
+        if (response.ok && data.access) {
+            // Store token for API calls
+            localStorage.setItem('authToken', data.access);
+            // Session is created server-side, redirect to calendar
+            window.location.href = '/';
+        } else {
+            errorDiv.textContent = data.error || data.detail || JSON.stringify(data);
+            errorDiv.style.display = 'block';
+        }
+    } catch (error) {
+        errorDiv.textContent = 'Network error. Please try again.';
+        errorDiv.style.display = 'block';
+    }
+}